@@ -0,0 +1,80 @@
+"""
+Time find and report queries on characters and on a CharacterTable
+
+Builds a synthetic campaign, then times the same find rules and report
+counts looping over the Character objects and run against a CharacterTable,
+with NumPy when it is installed and with plain arrays. Run it from the
+repository root:
+
+    python benchmarks/character_table.py [COUNT]
+"""
+
+import sys
+import timeit
+from collections import Counter
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from npc.character import Character
+from npc.character.table import CharacterTable, numpy
+from npc.commands import find_characters, find_in_table
+from npc.util import flatten
+
+COURTS = ('Spring', 'Summer', 'Autumn', 'Winter')
+LOCATIONS = ('Downtown', 'Uptown', 'The Docks', 'Old Town', 'Suburbs')
+
+RULES = ['court:winter', 'location~:town']
+"""list: find rules to time"""
+
+def build(count):
+    """
+    Build some characters with a realistic spread of tags
+
+    Args:
+        count (int): Number of characters to build
+
+    Returns:
+        List of Character objects
+    """
+    characters = []
+    for index in range(count):
+        char = Character(
+            type=['Human'],
+            name=['Person {}'.format(index)],
+            title=['Bartender'],
+            location=[LOCATIONS[index % len(LOCATIONS)]],
+            court=[COURTS[index % len(COURTS)]],
+        )
+        char.path = 'Person {}.nwod'.format(index)
+        characters.append(char)
+    return characters
+
+def best(func, number=3):
+    """
+    Time a function, keeping the fastest of a few runs
+
+    Args:
+        func (callable): Function to time
+        number (int): Number of runs
+
+    Returns:
+        Seconds taken by the fastest run
+    """
+    return min(timeit.repeat(func, number=1, repeat=number))
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    characters = build(count)
+    print("{} characters".format(count))
+    print("find   characters: {:7.1f} ms".format(best(lambda: find_characters(RULES, characters)) * 1000))
+    print("report characters: {:7.1f} ms".format(best(lambda: Counter(flatten([c.tags.get('court', 'None') for c in characters]))) * 1000))
+
+    backends = [False, True] if numpy is not None else [False]
+    for use_numpy in backends:
+        label = 'numpy' if use_numpy else 'array'
+        build_time = best(lambda: CharacterTable(characters, ['court', 'location'], use_numpy=use_numpy), number=1)
+        table = CharacterTable(characters, ['court', 'location'], use_numpy=use_numpy)
+        print("table build ({}): {:7.1f} ms".format(label, build_time * 1000))
+        print("find   table ({}): {:7.1f} ms".format(label, best(lambda: find_in_table(RULES, table)) * 1000))
+        print("report table ({}): {:7.1f} ms".format(label, best(lambda: table.counts('court')) * 1000))
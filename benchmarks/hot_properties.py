@@ -0,0 +1,42 @@
+"""
+Time the tag and character properties that listings read most often
+
+Each property is read many times on the same objects, the way templates,
+sorters, and sectioners read them. Run it from the repository root:
+
+    python benchmarks/hot_properties.py [COUNT]
+"""
+
+import sys
+import timeit
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from npc.character import Character
+from npc.character.tags import Flag, Tag
+
+def cases():
+    """
+    Get the properties to time
+
+    Returns:
+        List of `(label, callable)` tuples
+    """
+    tag = Tag('title', 'Bartender', 'Owner', 'Cook')
+    flag = Flag('dead')
+    character = Character(type=['Human'], name=['Bob'])
+    return [
+        ('Tag.filled', lambda: tag.filled),
+        ('Tag.present', lambda: tag.present),
+        ('Tag.filled_data', lambda: tag.filled_data),
+        ('Tag.first_value()', lambda: tag.first_value()),
+        ('Flag.present', lambda: flag.present),
+        ('Character.type_key', lambda: character.type_key),
+    ]
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for label, read in cases():
+        seconds = min(timeit.repeat(read, number=count, repeat=3))
+        print("{:<20} {:.0f} ns per read".format(label, seconds / count * 10**9))
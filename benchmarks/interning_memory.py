@@ -0,0 +1,86 @@
+"""
+Measure the memory saved by pooling repeated tag values
+
+Scans and builds a synthetic campaign, once with the parser's value pool and
+once with pooling turned off, and reports the memory held by the characters
+in each case, as counted by tracemalloc. Run it from the repository root:
+
+    python benchmarks/interning_memory.py [COUNT]
+"""
+
+import gc
+import sys
+import tracemalloc
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from npc.parser import core
+from npc.util import interning
+
+COURTS = ('Spring', 'Summer', 'Autumn', 'Winter')
+SEEMINGS = ('Beast', 'Darkling', 'Elemental', 'Fairest', 'Ogre', 'Wizened')
+LOCATIONS = ('Downtown', 'Uptown', 'The Docks', 'Old Town', 'Suburbs')
+GROUPS = ('The Bar', 'City Council', 'Police', 'Night Market', 'Docks Union')
+
+def headers(count):
+    """
+    Make the file contents of a synthetic campaign
+
+    Args:
+        count (int): Number of characters to make
+
+    Yields:
+        Tuples of a file path and the bytes of its header
+    """
+    for index in range(count):
+        lines = ['@type Human']
+        if index % 3 == 0:
+            lines = [
+                '@changeling {} Hunterheart'.format(SEEMINGS[index % len(SEEMINGS)]),
+                '@court {}'.format(COURTS[index % len(COURTS)]),
+            ]
+        lines.extend([
+            '@title Bartender',
+            '@location {}'.format(LOCATIONS[index % len(LOCATIONS)]),
+            '@group {}'.format(GROUPS[index % len(GROUPS)]),
+            '@rank Member',
+            'A regular at the bar.',
+        ])
+        yield ('Person {}.nwod'.format(index), '\n'.join(lines).encode('utf-8'))
+
+def measure(count, pooled):
+    """
+    Find the memory held by a parsed campaign
+
+    Args:
+        count (int): Number of characters to build
+        pooled (bool): Whether to pool repeated tag values
+
+    Returns:
+        Number of bytes allocated for all of the characters
+    """
+    interning.values.clear()
+    original = core.intern
+    if not pooled:
+        core.intern = str
+    try:
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        characters = [core.build_character(name, core.scan_bytes(data)) for name, data in headers(count)]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    finally:
+        core.intern = original
+    del characters
+    return after - before
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    plain = measure(count, pooled=False)
+    pooled = measure(count, pooled=True)
+    print("{} characters".format(count))
+    print("unpooled: {:.1f} MiB ({:.0f} bytes per character)".format(plain / 2**20, plain / count))
+    print("pooled:   {:.1f} MiB ({:.0f} bytes per character)".format(pooled / 2**20, pooled / count))
+    print("saved:    {:.1f} MiB ({:.0%})".format((plain - pooled) / 2**20, (plain - pooled) / plain))
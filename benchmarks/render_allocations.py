@@ -0,0 +1,82 @@
+"""
+Measure the tag filtering done while rendering a character listing
+
+Reports the memory held by the result of one `TagContainer.present()` call,
+and the time taken to render a markdown listing. Run it from the repository
+root:
+
+    python benchmarks/render_allocations.py [COUNT]
+"""
+
+import gc
+import io
+import sys
+import timeit
+import tracemalloc
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from npc import formatters, settings
+from npc.character import Changeling, Character
+
+def build(count):
+    """
+    Build a mix of plain and changeling characters
+
+    Args:
+        count (int): Number of characters to build
+
+    Returns:
+        List of Character objects
+    """
+    characters = []
+    for index in range(count):
+        klass = Changeling if index % 2 else Character
+        characters.append(klass(
+            type=['changeling' if index % 2 else 'human'],
+            name=['Person {}'.format(index)],
+            title=['Bartender'],
+            group=['The Bar'],
+            description=['A regular at the bar.'],
+        ))
+    return characters
+
+def present_bytes(characters):
+    """
+    Find the memory held by the result of each present() call
+
+    Args:
+        characters (list): Characters to call present() on
+
+    Returns:
+        Average number of bytes held by each result
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    views = [character.tags.present() for character in characters]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(views)
+
+def render_seconds(characters, prefs):
+    """
+    Time a markdown listing of some characters
+
+    Args:
+        characters (list): Characters to list
+        prefs (Settings): Settings object to use
+
+    Returns:
+        Best time in seconds out of three runs
+    """
+    def render():
+        formatters.markdown.listing(characters, io.StringIO(), prefs=prefs)
+    return min(timeit.repeat(render, number=1, repeat=3))
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    characters = build(count)
+    print("{:.0f} bytes held per present() result".format(present_bytes(characters)))
+    print("{:.3f} seconds to render {} characters".format(render_seconds(characters, settings.InternalSettings()), count))
@@ -0,0 +1,61 @@
+"""
+Measure how much memory a parsed character's tags take up
+
+Builds a batch of typical characters and reports the bytes allocated per
+character, as counted by tracemalloc. Run it from the repository root:
+
+    python benchmarks/tag_memory.py [COUNT]
+"""
+
+import gc
+import sys
+import tracemalloc
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from npc.character import Character
+
+def build(count):
+    """
+    Build some characters with a realistic spread of tags
+
+    Args:
+        count (int): Number of characters to build
+
+    Returns:
+        List of Character objects
+    """
+    characters = []
+    for index in range(count):
+        characters.append(Character(
+            type=['human'],
+            name=['Person {}'.format(index)],
+            title=['Bartender'],
+            location=['Downtown'],
+            group=['The Bar'],
+            description=['A regular at the bar.'],
+        ))
+    return characters
+
+def measure(count):
+    """
+    Find the memory held per character
+
+    Args:
+        count (int): Number of characters to build
+
+    Returns:
+        Average number of bytes allocated for each character
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    characters = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(characters)
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print("{:.0f} bytes per character ({} characters)".format(measure(count), count))
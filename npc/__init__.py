@@ -2,4 +2,4 @@
 Package for reading and manipulating campaign information.
 """
 
-from . import commands, settings, character, cli, gui, __version__
+from . import commands, settings, character, cli, gui, watch, __version__
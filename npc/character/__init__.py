@@ -9,7 +9,7 @@ from .changeling import Changeling
 from .werewolf import Werewolf
 from .spirit import Spirit
 
-from . import tags
+from . import tags, table
 
 def build(attributes: dict = None, other_char: Character = None):
     """
@@ -76,6 +76,8 @@ class CharacterEncoder(json.JSONEncoder):
             return str(o)
         if isinstance(o, tags.TagContainer):
             return o.data
+        if isinstance(o, tags.SanitizedTags):
+            return dict(o.items())
         if isinstance(o, tags.Tag):
             return o.data
         if isinstance(o, tags.GroupTag):
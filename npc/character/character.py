@@ -1,9 +1,10 @@
 import npc
 from npc.util import OutOfBoundsError, flatten, merge_to_dict
 
-from .tags import TagContainer
+from .tags import TagContainer, Flag, GroupTag, SanitizedTags
 
 from collections import defaultdict
+from copy import copy
 
 class Character:
     """
@@ -52,6 +53,8 @@ class Character:
             return wrapped_attributes
 
         self.path = path
+        self._body = None
+        self._type_key = None
         self.tags = TagContainer()
         self.tags.add_tag('type', required=True, limit=1)
         self.tags.add_tag('name', required=True)
@@ -98,15 +101,47 @@ class Character:
         """
         return len(self.problems) == 0
 
+    @property
+    def body(self):
+        """
+        str: Full text of the character file, as if it were opened in text
+            mode. Kept from the parse when the parser was asked to, and
+            otherwise read on first use and kept from then on. Empty when the
+            character has no path. Set to None to let it be read again.
+
+        Raises:
+            OSError when the text was not kept and the path cannot be read.
+            Paths inside archives and paths from dumps that do not exist on
+            disk raise FileNotFoundError with a message saying so.
+        """
+        if self._body is None:
+            if not self.path:
+                return ''
+            try:
+                with open(self.path, 'r') as char_file:
+                    self._body = char_file.read()
+            except (FileNotFoundError, NotADirectoryError) as err:
+                raise FileNotFoundError(err.errno, "Character text was not kept and the file is not on disk", self.path) from err
+        return self._body
+
+    @body.setter
+    def body(self, value):
+        self._body = value
+
     @property
     def type_key(self):
         """
-        str: Type key for this character or None if no type is present
+        str: Type key for this character or None if no type is present. Kept
+        until the type tag changes.
         """
-        if not self.tags('type').filled:
-            return None
+        type_tag = self.tags('type')
+        cached = self._type_key
+        if cached is not None and cached[0] is type_tag and cached[1] == type_tag.revision:
+            return cached[2]
 
-        return self.tags('type').first_value().lower()
+        type_key = type_tag.first_value().lower() if type_tag.filled else None
+        self._type_key = (type_tag, type_tag.revision, type_key)
+        return type_key
 
     @property
     def foreign(self):
@@ -185,7 +220,7 @@ class Character:
             A string containing tags that when parsed will recreate the data in
             this character object.
         """
-        header_tags = self.tags.present()
+        header_tags = self.tags.present().copy()
 
         # add realname tag if needed
         if 'name' in header_tags:
@@ -215,19 +250,55 @@ class Character:
         """
         return tags
 
-    def dump(self):
+    def dump(self, *, directives=False):
         """
         Create a single dict that represents all the data for this character
 
         The generated dict is the tag data combined with the file path.
 
+        Args:
+            directives (bool): Whether to add header lines for the data that
+                tag values do not show, like hidden tags and values and flags
+                that are set without a value. When the character has any, they
+                are added under the `directives` key.
+
         Returns:
             Dict containing all data for this character
         """
-        dump = self.tags
+        dump = copy(self.tags)
+        dump.data = dict(self.tags.data)
         dump['path'] = self.path
+
+        if directives:
+            lines = self._directives()
+            if lines:
+                dump['directives'] = lines
         return dump
 
+    def _directives(self):
+        """
+        Get the header lines for data that tag values do not show
+
+        Returns:
+            List of `@hide` lines, and of lines for flags that are present
+            without a value
+        """
+        lines = []
+        for tag in self.tags.all():
+            if isinstance(tag, Flag) and tag.present and not tag.filled:
+                lines.append("@{}".format(tag.name))
+            if tag.hidden:
+                lines.append("@hide {}".format(tag.name))
+            for value in tag.hidden_values:
+                lines.append("@hide {} >> {}".format(tag.name, value))
+            if isinstance(tag, GroupTag):
+                for value, subtag in tag.items():
+                    if subtag.hidden:
+                        lines.append("@hide {} >> {} >> subtags".format(tag.name, value))
+                    for subvalue in subtag.hidden_values:
+                        lines.append("@hide {} >> {} >> {}".format(tag.name, value, subvalue))
+        return lines
+
     def sanitize(self):
         """
         Hide and obfuscate this character for generating a listing
@@ -238,6 +309,7 @@ class Character:
         3. Use a placeholder for unknown type
 
         This is a destructive operation which changes the character's data!
+        Use sanitized() to leave the character alone.
         """
 
         # Remove all hidden tag values
@@ -250,3 +322,21 @@ class Character:
         # Use a placeholder for unknown type
         if not self.tags('type').filled:
             self.tags('type').append('Unknown')
+
+    def sanitized(self):
+        """
+        Get this character as it should appear in a listing
+
+        The result is a shallow copy whose tags are a read-only SanitizedTags
+        view of this character's tags. It reads the same as this character
+        would after sanitize(), but nothing is removed from this character,
+        so it can still be dumped or listed again. Tags with nothing to hide
+        are shared, not copied.
+
+        Returns:
+            Character object of the same class
+        """
+        overlay = copy(self)
+        overlay.tags = SanitizedTags(self.tags)
+        overlay._type_key = None
+        return overlay
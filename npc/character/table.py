@@ -0,0 +1,411 @@
+"""
+Columnar store for the characters of a parsed campaign
+
+A CharacterTable keeps one column per tag instead of one object per
+character. Each column is dictionary-encoded: its distinct values are stored
+once, and every character's values are integer codes into that list, with
+offsets marking where each character's codes start. Finding characters and
+counting values then work on the codes, and text is only compared once per
+distinct value.
+
+When NumPy is installed, the codes and offsets are NumPy arrays and whole
+columns are tested at once. Otherwise they are stored in `array` objects and
+tested row by row.
+"""
+
+from array import array
+from collections import Counter
+
+from npc.util.interning import folded
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class Column:
+    """
+    Dictionary-encoded values of one tag across every row of a table
+
+    Row `i` has the codes `codes[offsets[i]:offsets[i+1]]`, which index into
+    `values`. `present` holds 1 for the rows whose character has the tag at
+    all, even if it is empty, and 0 for the rest.
+
+    A tag can be a group tag for some characters and a plain tag for others.
+    When any row has a group tag, `grouped` holds 1 for those rows, and
+    `members` is a column holding the subtag values of every group in each
+    row. Otherwise both are None.
+    """
+    __slots__ = ('name', 'grouped', 'values', 'codes', 'offsets', 'present', 'members', '_np')
+
+    def __init__(self, name, grouped, values, codes, offsets, present, members=None, np=None):
+        """
+        Create a column from encoded data
+
+        Args:
+            name (str|None): Name of the tag
+            grouped (array|None): Whether each row's tag is a group tag
+            values (list): Distinct values. Codes index into this list.
+            codes (array): Codes of every row's values, one row after another
+            offsets (array): Where each row's codes start, plus the total
+                number of codes
+            present (array): Whether each row's character has the tag
+            members (Column|None): Subtag values for group tags
+            np (module|None): NumPy module to use, or None to work on plain
+                arrays
+        """
+        self.name = name
+        self.grouped = grouped
+        self.values = values
+        self.codes = codes
+        self.offsets = offsets
+        self.present = present
+        self.members = members
+        self._np = np
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def rows_with(self, mask):
+        """
+        Find the rows with at least one value whose code passes a test
+
+        Args:
+            mask (list): One bool for each value in the dictionary
+
+        Returns:
+            One bool for each row, as a NumPy array or a list
+        """
+        np = self._np
+        if np is not None:
+            hits = np.asarray(mask, dtype=bool)[self.codes]
+            totals = np.concatenate(([0], np.cumsum(hits)))
+            return totals[self.offsets[1:]] > totals[self.offsets[:-1]]
+
+        codes = self.codes
+        return [any(mask[code] for code in codes[start:end]) for start, end in zip(self.offsets, self.offsets[1:])]
+
+    def filled(self):
+        """
+        Find the rows whose tag is filled
+
+        A group tag is filled when it has any group. Other tags are filled
+        when they have any value that is not blank.
+
+        Returns:
+            One bool for each row, as a NumPy array or a list
+        """
+        filled = self.rows_with([bool(value.strip()) for value in self.values])
+        if self.grouped is None:
+            return filled
+
+        any_value = self.rows_with([True] * len(self.values))
+        if self._np is not None:
+            return self._np.where(self.grouped.astype(bool), any_value, filled)
+        return [any_row if grouped else filled_row for grouped, any_row, filled_row in zip(self.grouped, any_value, filled)]
+
+    def contains(self, text: str):
+        """
+        Find the rows whose tag contains some text
+
+        Matches the same rows as calling contains() on each character's tag.
+        The special text '*' matches filled tags.
+
+        Args:
+            text (str): Text to search for
+
+        Returns:
+            One bool for each row, as a NumPy array or a list
+        """
+        text = text.casefold()
+        hits = self.rows_with([text in folded(value) for value in self.values])
+        if text == '*':
+            hits = _either(hits, self.filled())
+        if self.members is not None:
+            hits = _either(hits, self.members.contains(text))
+        return hits
+
+class CharacterTable:
+    """
+    Columnar copy of the tags of many characters
+
+    Rows are in the order the characters were given. The table does not keep
+    the characters themselves, only their paths and tag values, so it does
+    not change when they do. Build a new table to pick up changes.
+    """
+    def __init__(self, characters=(), tags=None, *, use_numpy=None):
+        """
+        Build a table from characters
+
+        Args:
+            characters (iter): Character objects to store. They are read once,
+                so this can be a generator.
+            tags (iter|None): Names of the tags to store. None stores every
+                tag of every character.
+            use_numpy (bool|None): Whether to store the columns in NumPy
+                arrays. None uses NumPy when it is installed.
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy is not installed")
+        self._np = numpy if use_numpy else None
+
+        builders = {}
+        self.paths = []
+        if tags is None:
+            for row, character in enumerate(characters):
+                self.paths.append(character.path)
+                for name, tag in character.tags.items():
+                    builder = builders.get(name)
+                    if builder is None:
+                        builder = builders[name] = _ColumnBuilder(name)
+                    builder.add(row, tag)
+        else:
+            wanted = [(name, _ColumnBuilder(name)) for name in dict.fromkeys(tags)]
+            for row, character in enumerate(characters):
+                self.paths.append(character.path)
+                found = character.tags.data
+                for name, builder in wanted:
+                    tag = found.get(name)
+                    if tag is not None:
+                        builder.add(row, tag)
+            builders = {name: builder for name, builder in wanted if builder.values or builder.present}
+
+        self._columns = {name: builder.finish(len(self.paths), self._np) for name, builder in builders.items()}
+
+    def __len__(self):
+        return len(self.paths)
+
+    @property
+    def uses_numpy(self):
+        """
+        bool: Whether the columns are NumPy arrays
+        """
+        return self._np is not None
+
+    def names(self):
+        """
+        Get the names of the stored tags
+
+        Returns:
+            Dictionary view of the tag names
+        """
+        return self._columns.keys()
+
+    def column(self, tag: str):
+        """
+        Get the column for a tag
+
+        Args:
+            tag (str): Name of the tag
+
+        Returns:
+            Column object, or None if no character had the tag
+        """
+        return self._columns.get(tag)
+
+    def counts(self, tag: str):
+        """
+        Count how many times each value of a tag appears
+
+        Gives the same Counter as counting the values of every character's tag
+        in row order, with characters that lack the tag counted under 'None'.
+        Use it for reports.
+
+        Args:
+            tag (str): Name of the tag
+
+        Returns:
+            Counter of the number of times each value appears
+        """
+        column = self._columns.get(tag)
+        if column is None:
+            return Counter({'None': len(self)}) if len(self) else Counter()
+
+        np = self._np
+        if np is not None:
+            tallies = np.bincount(column.codes, minlength=len(column.values)).tolist()
+            missing_rows = np.flatnonzero(column.present == 0)
+            missing = len(missing_rows)
+            first_missing = int(missing_rows[0]) if missing else None
+        else:
+            tallies = [0] * len(column.values)
+            for code in column.codes:
+                tallies[code] += 1
+            missing = column.present.count(0)
+            first_missing = column.present.index(0) if missing else None
+
+        # put 'None' where it was first counted, after the values seen before
+        # the first character without the tag. Codes are given out in that
+        # same order.
+        ordered = list(column.values)
+        if first_missing is not None:
+            end = column.offsets[first_missing]
+            ordered.insert(int(column.codes[:end].max() if np is not None else max(column.codes[:end])) + 1 if end else 0, 'None')
+
+        totals = Counter()
+        for value in ordered:
+            totals.setdefault(value, 0)
+        for value, tally in zip(column.values, tallies):
+            totals[value] += tally
+        if missing:
+            totals['None'] += missing
+        return totals
+
+    def select(self, matchers):
+        """
+        Find the rows whose characters match find rules
+
+        Args:
+            matchers (list): Parsed find rules as `(tag, text, negate)`
+                tuples. A row matches when its tag contains the text, or does
+                not contain it when negate is true.
+
+        Returns:
+            List of matching row numbers, in order
+        """
+        np = self._np
+        selected = None
+        for tag, text, negate in matchers:
+            column = self._columns.get(tag)
+            if column is None:
+                hits = np.zeros(len(self), dtype=bool) if np is not None else [False] * len(self)
+            else:
+                hits = column.contains(text)
+
+            if np is not None:
+                keep = hits != negate
+                selected = keep if selected is None else selected & keep
+            else:
+                keep = [hit != negate for hit in hits]
+                selected = keep if selected is None else [a and b for a, b in zip(selected, keep)]
+
+        if selected is None:
+            return list(range(len(self)))
+        if np is not None:
+            return np.flatnonzero(selected).tolist()
+        return [row for row, keep in enumerate(selected) if keep]
+
+    def find(self, matchers):
+        """
+        Get the paths of the characters that match find rules
+
+        Args:
+            matchers (list): Parsed rules, as for select()
+
+        Returns:
+            List of character paths, in row order
+        """
+        return [self.paths[row] for row in self.select(matchers)]
+
+class _ColumnBuilder:
+    """
+    Collects the values of one tag while a table is being built
+    """
+    def __init__(self, name):
+        """
+        Create an empty builder
+
+        Args:
+            name (str|None): Name of the tag
+        """
+        self.name = name
+        self.lookup = {}
+        self.values = []
+        self.codes = array('l')
+        self.offsets = array('l', [0])
+        self.present = bytearray()
+        self.grouped = None
+        self.members = None
+
+    def _pad(self, row):
+        """
+        Add empty rows for the characters without this tag
+
+        Args:
+            row (int): Number of rows there should be
+        """
+        while len(self.present) < row:
+            self.offsets.append(len(self.codes))
+            self.present.append(0)
+
+    def add_values(self, row, values):
+        """
+        Store the values of one row
+
+        Args:
+            row (int): Row number. Rows must be added in order.
+            values (iter): Values to store
+        """
+        if len(self.present) < row:
+            self._pad(row)
+        lookup = self.lookup
+        codes = self.codes
+        for value in values:
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(self.values)
+                self.values.append(value)
+            codes.append(code)
+        self.offsets.append(len(codes))
+        self.present.append(1)
+
+    def add(self, row, tag):
+        """
+        Store a character's tag
+
+        Args:
+            row (int): Row number. Rows must be added in order.
+            tag (Tag|GroupTag): Tag to store
+        """
+        self.add_values(row, tag)
+        if tag.subtag_name is None:
+            return
+
+        # group tags also store their subtag values
+        if self.grouped is None:
+            self.grouped = bytearray()
+            self.members = _ColumnBuilder(None)
+        self.grouped.extend(bytes(row - len(self.grouped)))
+        self.grouped.append(1)
+        self.members.add_values(row, (value for group in tag for value in tag[group]))
+
+    def finish(self, rows, np=None):
+        """
+        Make the finished column
+
+        Args:
+            rows (int): Number of rows in the table
+            np (module|None): NumPy module to store the arrays with, or None
+
+        Returns:
+            Column object
+        """
+        self._pad(rows)
+        codes, offsets, present, grouped, members = self.codes, self.offsets, self.present, self.grouped, None
+        if grouped is not None:
+            grouped.extend(bytes(rows - len(grouped)))
+            members = self.members.finish(rows, np)
+        if np is not None:
+            codes = np.array(codes, dtype=np.intp)
+            offsets = np.array(offsets, dtype=np.intp)
+            present = np.frombuffer(bytes(present), dtype=np.uint8)
+            if grouped is not None:
+                grouped = np.frombuffer(bytes(grouped), dtype=np.uint8)
+        return Column(self.name, grouped, self.values, codes, offsets, present, members, np)
+
+def _either(left, right):
+    """
+    Combine two lists of row tests with a logical or
+
+    Args:
+        left (list|ndarray): One bool for each row
+        right (list|ndarray): One bool for each row
+
+    Returns:
+        One bool for each row
+    """
+    if numpy is not None and isinstance(left, numpy.ndarray):
+        return left | right
+    return [a or b for a, b in zip(left, right)]
@@ -8,4 +8,6 @@ from .unknown_tag import UnknownTag
 from .description_tag import DescriptionTag
 from .group_tag import GroupTag
 from .tag_container import TagContainer
+from .tag_view import TagView
+from .sanitized_tags import SanitizedTags
 from .sub_tag import SubTag
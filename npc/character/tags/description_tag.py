@@ -9,6 +9,8 @@ class DescriptionTag(Tag):
     This is designed to be used for the description text from a sheet. This data
     is stored, but not prefixed with a tag name.
     """
+    __slots__ = ()
+
     def __init__(self, *args):
         """
         Create a new description tag
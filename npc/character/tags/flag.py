@@ -1,9 +1,11 @@
-from .tag import Tag
+from .tag import Tag, NO_VALUES
 
 class Flag(Tag):
     """
     Defines a special type of tag which can be present with no values
     """
+    __slots__ = ('_present',)
+
     def __init__(self, *args, **kwargs):
         """
         Create a new Flag object
@@ -92,18 +94,19 @@ class Flag(Tag):
         Returns:
             True if this flag has no validation problems, false if not
         """
-        self.problems = []
+        problems = []
 
         if self.required and not self.present:
-            self.problems.append("No values for flag '{}'".format(self.name))
+            problems.append("No values for flag '{}'".format(self.name))
 
-        for value in [v for v in self.hidden_values if not v in self.data]:
-            self.problems.append("Value '{}' for tag '{}' cannot be hidden, because it does not exist".format(value, self.name))
+        for value in [v for v in self._hidden_values if not v in self.data]:
+            problems.append("Value '{}' for tag '{}' cannot be hidden, because it does not exist".format(value, self.name))
 
         if strict:
             if self.limit > -1 and len(self.data) > self.limit:
-                self.problems.append("Too many values for flag '{}'. Limit of {}".format(self.name, self.limit))
+                problems.append("Too many values for flag '{}'. Limit of {}".format(self.name, self.limit))
 
+        self._problems = problems or NO_VALUES
         return self.valid
 
     def to_header(self):
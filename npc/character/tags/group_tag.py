@@ -1,13 +1,21 @@
-from collections import UserDict
+from collections.abc import MutableMapping
 from copy import copy
 from npc.util import print_err
+from npc.util.interning import folded
 
 from .sub_tag import SubTag
+from .tag import NO_VALUES
 
-class GroupTag(UserDict):
+class GroupTag(MutableMapping):
     """
     Defines a mult-value tag object
+
+    Group tags behave like dicts of their values, each holding a SubTag. Like
+    Tag, they use __slots__ and only make lists for hidden values and problems
+    once something is added.
     """
+    __slots__ = ('data', 'name', 'required', 'hidden', 'limit', 'subtag_name', '_hidden_values', '_problems')
+
     def __init__(self,
         name: str,
         *args,
@@ -41,15 +49,86 @@ class GroupTag(UserDict):
         self.name = name
         self.required = required
         self.hidden = hidden
-        self.hidden_values = []
+        self._hidden_values = NO_VALUES
         self.limit = limit
-        self.problems = []
+        self._problems = NO_VALUES
         self.subtag_name = subtag
+        self.data = {}
 
-        super().__init__(**kwargs)
-
+        if kwargs:
+            self.update(kwargs)
         self.update(args)
 
+    @property
+    def hidden_values(self):
+        """
+        list: Values that should not be shown. The list is created the first
+        time it is used.
+        """
+        if self._hidden_values is NO_VALUES:
+            self._hidden_values = []
+        return self._hidden_values
+
+    @hidden_values.setter
+    def hidden_values(self, values):
+        self._hidden_values = values
+
+    @property
+    def problems(self):
+        """
+        list: Problems found by validate(). The list is created the first time
+        it is used.
+        """
+        if self._problems is NO_VALUES:
+            self._problems = []
+        return self._problems
+
+    @problems.setter
+    def problems(self, values):
+        self._problems = values
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, item):
+        self.data[key] = item
+
+    def __delitem__(self, key):
+        del self.data[key]
+
+    def keys(self):
+        return self.data.keys()
+
+    def items(self):
+        return self.data.items()
+
+    def values(self):
+        return self.data.values()
+
+    def clear(self):
+        self.data.clear()
+
+    def __copy__(self):
+        new_tag = type(self).__new__(type(self))
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                if hasattr(self, slot):
+                    setattr(new_tag, slot, getattr(self, slot))
+        new_tag.data = self.data.copy()
+        return new_tag
+
+    def copy(self):
+        return copy(self)
+
     def __repr__(self):
         return "{cls}('{name}', {data}, required={req}, hidden={hidden}, hidden_values={hidden_vals}, limit={limit}, subtag='{subtag}')".format(
             cls=type(self).__name__,
@@ -57,7 +136,7 @@ class GroupTag(UserDict):
             data=self.data,
             req=self.required,
             hidden=self.hidden,
-            hidden_vals=self.hidden_values,
+            hidden_vals=list(self._hidden_values),
             limit=self.limit,
             subtag=self.subtag_name
         )
@@ -75,8 +154,8 @@ class GroupTag(UserDict):
         """
         if hasattr(values, 'hidden'):
             self.hidden = values.hidden
-        if hasattr(values, 'hidden_values'):
-            self.hidden_values = values.hidden_values
+        if hasattr(values, '_hidden_values'):
+            self._hidden_values = values._hidden_values
 
         if isinstance(values, GroupTag):
             for key, subtag in values.items():
@@ -158,7 +237,7 @@ class GroupTag(UserDict):
 
         This property is only meaningful after calling validate()
         """
-        return len(self.problems) == 0
+        return len(self._problems) == 0
 
     def validate(self, strict: bool=False):
         """
@@ -177,25 +256,26 @@ class GroupTag(UserDict):
         Returns:
             True if this tag has no validation problems, false if not
         """
-        self.problems = []
+        problems = []
 
         if self.required and not self.filled:
-            self.problems.append("No values for tag '{}'".format(self.name))
+            problems.append("No values for tag '{}'".format(self.name))
 
         if self.required and self.limit == 0:
-            self.problems.append("Tag '{}' is required but limited to zero values".format(self.name))
+            problems.append("Tag '{}' is required but limited to zero values".format(self.name))
 
-        for value in [v for v in self.hidden_values if not v in self.data]:
-            self.problems.append("Value '{}' for tag '{}' cannot be hidden, because it does not exist".format(value, self.name))
+        for value in [v for v in self._hidden_values if not v in self.data]:
+            problems.append("Value '{}' for tag '{}' cannot be hidden, because it does not exist".format(value, self.name))
 
         for value, subtag in self.data.items():
             if subtag.name != self.subtag_name:
-                self.problems.append("Tag '{}' uses subtag '{}', but found '{}' for '{}'".format(self.name, self.subtag_name, subtag.name, value))
+                problems.append("Tag '{}' uses subtag '{}', but found '{}' for '{}'".format(self.name, self.subtag_name, subtag.name, value))
 
         if strict:
             if self.limit > -1 and len(self.data) > self.limit:
-                self.problems.append("Too many values for tag '{}'. Limit of {}".format(self.name, self.limit))
+                problems.append("Too many values for tag '{}'. Limit of {}".format(self.name, self.limit))
 
+        self._problems = problems or NO_VALUES
         return self.valid
 
     def to_header(self):
@@ -217,7 +297,7 @@ class GroupTag(UserDict):
         header_lines = []
         for val, subtag in self.data.items():
             header_lines.append("@{} {}".format(self.name, val))
-            if val in self.hidden_values:
+            if val in self._hidden_values:
                 header_lines.append("@hide {} >> {}".format(self.name, val))
             header_lines.append(subtag.to_header(self.name, val))
 
@@ -296,7 +376,7 @@ class GroupTag(UserDict):
 
         Otherwise, contains is only true when the value is wholly or partially
         filled in at least one value. The comparison is done using casefold()
-        to avoid case conflicts.
+        to avoid case conflicts. Folded forms of pooled values are reused.
 
         Args:
             value (str): Value to search for
@@ -309,7 +389,7 @@ class GroupTag(UserDict):
 
         value = value.casefold()
         for real_value in self:
-            if value in real_value.casefold():
+            if value in folded(real_value):
                 return True
             if self[real_value].contains(value):
                 return True
@@ -336,7 +416,7 @@ class GroupTag(UserDict):
         if self.hidden:
             self.clear()
 
-        for value in self.hidden_values:
+        for value in self._hidden_values:
             try:
                 del self.data[value]
             except KeyError:
@@ -344,3 +424,28 @@ class GroupTag(UserDict):
 
         for subtag in self.values():
             subtag.sanitize()
+
+    def sanitized(self):
+        """
+        Get this tag as it should appear in listings
+
+        Unlike sanitize(), this does not change the tag or its subtags. Tags
+        with nothing to hide are returned as-is, and the rest are sanitized
+        copies that share the subtags with nothing to hide.
+
+        Returns:
+            This tag, or a new tag object without the hidden values
+        """
+        subtags = {}
+        changed = self.hidden or bool(self._hidden_values)
+        for value, subtag in self.data.items():
+            subtags[value] = subtag.sanitized()
+            changed = changed or subtags[value] is not subtag
+        if not changed:
+            return self
+
+        new_tag = copy(self)
+        new_tag.data = {} if self.hidden else subtags
+        for value in self._hidden_values:
+            new_tag.data.pop(value, None)
+        return new_tag
@@ -0,0 +1,151 @@
+from collections.abc import Mapping
+from copy import copy
+
+from .tag_container import TagContainer, _is_present
+from .tag_view import TagView
+from .unknown_tag import UnknownTag
+
+class SanitizedTags(Mapping):
+    """
+    Read-only view of a container's tags as they should appear in listings
+
+    This gives the same tags that calling sanitize() on the container and on
+    its character would leave behind, without changing either one:
+
+    * Hidden tags and values are left out
+    * The type tag is the faketype tag when that is filled
+    * An empty type tag reads as 'Unknown'
+
+    Each tag is worked out the first time it is asked for. Tags with nothing
+    to hide are the container's own objects, so do not change them through
+    the view.
+
+    Like TagContainer, views are callable. Calling a view with the name of a
+    tag that is missing returns a new, empty UnknownTag, which is not added to
+    anything.
+    """
+    __slots__ = ('_container', '_tags')
+
+    def __init__(self, container):
+        """
+        Create a new sanitized view
+
+        Args:
+            container (TagContainer): Container holding the tags
+        """
+        self._container = container
+        self._tags = {}
+
+    @property
+    def data(self):
+        """
+        SanitizedTags: The view itself, so that it can stand in for a
+        container's data dict
+        """
+        return self
+
+    def __call__(self, tag_name: str):
+        """
+        Get a tag by its name
+
+        Args:
+            tag_name (str): Name of the tag to fetch
+
+        Returns:
+            The sanitized tag object, or an empty UnknownTag object if the
+            container does not have the tag
+        """
+        try:
+            return self[tag_name]
+        except KeyError:
+            return UnknownTag(tag_name)
+
+    def __getitem__(self, tag_name):
+        tag = self._tags.get(tag_name)
+        if tag is None:
+            if tag_name == 'type':
+                tag = self._type_tag()
+            else:
+                tag = self._container.data[tag_name].sanitized()
+            self._tags[tag_name] = tag
+        return tag
+
+    def __contains__(self, tag_name):
+        return tag_name in self._container.data or tag_name == 'type'
+
+    def __iter__(self):
+        names = self._container.data.keys()
+        if 'type' not in names:
+            return iter(list(names) + ['type'])
+        return iter(names)
+
+    def __len__(self):
+        return len(self._container.data) + (0 if 'type' in self._container.data else 1)
+
+    def _type_tag(self):
+        """
+        Work out what the type tag should show
+
+        Returns:
+            The sanitized faketype tag if it is filled, the sanitized type tag
+            if it is filled, or a type tag holding 'Unknown'
+        """
+        faketype = self._container.data.get('faketype')
+        if faketype is not None:
+            faketype = faketype.sanitized()
+            if faketype.filled:
+                return faketype
+
+        type_tag = self._container.data.get('type')
+        if type_tag is None:
+            type_tag = UnknownTag('type')
+        else:
+            type_tag = type_tag.sanitized()
+            if type_tag.filled:
+                return type_tag
+            type_tag = copy(type_tag)
+        type_tag.append('Unknown')
+        return type_tag
+
+    def all(self):
+        """
+        Iterate over the sanitized tag objects
+
+        Returns:
+            Iterator for the sanitized tag objects
+        """
+        return iter(self.values())
+
+    def names(self):
+        """
+        Get a view of the tag names
+
+        Returns:
+            KeysView of the tag names
+        """
+        return self.keys()
+
+    def present(self):
+        """
+        Get a read-only view of the sanitized tags marked as present
+
+        Returns:
+            TagView object with only present tags
+        """
+        return TagView(self, _is_present)
+
+    def copy(self):
+        """
+        Create a new container holding the sanitized tags
+
+        The new container can be changed without affecting the view or the
+        original container, although the tag objects themselves are shared.
+
+        Returns:
+            TagContainer object
+        """
+        new_container = TagContainer()
+        new_container.data = dict(self.items())
+        return new_container
+
+    __copy__ = copy
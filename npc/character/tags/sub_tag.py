@@ -4,6 +4,8 @@ class SubTag(Tag):
     """
     Tag object used to store sub-values for a group tag
     """
+    __slots__ = ()
+
     def to_header(self, parent_name: str, key_name: str):
         """
         Generate the header string for this subtag
@@ -20,7 +22,7 @@ class SubTag(Tag):
         header_lines = []
         for val in self.data:
             header_lines.append("@{} {}".format(self.name, val))
-            if val in self.hidden_values:
+            if val in self._hidden_values:
                 header_lines.append("@hide {} >> {} >> {}".format(parent_name, key_name, val))
 
         if self.hidden:
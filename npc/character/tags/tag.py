@@ -1,11 +1,30 @@
-from collections import UserList
+from collections.abc import MutableSequence
 from copy import copy
 from npc.util import print_err
+from npc.util.interning import folded
 
-class Tag(UserList):
+NO_VALUES = ()
+"""tuple: shared stand-in for the hidden values and problems of every tag that
+has none, so that empty lists are only made when something is added"""
+
+class Tag(MutableSequence):
     """
     Defines a mult-value tag object
+
+    Tags behave like lists of their values. They use __slots__ and share an
+    empty tuple for hidden values and problems until one is added, since a
+    campaign can hold tens of thousands of them.
+
+    The filled values are worked out once and kept until the values change.
+    Every method that changes the values calls _changed() to forget them.
+    Assigning to `data` does too, but changing the `data` list in place does
+    not, so go through the tag's own methods instead.
     """
+    __slots__ = ('_data', 'name', 'required', 'hidden', 'limit', '_hidden_values', '_problems', '_filled_data', '_revision')
+
+    subtag_name = None
+    """None: plain tags have no subtags. See GroupTag."""
+
     def __init__(self, name: str, *args, required: bool=False, hidden: bool=False, limit: int=-1):
         """
         Create a new Tag object
@@ -25,21 +44,173 @@ class Tag(UserList):
         self.name = name
         self.required = required
         self.hidden = hidden
-        self.hidden_values = []
+        self._hidden_values = NO_VALUES
         self.limit = limit
-        self.problems = []
-        self.subtag_name = None
+        self._problems = NO_VALUES
+        self._revision = 0
+        self.data = list(args)
+
+    @property
+    def data(self):
+        """
+        list: The tag's values
+        """
+        return self._data
+
+    @data.setter
+    def data(self, values):
+        self._data = values
+        self._changed()
+
+    @property
+    def revision(self):
+        """
+        int: Number of times the values have changed. Lets other objects cache
+        what they work out from the tag.
+        """
+        return self._revision
+
+    def _changed(self):
+        """
+        Forget the values worked out from the old data
+        """
+        self._filled_data = None
+        self._revision += 1
+
+    @property
+    def hidden_values(self):
+        """
+        list: Values that should not be shown. The list is created the first
+        time it is used.
+        """
+        if self._hidden_values is NO_VALUES:
+            self._hidden_values = []
+        return self._hidden_values
+
+    @hidden_values.setter
+    def hidden_values(self, values):
+        self._hidden_values = values
+
+    @property
+    def problems(self):
+        """
+        list: Problems found by validate(). The list is created the first time
+        it is used.
+        """
+        if self._problems is NO_VALUES:
+            self._problems = []
+        return self._problems
+
+    @problems.setter
+    def problems(self, values):
+        self._problems = values
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __contains__(self, item):
+        return item in self._data
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            new_tag = copy(self)
+            new_tag.data = self._data[i]
+            return new_tag
+        return self._data[i]
+
+    def __setitem__(self, i, item):
+        self._data[i] = item
+        self._changed()
+
+    def __delitem__(self, i):
+        del self._data[i]
+        self._changed()
+
+    def insert(self, i, item):
+        self._data.insert(i, item)
+        self._changed()
 
-        super().__init__(args)
+    def __eq__(self, other):
+        return self._data == _values_of(other)
+
+    def __lt__(self, other):
+        return self._data < _values_of(other)
+
+    def __le__(self, other):
+        return self._data <= _values_of(other)
+
+    def __gt__(self, other):
+        return self._data > _values_of(other)
+
+    def __ge__(self, other):
+        return self._data >= _values_of(other)
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return self._data + list(_values_of(other))
+
+    def __radd__(self, other):
+        return list(_values_of(other)) + self._data
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __copy__(self):
+        new_tag = type(self).__new__(type(self))
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                if hasattr(self, slot):
+                    setattr(new_tag, slot, getattr(self, slot))
+        new_tag.data = self._data[:]
+        return new_tag
+
+    def copy(self):
+        return copy(self)
+
+    def extend(self, other):
+        self._data.extend(_values_of(other))
+        self._changed()
+
+    def clear(self):
+        self._data.clear()
+        self._changed()
+
+    def pop(self, i=-1):
+        value = self._data.pop(i)
+        self._changed()
+        return value
+
+    def remove(self, item):
+        self._data.remove(item)
+        self._changed()
+
+    def count(self, item):
+        return self._data.count(item)
+
+    def index(self, item, *args):
+        return self._data.index(item, *args)
+
+    def reverse(self):
+        self._data.reverse()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        self._data.sort(*args, **kwargs)
+        self._changed()
 
     def __repr__(self):
         return "{cls}('{name}', {data}, required={req}, hidden={hidden}, hidden_values={hidden_vals}, limit={limit})".format(
             cls=type(self).__name__,
             name=self.name,
-            data=self.data,
+            data=self._data,
             req=self.required,
             hidden=self.hidden,
-            hidden_vals=self.hidden_values,
+            hidden_vals=list(self._hidden_values),
             limit=self.limit
         )
 
@@ -52,13 +223,13 @@ class Tag(UserList):
         """
         if hasattr(values, 'hidden'):
             self.hidden = values.hidden
-        if hasattr(values, 'hidden_values'):
-            self.hidden_values.extend(values.hidden_values)
+        if getattr(values, '_hidden_values', None):
+            self.hidden_values.extend(values._hidden_values)
 
         if hasattr(values, 'data'):
-            self.data = values.data
-        else:
-            self.data = values
+            values = values.data
+        # copied so that other tags never share our list
+        self.data = list(values)
 
     def append(self, value: str):
         """
@@ -72,7 +243,8 @@ class Tag(UserList):
         if not value.strip():
             return
 
-        super().append(value)
+        self._data.append(value)
+        self._changed()
 
     @property
     def filled(self):
@@ -102,9 +274,14 @@ class Tag(UserList):
     @property
     def filled_data(self):
         """
-        list: All non-whitespace values
+        list: All non-whitespace values. The list is kept until the values
+        change, and may be the data list itself, so copy it before changing
+        it.
         """
-        return [v for v in self.data if v.strip()]
+        if self._filled_data is None:
+            filled = [v for v in self._data if v.strip()]
+            self._filled_data = self._data if len(filled) == len(self._data) else filled
+        return self._filled_data
 
     def touch(self, present: bool = True):
         """
@@ -138,7 +315,7 @@ class Tag(UserList):
 
         This property is only meaningful after calling validate()
         """
-        return len(self.problems) == 0
+        return len(self._problems) == 0
 
     def validate(self, strict: bool=False):
         """
@@ -156,21 +333,22 @@ class Tag(UserList):
         Returns:
             True if this tag has no validation problems, false if not
         """
-        self.problems = []
+        problems = []
 
         if self.required and not self.filled:
-            self.problems.append("No values for tag '{}'".format(self.name))
+            problems.append("No values for tag '{}'".format(self.name))
 
         if self.required and self.limit == 0:
-            self.problems.append("Tag '{}' is required but limited to zero values".format(self.name))
+            problems.append("Tag '{}' is required but limited to zero values".format(self.name))
 
-        for value in [v for v in self.hidden_values if not v in self.data]:
-            self.problems.append("Value '{}' for tag '{}' cannot be hidden, because it does not exist".format(value, self.name))
+        for value in [v for v in self._hidden_values if not v in self._data]:
+            problems.append("Value '{}' for tag '{}' cannot be hidden, because it does not exist".format(value, self.name))
 
         if strict:
-            if self.limit > -1 and len(self.data) > self.limit:
-                self.problems.append("Too many values for tag '{}'. Limit of {}".format(self.name, self.limit))
+            if self.limit > -1 and len(self._data) > self.limit:
+                problems.append("Too many values for tag '{}'. Limit of {}".format(self.name, self.limit))
 
+        self._problems = problems or NO_VALUES
         return self.valid
 
     def to_header(self):
@@ -190,9 +368,9 @@ class Tag(UserList):
             return ''
 
         header_lines = []
-        for val in self.data:
+        for val in self._data:
             header_lines.append("@{} {}".format(self.name, val))
-            if val in self.hidden_values:
+            if val in self._hidden_values:
                 header_lines.append("@hide {} >> {}".format(self.name, val))
 
         if self.hidden:
@@ -216,7 +394,7 @@ class Tag(UserList):
             Tag object containing the sliced values
         """
         new_tag = copy(self)
-        new_tag.data = self.data[start:stop]
+        new_tag.data = self._data[start:stop]
         return new_tag
 
     def first(self):
@@ -262,7 +440,7 @@ class Tag(UserList):
 
         Otherwise, contains is only true when the value is wholly or partially
         filled in at least one value. The comparison is done using casefold()
-        to avoid case conflicts.
+        to avoid case conflicts. Folded forms of pooled values are reused.
 
         Args:
             value (str): Value to search for
@@ -275,7 +453,7 @@ class Tag(UserList):
 
         value = value.casefold()
         for real_value in self:
-            if value in real_value.casefold():
+            if value in folded(real_value):
                 return True
 
         return False
@@ -299,8 +477,38 @@ class Tag(UserList):
         if self.hidden:
             self.clear()
 
-        for value in self.hidden_values:
+        for value in self._hidden_values:
             try:
-                self.data.remove(value)
+                self._data.remove(value)
             except ValueError:
                 continue
+        self._changed()
+
+    def sanitized(self):
+        """
+        Get this tag as it should appear in listings
+
+        Unlike sanitize(), this does not change the tag. Tags with nothing to
+        hide are returned as-is, and the rest are sanitized copies.
+
+        Returns:
+            This tag, or a new tag object without the hidden values
+        """
+        if not self.hidden and not self._hidden_values:
+            return self
+
+        new_tag = copy(self)
+        new_tag.sanitize()
+        return new_tag
+
+def _values_of(other):
+    """
+    Get the values to compare against or add from another object
+
+    Args:
+        other (Tag|list): Tag or plain sequence of values
+
+    Returns:
+        The tag's data list, or other unchanged
+    """
+    return other.data if isinstance(other, Tag) else other
@@ -1,7 +1,19 @@
 from collections import UserDict
-from copy import copy
 
 from . import *
+from .tag_view import TagView
+
+def _is_present(tag):
+    """
+    Test whether a tag is present, for TagContainer.present
+
+    Args:
+        tag (Tag): Tag object to test
+
+    Returns:
+        The tag's present property
+    """
+    return tag.present
 
 class TagContainer(UserDict):
     """
@@ -87,14 +99,27 @@ class TagContainer(UserDict):
 
     def present(self):
         """
-        Create a new container with only the tags marked as present
+        Get a read-only view of the tags marked as present
+
+        Use copy() on the view to get a container that can be changed.
+
+        Returns:
+            TagView object with only present tags
+        """
+        return TagView(self, _is_present)
+
+    def filtered(self, accept):
+        """
+        Get a read-only view of the tags that pass a test
+
+        Args:
+            accept (callable): Function that takes a tag object and returns
+                whether to include it
 
         Returns:
-            TagContainer object with only present tags
+            TagView object with only the accepted tags
         """
-        new_container = copy(self)
-        new_container.data = {k: v for k, v in self.data.items() if v.present}
-        return new_container
+        return TagView(self, accept)
 
     def _add_taglike(self, klass, *args, **kwargs):
         """
@@ -146,8 +171,8 @@ class TagContainer(UserDict):
         self.problems = []
 
         for key, tag in self.data.items():
-            tag.validate(strict=strict)
-            self.problems.extend(tag.problems)
+            if not tag.validate(strict=strict):
+                self.problems.extend(tag.problems)
             if key != tag.name:
                 self.problems.append("Tag '{}' has wrong key: '{}'".format(tag.name, key))
 
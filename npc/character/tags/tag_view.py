@@ -0,0 +1,107 @@
+from collections.abc import Mapping
+from copy import copy
+
+from .unknown_tag import UnknownTag
+
+class TagView(Mapping):
+    """
+    Read-only view of the tags in a container that pass a test
+
+    Views hold no tags of their own. Membership is worked out from the
+    container every time it is needed, so a view always reflects the current
+    state of its container and costs nothing to create.
+
+    Like TagContainer, views are callable. Calling a view with the name of a
+    tag that is missing or does not pass the test returns a new, empty
+    UnknownTag, which is not added to anything.
+    """
+    __slots__ = ('_container', '_accept')
+
+    def __init__(self, container, accept):
+        """
+        Create a new tag view
+
+        Args:
+            container (TagContainer): Container holding the tags
+            accept (callable): Function that takes a tag object and returns
+                whether the view includes it
+        """
+        self._container = container
+        self._accept = accept
+
+    def __call__(self, tag_name: str):
+        """
+        Get a tag by its name
+
+        Args:
+            tag_name (str): Name of the tag to fetch
+
+        Returns:
+            The container's tag object if the view includes it, or an empty
+            UnknownTag object if not
+        """
+        tag = self._container.data.get(tag_name)
+        if tag is None or not self._accept(tag):
+            return UnknownTag(tag_name)
+        return tag
+
+    def __getitem__(self, tag_name):
+        tag = self._container.data[tag_name]
+        if not self._accept(tag):
+            raise KeyError(tag_name)
+        return tag
+
+    def __contains__(self, tag_name):
+        tag = self._container.data.get(tag_name)
+        return tag is not None and self._accept(tag)
+
+    def __iter__(self):
+        accept = self._accept
+        return (name for name, tag in self._container.data.items() if accept(tag))
+
+    def __len__(self):
+        accept = self._accept
+        return sum(1 for tag in self._container.data.values() if accept(tag))
+
+    def all(self):
+        """
+        Iterate over the included tag objects
+
+        Returns:
+            Iterator for the included tag objects
+        """
+        accept = self._accept
+        return (tag for tag in self._container.data.values() if accept(tag))
+
+    def names(self):
+        """
+        Get a view of the included tag names
+
+        Returns:
+            KeysView of the included tag names
+        """
+        return self.keys()
+
+    def present(self):
+        """
+        Get a view of the included tags that are marked as present
+
+        Returns:
+            TagView object
+        """
+        accept = self._accept
+        return TagView(self._container, lambda tag: accept(tag) and tag.present)
+
+    def copy(self):
+        """
+        Create a new container holding the included tags
+
+        The new container can be changed without affecting the original one,
+        although the tag objects themselves are shared.
+
+        Returns:
+            TagContainer object
+        """
+        new_container = copy(self._container)
+        new_container.data = dict(self.items())
+        return new_container
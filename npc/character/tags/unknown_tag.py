@@ -10,6 +10,8 @@ class UnknownTag(Flag):
 
     These tags cannot be required and will always be invalid in strict mode.
     """
+    __slots__ = ()
+
     def __init__(self, name: str, *args, hidden: bool=False, limit: int=-1):
         """
         Create a new UnknownTag object
@@ -50,7 +52,7 @@ class UnknownTag(Flag):
             True if this tag has no validation problems, false if not
         """
 
-        for value in [v for v in self.hidden_values if not v in self.data]:
+        for value in [v for v in self._hidden_values if not v in self.data]:
             self.problems.append("Value '{}' for tag '{}' cannot be hidden, because it does not exist".format(value, self.name))
 
         if strict:
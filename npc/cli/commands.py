@@ -36,6 +36,10 @@ def find(kwargs):
     serial_args, keyword_args = util.serialize_args('rules', **kwargs)
     return commands.find(*serial_args, **keyword_args)
 
+def watch(kwargs):
+    serial_args, keyword_args = util.serialize_args('search', **kwargs)
+    return commands.watch(*serial_args, **keyword_args)
+
 def create_standard(kwargs):
     serial_args, keyword_args = util.serialize_args('name', 'ctype', **kwargs)
     return commands.create_character.standard(*serial_args, **keyword_args)
@@ -6,7 +6,7 @@ Provides the cli method for interpreting commandline arguments.
 
 import argparse
 import sys
-from os import chdir
+from os import chdir, getcwd, path
 
 # local packages
 from npc import util, settings
@@ -33,6 +33,15 @@ def start(argv=None):
         argv = sys.argv[1:]
     args = parser.parse_args(argv)
 
+    # the path list and the paths inside it are relative to where npc was run,
+    # and so is the dump file
+    origin = getcwd()
+    search_from = getattr(args, 'search_from', None)
+    if search_from is not None and search_from != '-':
+        search_from = path.join(origin, search_from)
+    if getattr(args, 'from_dump', None) not in (None, '-'):
+        args.from_dump = path.join(origin, args.from_dump)
+
     # change to the proper campaign directory if needed
     base = args.campaign
     if base == 'auto':
@@ -65,9 +74,23 @@ def start(argv=None):
     # get args as a dict
     full_args = vars(args)
     full_args['prefs'] = prefs
-
-    # load default character path if search field is at its default
-    if full_args.get('search') is None:
+    full_args.pop('search_from', None)
+
+    path_list = None
+    if search_from == '-':
+        path_list = sys.stdin
+    elif search_from is not None:
+        try:
+            path_list = open(search_from, 'r')
+        except OSError as err:
+            util.print_err("{}: '{}'".format(err.strerror, search_from))
+            return 4
+
+    if path_list is not None:
+        # listed paths are streamed to the parser after any --search paths
+        full_args['search'] = [full_args.get('search') or [], util.read_path_list(path_list, base=origin)]
+    elif full_args.get('search') is None:
+        # load default character path if search field is at its default
         full_args['search'] = [prefs.get('paths.required.characters')]
 
     # run the command
@@ -78,6 +101,9 @@ def start(argv=None):
             raise
         util.print_err(err)
         return 6
+    finally:
+        if path_list is not None and path_list is not sys.stdin:
+            path_list.close()
 
     # handle errors
     if not result.success:
@@ -113,7 +139,15 @@ def _make_parser():
     # Parent parser for shared pathing options
     paths_parser = argparse.ArgumentParser(add_help=False)
     paths_parser.add_argument('--search', nargs="*", default=None, help="Paths to search. Individual files are added verbatim and directories are searched recursively.", metavar="PATH")
+    paths_parser.add_argument('--search-from', default=None, help="Read more paths to search from a file, or from stdin when FILE is '-'. Paths are separated by newlines or by NUL characters, as from `git diff --name-only -z`. When given, the default character path is not searched.", metavar="FILE")
     paths_parser.add_argument('--ignore', nargs="*", default=None, help="Paths to skip when searching for character files", metavar="PATH")
+    paths_parser.add_argument('-j', '--jobs', type=int, default=None, help="Number of processes to use when parsing character files. Use 0 for one per CPU. Defaults to the parser.jobs setting.", metavar="N")
+    paths_parser.add_argument('--io-threads', type=int, default=None, help="Number of threads to use when reading character files. Helps on network filesystems. Defaults to the parser.io_threads setting.", metavar="N")
+    paths_parser.add_argument('--report-aliases', action='store_true', default=False, help="Report files and directories that are skipped because they were already found through another path, like a symlink")
+
+    # Parent parser for commands that can read characters from a dump
+    dump_source = argparse.ArgumentParser(add_help=False)
+    dump_source.add_argument('--from-dump', default=None, help="Read characters from a file made by the dump command, or from stdin when FILE is '-', instead of parsing character files. Takes JSON or NDJSON.", metavar="FILE")
 
     common_options = argparse.ArgumentParser(add_help=False)
     common_options.add_argument('-b', '--batch', action='store_true', default=False, help="Do not print any messages or open any files in the editor")
@@ -184,7 +218,7 @@ def _make_parser():
     parser_lint.set_defaults(func=commands.lint)
 
     # Subcommand to list character data in multiple formats
-    parser_list = subparsers.add_parser('list', parents=[common_options, paths_parser], help="Generate an NPC Listing")
+    parser_list = subparsers.add_parser('list', parents=[common_options, paths_parser, dump_source], help="Generate an NPC Listing")
     parser_list.add_argument('-t', '--format', choices=['markdown', 'md', 'json', 'htm', 'html'], default='default', help="Format to use for the listing. Defaults to the list format in settings", dest="fmt")
     parser_list.add_argument('-m', '--metadata', nargs="?", const='default', default=False, help="Add metadata to the output. If the output format supports more than one metadata format, you can specify that format as well.")
     parser_list.add_argument('--title', help="Title to show in the metadata. Overrides the title from settings.", metavar="TITLE")
@@ -199,6 +233,7 @@ def _make_parser():
     parser_dump = subparsers.add_parser('dump', parents=[common_options, paths_parser], help="Export raw json data of all characters")
     parser_dump.add_argument('-s', '--do_sort', action="store_true", default=False, help="Sort the characters")
     parser_dump.add_argument('-m', '--metadata', action="store_true", default=False, help="Add metadata to the output.")
+    parser_dump.add_argument('--directives', action="store_true", default=False, help="Record hidden data and flags without a value, so the dump can be read back with --from-dump.")
     parser_dump.add_argument('-o', '--outfile', nargs="?", const='-', default=None, help="File where the listing will be saved")
     parser_dump.add_argument('--sort_by', default='', help="The sort order for characters. Separate multiple tags with a comma. Defaults to the settings value 'dump.sort_by'.")
     parser_dump.add_argument('--no_sort', action='store_false', dest='do_sort', help="Do not sort characters at all")
@@ -219,18 +254,29 @@ def _make_parser():
     parser_settings.set_defaults(func=commands.open_settings)
 
     # Report on character tags
-    parser_report = subparsers.add_parser('report', parents=[common_options, paths_parser], help="Create a report of the values for one or more tags")
+    parser_report = subparsers.add_parser('report', parents=[common_options, paths_parser, dump_source], help="Create a report of the values for one or more tags")
     parser_report.add_argument('tags', nargs="+", help="Tag names to analyze")
     parser_report.add_argument('-t', '--format', choices=['json', 'htm', 'html', 'md', 'markdown'], default='default', help="Format to use for the tables. Defaults to the table format in settings", dest="fmt")
     parser_report.add_argument('-o', '--outfile', nargs="?", const='-', default=None, help="File where the listing will be saved")
     parser_report.set_defaults(func=commands.report)
 
     # Find characters by tag contents
-    parser_find = subparsers.add_parser('find', parents=[common_options, paths_parser], help="Find characters by their tags")
+    parser_find = subparsers.add_parser('find', parents=[common_options, paths_parser, dump_source], help="Find characters by their tags")
     parser_find.add_argument('rules', nargs="+", help="Rules to search by. Format for each is tag:text. Negate with tag~:text.")
     parser_find.add_argument('-d', '--dryrun', action="store_true", default=False, help="Show the files that would be opened, but don't open anything", dest="dryrun")
     parser_find.set_defaults(func=commands.find)
 
+    # Keep characters parsed in a background server
+    parser_watch = subparsers.add_parser('watch', parents=[common_options], help="Keep the campaign's characters parsed in memory so other commands can skip parsing. Runs until interrupted.")
+    parser_watch.add_argument('--search', nargs="*", default=None, help="Paths to watch. Defaults to the characters path.", metavar="PATH")
+    parser_watch.add_argument('--ignore', nargs="*", default=None, help="Paths to skip when searching for character files", metavar="PATH")
+    parser_watch.add_argument('--poll', action="store_true", default=False, help="Check for changes on a timer, even if the system can report them")
+    parser_watch.add_argument('--interval', type=float, default=1.0, help="Seconds between checks when polling", metavar="SECONDS")
+    watch_action = parser_watch.add_mutually_exclusive_group()
+    watch_action.add_argument('--status', action="store_true", default=False, help="Show the state of the running server")
+    watch_action.add_argument('--stop', action="store_true", default=False, help="Stop the running server")
+    parser_watch.set_defaults(func=commands.watch)
+
     return parser
 
 def _update_progress_bar(index, total):
@@ -6,7 +6,6 @@ without going through the CLI.
 """
 
 import json
-from collections import Counter
 from os import makedirs, rmdir, getcwd
 from pathlib import Path
 from shutil import move as shmove
@@ -14,8 +13,11 @@ import itertools
 
 import npc
 from npc import formatters, linters, parser, settings
+from npc import watch as campaign_watch
 from npc.util import flatten, result
 from npc.character import Character, CharacterEncoder
+from npc.character.table import CharacterTable
+from npc.character.tags import Tag
 
 from . import create_character, listing, util, story
 
@@ -36,6 +38,13 @@ def reorg(*search, ignore=None, purge=False, verbose=False, commit=False, **kwar
         commit (bool): Whether to actually move files around
         prefs (Settings): Settings object to use. Uses internal settings by
             default.
+        jobs (int|None): Number of processes to use when parsing character
+            files. Defaults to the `parser.jobs` setting.
+        io_threads (int|None): Number of threads to use when reading
+            character files. Defaults to the `parser.io_threads` setting.
+        report_aliases (bool): Whether to print the paths of files and
+            directories that were skipped because they were already found
+            through another path
 
     Returns:
         Result object. Openable will be empty.
@@ -46,6 +55,10 @@ def reorg(*search, ignore=None, purge=False, verbose=False, commit=False, **kwar
     ignore.extend(prefs.get_ignored_paths('reorg'))
     show_changes = verbose or not commit
 
+    search, errmsg = util.on_disk_search(search, from_dump=kwargs.get('from_dump'))
+    if errmsg:
+        return result.OptionError(errmsg=errmsg)
+
     changelog = []
 
     base_path = Path(prefs.get('paths.required.characters'))
@@ -54,7 +67,12 @@ def reorg(*search, ignore=None, purge=False, verbose=False, commit=False, **kwar
 
     if show_changes:
         changelog.append("Move characters")
-    for parsed_character in parser.get_characters(flatten(search), ignore):
+    # parse everything before moving anything, so moved files are not found
+    # again partway through the search
+    # most characters are placed by their type, groups, and flags alone, so
+    # only build the rest of their tags if the path needs them
+    characters = list(util.get_characters(search, ignore, prefs=prefs, jobs=kwargs.get('jobs'), io_threads=kwargs.get('io_threads'), report_aliases=kwargs.get('report_aliases', False), lazy=True, changes_files=True))
+    for parsed_character in characters:
         if parsed_character.tags('keep').present:
             continue
         new_path = Path(util.create_path_from_character(parsed_character, base_path=base_path))
@@ -80,7 +98,7 @@ def reorg(*search, ignore=None, purge=False, verbose=False, commit=False, **kwar
 
     return result.Success(printables=changelog)
 
-def dump(*search, ignore=None, do_sort=False, metadata=False, outfile=None, **kwargs):
+def dump(*search, ignore=None, do_sort=False, metadata=False, directives=False, outfile=None, **kwargs):
     """
     Dump the raw character data, unaltered.
 
@@ -91,10 +109,20 @@ def dump(*search, ignore=None, do_sort=False, metadata=False, outfile=None, **kw
         ignore (List): Paths to ignore
         do_sort (bool): Whether to sort the characters before dumping
         metadata (bool): Whether to prepend metadata to the output
+        directives (bool): Whether to record hidden data and flags without a
+            value as header lines, so the dump can be read back without losing
+            them
         outfile (string|None): Filename to put the dumped data. None and "-"
             print to stdout.
         prefs (Settings): Settings object to use. Uses internal settings by
             default.
+        jobs (int|None): Number of processes to use when parsing character
+            files. Defaults to the `parser.jobs` setting.
+        io_threads (int|None): Number of threads to use when reading
+            character files. Defaults to the `parser.io_threads` setting.
+        report_aliases (bool): Whether to print the paths of files and
+            directories that were skipped because they were already found
+            through another path
 
     Returns:
         Result object. If outfile pointed to a real file, the openable attribute
@@ -106,12 +134,12 @@ def dump(*search, ignore=None, do_sort=False, metadata=False, outfile=None, **kw
     ignore.extend(prefs.get_ignored_paths('dump'))
     sort_by = kwargs.get('sort_by', prefs.get('dump.sort_by'))
 
-    characters = parser.get_characters(flatten(search), ignore)
+    characters = util.get_characters(search, ignore, prefs=prefs, jobs=kwargs.get('jobs'), io_threads=kwargs.get('io_threads'), report_aliases=kwargs.get('report_aliases', False))
     if do_sort:
         sorter = util.character_sorter.CharacterSorter(sort_by, prefs=prefs)
         characters = sorter.sort(characters)
 
-    characters = [c.dump() for c in characters]
+    characters = (c.dump(directives=directives) for c in characters)
 
     # make some json
     if metadata:
@@ -121,8 +149,9 @@ def dump(*search, ignore=None, do_sort=False, metadata=False, outfile=None, **kw
         }
         characters = itertools.chain([meta], characters)
 
+    # unsorted characters are written as they are parsed
     with util.smart_open(outfile) as outstream:
-        json.dump([c for c in characters], outstream, cls=CharacterEncoder)
+        util.write_json_list(characters, outstream, cls=CharacterEncoder)
 
     openable = [outfile] if outfile and outfile != '-' else None
 
@@ -149,6 +178,13 @@ def lint(*search, ignore=None, fix=False, strict=False, report=True, **kwargs):
             descriptions
         prefs (Settings): Settings object to use. Uses internal settings by
             default.
+        jobs (int|None): Number of processes to use when parsing character
+            files. Defaults to the `parser.jobs` setting.
+        io_threads (int|None): Number of threads to use when reading
+            character files. Defaults to the `parser.io_threads` setting.
+        report_aliases (bool): Whether to print the paths of files and
+            directories that were skipped because they were already found
+            through another path
 
     Returns:
         Result object. On success, openable attribute will contain a list of all
@@ -159,17 +195,27 @@ def lint(*search, ignore=None, fix=False, strict=False, report=True, **kwargs):
         ignore = []
     ignore.extend(prefs.get_ignored_paths('lint'))
 
+    if fix:
+        search, errmsg = util.on_disk_search(search, from_dump=kwargs.get('from_dump'))
+        if errmsg:
+            return result.OptionError(errmsg=errmsg)
+
     openable = []
     printable = []
 
     # check each character
-    characters = parser.get_characters(flatten(search), ignore)
+    # the linters read the whole sheet, so keep it from the parse instead of
+    # reading every file twice
+    characters = util.get_characters(search, ignore, prefs=prefs, jobs=kwargs.get('jobs'), io_threads=kwargs.get('io_threads'), report_aliases=kwargs.get('report_aliases', False), keep_body=True)
     for character in characters:
         if character.tags('nolint').present:
             continue
 
         character.validate(strict)
-        character.problems.extend(linters.lint(character, fix=fix, strict=strict, prefs=prefs))
+        try:
+            character.problems.extend(linters.lint(character, fix=fix, strict=strict, prefs=prefs))
+        except OSError as err:
+            character.problems.append("Could not read file: {}".format(err.strerror))
 
         # Report problems on one line if possible, or as a block if there's more than one
         if not character.valid:
@@ -285,6 +331,61 @@ def open_settings(location, show_defaults=False, settings_type=None, **kwargs):
         openable = [target_path]
     return result.Success(openable=openable)
 
+def watch(*search, ignore=None, poll=False, interval=1.0, status=False, stop=False, **kwargs):
+    """
+    Keep the campaign's characters parsed in memory until stopped
+
+    While the server runs, commands that read character files get their
+    characters from it instead of parsing every file. The find command sends
+    its rules to the server and gets back just the matching paths.
+
+    Args:
+        search (list): Paths to watch for character files. Items can be
+            strings or lists of strings.
+        ignore (list): Paths to ignore
+        poll (bool): Whether to check for changes on a timer even when the
+            system can report them as they happen
+        interval (float): Seconds between checks when polling
+        status (bool): Whether to show the state of the running server
+            instead of starting one
+        stop (bool): Whether to stop the running server instead of starting
+            one
+        prefs (Settings): Settings object to use. Uses internal settings by
+            default.
+
+    Returns:
+        Result object. Printables will contain the server state when status is
+        true.
+    """
+    prefs = kwargs.get('prefs', settings.InternalSettings())
+
+    running = campaign_watch.client.status(prefs)
+    if status:
+        if running is None:
+            return result.Success(printables=["No watch server is running"])
+        return result.Success(printables=["Watching {} characters, {} files parsed".format(running['characters'], running['parsed'])])
+    if stop:
+        if not campaign_watch.client.stop(prefs):
+            return result.Failure(errmsg="No watch server is running")
+        return result.Success()
+    if running is not None:
+        return result.Failure(errmsg="A watch server is already running for this campaign")
+
+    if not prefs.campaign_settings_path.is_dir():
+        return result.ConfigError(errmsg="Cannot find the campaign settings directory '{}'. Run `npc init` first.".format(prefs.campaign_settings_path))
+
+    if not ignore:
+        ignore = []
+    ignore.extend(prefs.get_ignored_paths('watch'))
+
+    index = campaign_watch.CampaignIndex(list(flatten(search)), ignore, ignore_patterns=prefs.get('paths.ignore_patterns'), cache=parser.cache.for_campaign(prefs))
+    try:
+        campaign_watch.serve(index, prefs, find=find_in_table, poll=poll, interval=interval)
+    except KeyboardInterrupt:
+        pass
+
+    return result.Success()
+
 def report(*tags, search=None, ignore=None, fmt=None, outfile=None, **kwargs):
     """
     Create a report for the given tags
@@ -305,6 +406,16 @@ def report(*tags, search=None, ignore=None, fmt=None, outfile=None, **kwargs):
             print to stdout.
         prefs (Settings): Settings object to use. Uses internal settings by
             default.
+        jobs (int|None): Number of processes to use when parsing character
+            files. Defaults to the `parser.jobs` setting.
+        io_threads (int|None): Number of threads to use when reading
+            character files. Defaults to the `parser.io_threads` setting.
+        report_aliases (bool): Whether to print the paths of files and
+            directories that were skipped because they were already found
+            through another path
+        from_dump (str|None): Path to a file made by the dump command, or `-`
+            for stdin. When given, characters are read from it instead of
+            searching for character files.
 
     Returns:
         Result object. Openable will contain the output file if given.
@@ -319,13 +430,14 @@ def report(*tags, search=None, ignore=None, fmt=None, outfile=None, **kwargs):
     if not fmt or fmt == 'default':
         fmt = prefs.get('report.default_format')
 
-    # use a list so we can iterate more than once
-    characters = list(parser.get_characters(flatten(search), ignore))
+    tags = list(flatten(tags))
+
+    characters = util.get_characters(search, ignore, prefs=prefs, jobs=kwargs.get('jobs'), io_threads=kwargs.get('io_threads'), report_aliases=kwargs.get('report_aliases', False), tags=tags, from_dump=kwargs.get('from_dump'))
 
-    # Construct a dict keyed by tag name whose values are Counters. Each Counter
-    # is initialized with a flattened list of lists and we let it count the
-    # duplicates.
-    table_data = {tag : Counter(flatten([c.tags.get(tag, 'None') for c in characters])) for tag in flatten(tags)}
+    # Construct a dict keyed by tag name whose values are Counters of each
+    # value of the tag. Characters without the tag are counted as 'None'.
+    table = CharacterTable(characters, tags)
+    table_data = {tag : table.counts(tag) for tag in tags}
 
     formatter = formatters.get_report_formatter(fmt)
     if not formatter:
@@ -359,6 +471,16 @@ def find(*rules, search=None, ignore=None, **kwargs):
             opening them
         prefs (Settings): Settings object to use. Uses internal settings by
             default.
+        jobs (int|None): Number of processes to use when parsing character
+            files. Defaults to the `parser.jobs` setting.
+        io_threads (int|None): Number of threads to use when reading
+            character files. Defaults to the `parser.io_threads` setting.
+        report_aliases (bool): Whether to print the paths of files and
+            directories that were skipped because they were already found
+            through another path
+        from_dump (str|None): Path to a file made by the dump command, or `-`
+            for stdin. When given, characters are read from it instead of
+            searching for character files.
 
     Returns:
         Result object. Openable will contain a list of file paths to the
@@ -375,12 +497,28 @@ def find(*rules, search=None, ignore=None, **kwargs):
 
     rules = list(flatten(rules))
 
-    # use a list so we can iterate more than once
-    characters = list(parser.get_characters(flatten(search), ignore))
-
-    filtered_chars = find_characters(rules, characters=characters)
-
-    paths = [char.path for char in filtered_chars]
+    matchers = _parse_rules(rules)
+    from_dump = kwargs.get('from_dump')
+    if from_dump is None and prefs.get('paths.trust_hierarchy', False):
+        # skip the branches of the hierarchy that are for other values
+        tests = [(tag, text) for tag, text, negate in matchers if not negate]
+        ignore.extend(util.pruned_branches(tests, prefs=prefs, ignore=ignore, ignore_patterns=prefs.get('paths.ignore_patterns')))
+
+    # a running watch server checks the rules against its own characters
+    paths = None
+    listed = util.listed_paths(search)
+    if from_dump is None and listed is not None and kwargs.get('jobs') is None and kwargs.get('io_threads') is None:
+        paths = campaign_watch.client.find(prefs, listed, ignore, rules)
+
+    if paths is None and from_dump is None and all(tag == 'name' for tag, _, _ in matchers):
+        # names come from file names and a few tags, so most files are
+        # never opened
+        names = util.get_names(search, ignore, prefs=prefs, report_aliases=kwargs.get('report_aliases', False))
+        paths = find_by_name(rules, names)
+    elif paths is None:
+        # check characters as they are parsed, so only the paths are kept
+        characters = util.get_characters(search, ignore, prefs=prefs, jobs=kwargs.get('jobs'), io_threads=kwargs.get('io_threads'), report_aliases=kwargs.get('report_aliases', False), tags=[tag for tag, _, _ in matchers], from_dump=from_dump, wanted=lambda summary: _summary_matches(summary, matchers))
+        paths = [char.path for char in characters if _matches_rules(char, matchers)]
 
     if dryrun:
         openable = []
@@ -408,37 +546,147 @@ def find_characters(rules, characters):
     Returns:
         List of character objects that match all of the rules.
     """
+    matchers = _parse_rules(rules)
+    return [char for char in characters if _matches_rules(char, matchers)]
 
-    rule = rules.pop(0)
+def find_in_table(rules, table):
+    """
+    Find the characters in a CharacterTable that match the given rules
 
-    if "~:" in rule:
-        sep = "~:"
-        mod = lambda x: not x
-    else:
-        sep = ":"
-        mod = lambda x: x
+    Matches the same characters as find_characters, but tests each column of
+    the table at once instead of each character in turn.
+
+    Args:
+        rules (list): Rule strings, as for find_characters
+        table (CharacterTable): Table of the characters to search
+
+    Returns:
+        List of the paths of the matching characters, in table order
+    """
+    return table.find(_parse_rules(rules))
+
+def find_by_name(rules, names):
+    """
+    Filter character names according to the given rules
+
+    Args:
+        rules (list): Rule strings, as for find_characters. Every rule must
+            test the name tag.
+        names (iter): Tuples of (path, names), as from
+            parser.names.get_names
+
+    Returns:
+        List of the paths whose names match all of the rules
+    """
+    matchers = _parse_rules(rules)
+    return [char_path for char_path, char_names in names if _matches_names(char_names, matchers)]
+
+def _matches_names(names, matchers):
+    """
+    Test a character's names against parsed find rules
+
+    Args:
+        names (list): Values of the character's name tag
+        matchers (list): Parsed rules, as from _parse_rules. Only their text
+            is used, so every rule must test the name tag.
+
+    Returns:
+        True if the names match every rule, False if not
+    """
+    name_tag = Tag('name', *names)
+    for _, text, negate in matchers:
+        if bool(name_tag.contains(text)) == negate:
+            return False
+    return True
 
-    parts = rule.split(sep, 1)
+def find_tags(rules):
+    """
+    Get the names of the tags that find rules look at
+
+    Useful for parsing only the tags that find_characters needs.
 
-    if len(parts) == 2:
-        tag = parts[0].strip().casefold()
+    Args:
+        rules (list): Rule strings, as for find_characters
 
-        if not tag:
-            # default to name tag
+    Returns:
+        Set of tag names
+    """
+    return {tag for tag, _, _ in _parse_rules(rules)}
+
+def _parse_rules(rules):
+    """
+    Parse find rules into the parts needed to test a character
+
+    Args:
+        rules (list): Rule strings, as for find_characters
+
+    Returns:
+        List of (tag, text, negate) tuples in the same order as rules
+    """
+    matchers = []
+    for rule in rules:
+        if "~:" in rule:
+            sep = "~:"
+            negate = True
+        else:
+            sep = ":"
+            negate = False
+
+        parts = rule.split(sep, 1)
+
+        if len(parts) == 2:
+            tag = parts[0].strip().casefold()
+
+            if not tag:
+                # default to name tag
+                tag = 'name'
+
+            # expand abbreviations
+            if tag == 'desc':
+                tag = 'description'
+
+            text = parts[1].strip().casefold()
+        elif len(parts) == 1:
             tag = 'name'
+            text = parts[0].strip().casefold()
 
-        # expand abbreviations
-        if tag == 'desc':
-            tag = 'description'
+        matchers.append((tag, text, negate))
 
-        text = parts[1].strip().casefold()
-    elif len(parts) == 1:
-        tag = 'name'
-        text = parts[0].strip().casefold()
+    return matchers
 
-    filtered_chars = [char for char in characters if mod(char.tags(tag).contains(text))]
+def _summary_matches(summary, matchers):
+    """
+    Test whether a directory summary could hold a character matching find rules
 
-    if not rules:
-        return filtered_chars
-    else:
-        return find_characters(rules, filtered_chars)
+    Negated rules can be met by characters without the tag, so only the other
+    rules are checked.
+
+    Args:
+        summary (dict): Tag summary of a directory, as from
+            parser.summaries.SummaryIndex
+        matchers (list): Parsed rules, as from _parse_rules
+
+    Returns:
+        False if no character in the directory can match every rule, True if
+        one might
+    """
+    for tag, text, negate in matchers:
+        if not negate and not parser.summaries.could_contain(summary, tag, text):
+            return False
+    return True
+
+def _matches_rules(character, matchers):
+    """
+    Test a single character against parsed find rules
+
+    Args:
+        character (Character): Character to test
+        matchers (list): Parsed rules, as from _parse_rules
+
+    Returns:
+        True if the character matches every rule, False if not
+    """
+    for tag, text, negate in matchers:
+        if bool(character.tags(tag).contains(text)) == negate:
+            return False
+    return True
@@ -42,6 +42,16 @@ def make_list(*search, ignore=None, fmt=None, metadata=None, title=None, outfile
             content. Defaults to false.
         prefs (Settings): Settings object to use. Uses internal settings by
             default.
+        jobs (int|None): Number of processes to use when parsing character
+            files. Defaults to the `parser.jobs` setting.
+        io_threads (int|None): Number of threads to use when reading
+            character files. Defaults to the `parser.io_threads` setting.
+        report_aliases (bool): Whether to print the paths of files and
+            directories that were skipped because they were already found
+            through another path
+        from_dump (str|None): Path to a file made by the dump command, or `-`
+            for stdin. When given, characters are read from it instead of
+            searching for character files.
         progress (function): Callback function to track the progress of
             generating a listing. Must accept the current count and total count.
             Should print to stderr. Not used by all formatters.
@@ -60,7 +70,7 @@ def make_list(*search, ignore=None, fmt=None, metadata=None, title=None, outfile
     sort_order = kwargs.get('sort_by', prefs.get('listing.sort_by')) if do_sort else []
     headings = kwargs.get('headings', sort_order)
 
-    characters = _refine_characters(parser.get_characters(flatten(search), ignore))
+    characters = _refine_characters(util.get_characters(search, ignore, prefs=prefs, jobs=kwargs.get('jobs'), io_threads=kwargs.get('io_threads'), report_aliases=kwargs.get('report_aliases', False), from_dump=kwargs.get('from_dump')))
     if do_sort:
         sorter = util.character_sorter.CharacterSorter(sort_order, prefs=prefs)
         characters = sorter.sort(characters)
@@ -112,9 +122,10 @@ def make_list(*search, ignore=None, fmt=None, metadata=None, title=None, outfile
 
 def _refine_characters(characters):
     """
-    Alter character records for output.
+    Prepare character records for output.
 
-    Warning: This function will modify the objects in `characters`.
+    The characters themselves are not changed. Each one is replaced by a
+    sanitized overlay, as from Character.sanitized().
 
     Applies behavior from directives:
 
@@ -128,7 +139,7 @@ def _refine_characters(characters):
         characters (list): List of Character objects
 
     Yields:
-        Modified Character objects
+        Sanitized Character objects
     """
 
     for char in characters:
@@ -136,7 +147,5 @@ def _refine_characters(characters):
         if char.tags('skip').present:
             continue
 
-        # clean up the character's data
-        char.sanitize()
-
-        yield char
+        # hide the character's secrets without touching its data
+        yield char.sanitized()
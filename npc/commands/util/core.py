@@ -1,13 +1,200 @@
 
-from os import walk
+import itertools
+import json
+from os import path, walk, scandir
 from pathlib import Path
 from contextlib import contextmanager
 import sys
 
 from npc.character import Character
-from npc import settings, util
+from npc import settings, util, parser, watch
 from . import character_sorter
 
+def get_characters(search, ignore, *, prefs, jobs=None, io_threads=None, report_aliases=False, tags=None, from_dump=None, keep_body=False, wanted=None, lazy=False, changes_files=False):
+    """
+    Parse the characters for a command
+
+    Wraps parser.get_characters with the options shared by every command that
+    reads character files, like the campaign's parse cache and ignore
+    patterns. When from_dump is given, the characters are read from that dump
+    instead, and the other options are not used. Otherwise, if a watch server
+    is running for the campaign and covers the search, the characters come
+    from the server. They have every tag built, whatever tags and lazy ask
+    for. The server is not used when keep_body or changes_files is set, or
+    when jobs or io_threads are given.
+
+    Args:
+        search (list): Paths to search for character files. Items can be
+            strings or lists of strings.
+        ignore (list): Paths to ignore
+        prefs (Settings): Settings object to use
+        jobs (int|None): Number of processes to parse with. Defaults to the
+            value of `parser.jobs` in settings.
+        io_threads (int|None): Number of threads to read files with. Defaults
+            to the value of `parser.io_threads` in settings.
+        report_aliases (bool): Whether to print a message for each file or
+            directory that is skipped because it was already found through
+            another path, like a symlink
+        tags (iter|None): Names of the only tags the command needs. None
+            parses every tag.
+        from_dump (str|None): Path to a file made by the dump command, or `-`
+            for stdin. See parser.dumps.
+        keep_body (bool): Whether to keep the full text of each file on its
+            character. See parser.get_characters.
+        wanted (callable|None): Function that takes a directory's tag summary
+            and returns whether any of its characters could be wanted. When
+            given, the campaign's directory summaries are used to skip
+            directories that cannot hold a wanted character.
+        lazy (bool): Whether to build a summary of each character and leave
+            the rest of its tags until they are used. See parser.lazy.
+        changes_files (bool): Whether the command changes the files it reads.
+            The watch server is only as current as its last sync, so these
+            commands always read the files themselves.
+
+    Returns:
+        Iterable of Character objects
+    """
+    if from_dump is not None:
+        return parser.dumps.load_dump(from_dump)
+
+    # the server holds characters built in full, which satisfy tags and lazy,
+    # but it has no file text to keep, does not parse with jobs or threads,
+    # and can be behind the files on disk
+    listed = listed_paths(search)
+    if listed is not None and not (keep_body or changes_files) and jobs is None and io_threads is None:
+        watched = watch.client.characters(prefs, listed, ignore)
+        if watched is not None:
+            return watched
+
+    if jobs is None:
+        jobs = prefs.get('parser.jobs')
+    if io_threads is None:
+        io_threads = prefs.get('parser.io_threads')
+
+    return parser.get_characters(
+        util.flatten(search),
+        ignore,
+        ignore_patterns=prefs.get('paths.ignore_patterns'),
+        cache=parser.cache.for_campaign(prefs),
+        jobs=jobs,
+        io_threads=io_threads,
+        on_alias=_print_alias if report_aliases else None,
+        tags=tags,
+        keep_body=keep_body,
+        summaries=parser.summaries.for_campaign(prefs) if wanted is not None else None,
+        wanted=wanted,
+        lazy=lazy)
+
+def listed_paths(search):
+    """
+    Get the search paths as a flat list, if they are all known up front
+
+    Args:
+        search (list): Paths to search for character files. Items can be
+            strings or lists of strings.
+
+    Returns:
+        List of path strings, or None if part of the search is streamed, as
+        from `--search-from`. Streamed paths can only be read once.
+    """
+    if isinstance(search, str):
+        return [search]
+    if not isinstance(search, (list, tuple)):
+        return None
+
+    paths = []
+    for item in search:
+        if isinstance(item, str):
+            paths.append(item)
+            continue
+        nested = listed_paths(item)
+        if nested is None:
+            return None
+        paths.extend(nested)
+    return paths
+
+def on_disk_search(search, *, from_dump=None):
+    """
+    Check that a command which changes character files can use its sources
+
+    Characters from archives and dumps have paths that do not exist on disk,
+    so they cannot be fixed or moved. Listed archives and dumps are refused
+    up front. Archives in a streamed part of the search, as from
+    `--search-from`, are skipped with a message as they are read.
+
+    Args:
+        search (list): Paths to search for character files. Items can be
+            strings or lists of strings.
+        from_dump (str|None): Path to a dump the characters would be read from
+
+    Returns:
+        Tuple of (search, errmsg). Search holds the paths to use, and errmsg
+        is a message explaining why the sources cannot be used, or None.
+    """
+    if from_dump is not None:
+        return search, "Cannot change characters read from a dump"
+
+    listed = listed_paths(search)
+    if listed is None:
+        return _skip_archives(util.flatten(search)), None
+
+    archives = [search_path for search_path in listed if parser.archive.is_archive(search_path)]
+    if archives:
+        return search, "Cannot change character files inside archives: {}".format(", ".join(archives))
+    return search, None
+
+def _skip_archives(search_paths):
+    """
+    Leave archives out of a stream of search paths
+
+    Args:
+        search_paths (iter): Path strings
+
+    Yields:
+        Path strings that are not archives
+    """
+    for search_path in search_paths:
+        if parser.archive.is_archive(search_path):
+            util.print_err("Skipping archive '{}': its files cannot be changed".format(search_path))
+            continue
+        yield search_path
+
+def get_names(search, ignore, *, prefs, report_aliases=False):
+    """
+    Get the names of the characters for a command
+
+    Wraps parser.names.get_names with the same options as get_characters. The
+    campaign's name index is used when the parse cache is enabled.
+
+    Args:
+        search (list): Paths to search for character files. Items can be
+            strings or lists of strings.
+        ignore (list): Paths to ignore
+        prefs (Settings): Settings object to use
+        report_aliases (bool): Whether to print a message for each file or
+            directory that is skipped because it was already found through
+            another path, like a symlink
+
+    Returns:
+        Iterable of (path, names) tuples
+    """
+    return parser.names.get_names(
+        util.flatten(search),
+        ignore,
+        ignore_patterns=prefs.get('paths.ignore_patterns'),
+        index=parser.names.for_campaign(prefs),
+        on_alias=_print_alias if report_aliases else None)
+
+def _print_alias(alias_path, original_path):
+    """
+    Report a path that was skipped because it is a duplicate
+
+    Args:
+        alias_path (str): Path that was skipped
+        original_path (str): Path that was used instead
+    """
+    util.print_err("Skipped '{}': same as '{}'".format(alias_path, original_path))
+
 def create_path_from_character(character: Character, *, base_path=None, hierarchy=None, **kwargs):
     """
     Determine the best file path for a character.
@@ -169,6 +356,202 @@ def create_path_from_character(character: Character, *, base_path=None, hierarch
 
     return target_path
 
+GROUP_COMPONENTS = ('group', 'rank', 'ranks', 'groups', 'groups+ranks', 'locations')
+"""tuple: hierarchy tags whose directories can be named after any group or place"""
+
+def pruned_branches(tests, *, prefs, base_path=None, ignore=None, ignore_patterns=None):
+    """
+    Find the directories in the hierarchy that cannot hold certain characters
+
+    This works backwards from create_path_from_character. Each directory
+    below base_path is matched to the first hierarchy component that could
+    have made it, and is pruned when that component's tag rules out every
+    test. That assumes the characters are where the hierarchy puts them, as
+    after running reorg. Since reorg only uses directories that exist, a
+    directory is only pruned when one of its siblings passes the tests in its
+    place. Otherwise the wanted characters could have been left higher up.
+
+    Reorg only uses a character's first value for each component, so a
+    character with more values can sit in a directory that looks like it
+    should be pruned. When the campaign keeps directory summaries, a
+    directory is only pruned if the summaries of every directory in it are up
+    to date and show that none of its characters can pass the tests. Without
+    summaries, the hierarchy is trusted as it is.
+
+    Directories that no component could have made are kept, and so is
+    everything below a group or location component. Files directly inside a
+    directory are never pruned.
+
+    Args:
+        tests (list): Tuples of (tag, text). A character passes a test when
+            its tag contains the text, as with Tag.contains.
+        prefs (Settings): Settings object to use
+        base_path (str|None): Base path for character files. Defaults to
+            `paths.required.characters`.
+        ignore (list|None): Paths the search ignores. Ignored directories are
+            never pruned, and the files in them do not keep a directory from
+            being pruned.
+        ignore_patterns (list|None): Ignore patterns of the search, as from
+            the `paths.ignore_patterns` setting
+
+    Returns:
+        List of directory paths whose characters cannot pass every test
+    """
+    if not base_path:
+        base_path = prefs.get('paths.required.characters')
+
+    tests = [(tag, text.casefold()) for tag, text in tests if text not in ('', '*')]
+    if not tests:
+        return []
+
+    ignored = {path.abspath(p) for p in ignore or []}
+    summaries = parser.summaries.for_campaign(prefs)
+    if summaries is None:
+        ruled_out = lambda dir_path: True
+    else:
+        ruled_out = lambda dir_path: _summaries_rule_out(dir_path, tests, summaries, ignore, ignore_patterns)
+
+    pruned = []
+    _prune_branch(str(base_path), prefs.get('paths.hierarchy').split('/'), None, tests, prefs, ignored, ruled_out, pruned)
+    return pruned
+
+def _prune_branch(dir_path, components, char_type, tests, prefs, ignored, ruled_out, pruned):
+    """
+    Prune the subdirectories of one directory
+
+    Args:
+        dir_path (str): Directory to look in
+        components (list): Hierarchy components that could have made the
+            subdirectories
+        char_type (str|None): Type key of the characters in this branch, if
+            known
+        tests (list): Tuples of (tag, text) with casefolded text
+        prefs (Settings): Settings object to use
+        ignored (set): Absolute paths of the ignored directories
+        ruled_out (callable): Function that takes the path of a directory the
+            hierarchy rules out, and returns whether it can be pruned
+        pruned (list): List to add pruned directory paths to
+    """
+    try:
+        subdirs = [entry for entry in scandir(dir_path) if entry.is_dir() and path.abspath(entry.path) not in ignored]
+    except OSError:
+        return
+
+    names = [entry.name for entry in subdirs]
+    for entry in subdirs:
+        for index, component in enumerate(components):
+            rest = components[index+1:]
+            if not(component.startswith('{') and component.endswith('}')):
+                literal = component
+            elif '?' in component:
+                literal = component.strip('{}').split('?')[1]
+            else:
+                literal = None
+
+            if literal is not None:
+                if literal.casefold() == entry.name.casefold():
+                    _prune_branch(entry.path, rest, char_type, tests, prefs, ignored, ruled_out, pruned)
+                    break
+                continue
+
+            tag_name = prefs.translate_tag_for_character_type(char_type, component.strip('{}'))
+            if not tag_name:
+                # the component is unused for this type
+                continue
+
+            if tag_name == 'type':
+                types = _type_keys([entry.name], prefs)
+                if not types:
+                    continue
+                if all(_fails_tests(tests, 'type', key) for key in types) and _has_passing(tests, 'type', _type_keys(names, prefs)) and ruled_out(entry.path):
+                    pruned.append(entry.path)
+                else:
+                    _prune_branch(entry.path, rest, types[0] if len(types) == 1 else None, tests, prefs, ignored, ruled_out, pruned)
+                break
+
+            if tag_name in GROUP_COMPONENTS:
+                break
+
+            if _fails_tests(tests, tag_name, entry.name) and _has_passing(tests, tag_name, names) and ruled_out(entry.path):
+                pruned.append(entry.path)
+            else:
+                _prune_branch(entry.path, rest, char_type, tests, prefs, ignored, ruled_out, pruned)
+            break
+
+def _has_passing(tests, tag_name, values):
+    """
+    Determine whether any value passes every test on a tag
+
+    Args:
+        tests (list): Tuples of (tag, text) with casefolded text
+        tag_name (str): Name of the tag
+        values (list): Values to check
+
+    Returns:
+        True if at least one value passes
+    """
+    return any(not _fails_tests(tests, tag_name, value) for value in values)
+
+def _summaries_rule_out(dir_path, tests, summaries, ignore, ignore_patterns):
+    """
+    Determine whether directory summaries show that no character in a branch
+    can pass some tests
+
+    No character file is read. Directories without an up to date summary,
+    and archives, cannot be checked, so they keep the branch.
+
+    Args:
+        dir_path (str): Directory to check, along with its subdirectories
+        tests (list): Tuples of (tag, text) with casefolded text
+        summaries (SummaryIndex): Saved directory summaries
+        ignore (list|None): Paths the search ignores
+        ignore_patterns (list|None): Ignore patterns of the search
+
+    Returns:
+        True if every directory in the branch has a summary that rules out
+        the tests
+    """
+    files = parser.character_files([dir_path], ignore, ignore_patterns=ignore_patterns)
+    for sub_dir, group in itertools.groupby(files, key=path.dirname):
+        group = list(group)
+        if any(parser.archive.is_archive(file_path) for file_path in group):
+            return False
+        try:
+            summary = summaries.current(sub_dir, group)
+        except OSError:
+            return False
+        if summary is None or all(parser.summaries.could_contain(summary, tag, text) for tag, text in tests):
+            return False
+    return True
+
+def _type_keys(dir_names, prefs):
+    """
+    Get the types whose type path is one of some directory names
+
+    Args:
+        dir_names (list): Directory names
+        prefs (Settings): Settings object to use
+
+    Returns:
+        List of type keys
+    """
+    folded = {name.casefold() for name in dir_names}
+    return [key for key in prefs.get_available_types() if prefs.get('types.{}.type_path'.format(key), '').casefold() in folded]
+
+def _fails_tests(tests, tag_name, value):
+    """
+    Determine whether a tag value fails any test on that tag
+
+    Args:
+        tests (list): Tuples of (tag, text) with casefolded text
+        tag_name (str): Name of the tag
+        value (str): Value the tag would have
+
+    Returns:
+        True if a test on tag_name does not find its text in value
+    """
+    return any(tag == tag_name and text not in value.casefold() for tag, text in tests)
+
 def find_empty_dirs(root):
     """
     Find empty directories under root
@@ -183,6 +566,26 @@ def find_empty_dirs(root):
         if not dirs and not files:
             yield dirpath
 
+def write_json_list(items, outstream, **kwargs):
+    """
+    Write a json array one item at a time
+
+    The output is identical to `json.dump(list(items), outstream, **kwargs)`,
+    but items are encoded and written as they are produced instead of all at
+    once. Indented output is not supported.
+
+    Args:
+        items (iter): Objects to encode
+        outstream (file): Stream to write to
+        kwargs: Options passed to json.dumps for each item, like `cls`
+    """
+    outstream.write('[')
+    for index, item in enumerate(items):
+        if index:
+            outstream.write(', ')
+        outstream.write(json.dumps(item, **kwargs))
+    outstream.write(']')
+
 @contextmanager
 def smart_open(filename=None, binary=False):
     """
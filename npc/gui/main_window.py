@@ -164,16 +164,44 @@ class MainWindow(Ui_MainWindow):
     def update_table(self):
         """Update the characters table using search results"""
         search_rules = self.table_search_text.split(';')
-        all_characters = list(npc.parser.get_characters())
-        filtered_characters = npc.commands.find_characters(search_rules, all_characters)
+        rule_tags = npc.commands.find_tags(search_rules)
+        column_tags = self.character_table_model.column_header_tags
+        ignore_patterns = self.prefs.get('paths.ignore_patterns')
+        cache = npc.parser.cache.for_campaign(self.prefs)
+        watched = npc.watch.client.characters(self.prefs, ['.'], [])
+
+        if watched is not None:
+            # a watch server already has every character parsed
+            filtered_characters = npc.commands.find_characters(search_rules, watched)
+            total = len(watched)
+        elif rule_tags <= {'name'}:
+            # filter on names first, so only the matching files are parsed
+            all_names = list(npc.parser.names.get_names(
+                ignore_patterns=ignore_patterns,
+                index=npc.parser.names.for_campaign(self.prefs)))
+            matching_paths = npc.commands.find_by_name(search_rules, all_names)
+            filtered_characters = list(npc.parser.get_characters(
+                matching_paths,
+                cache=cache,
+                tags=column_tags,
+                lazy=True))
+            total = len(all_names)
+        else:
+            all_characters = list(npc.parser.get_characters(
+                ignore_patterns=ignore_patterns,
+                cache=cache,
+                tags=rule_tags.union(column_tags),
+                lazy=True))
+            filtered_characters = npc.commands.find_characters(search_rules, all_characters)
+            total = len(all_characters)
 
         self.character_table_model.update_data(filtered_characters)
         self.characterTableView.resizeColumnsToContents()
 
-        if len(all_characters) == len(filtered_characters):
-            status_text = "{} characters".format(len(all_characters))
+        if total == len(filtered_characters):
+            status_text = "{} characters".format(total)
         else:
-            status_text = "{} of {} characters".format(len(filtered_characters), len(all_characters))
+            status_text = "{} of {} characters".format(len(filtered_characters), total)
         self.characterCount.setText(status_text)
 
     def open_character(self, index):
@@ -99,8 +99,7 @@ def lint(character, fix=False, *, strict=False, sk_data=None):
         return problems
 
     # Load the sheet for deep linting
-    with open(character.path, 'r') as char_file:
-        data = char_file.read()
+    data = character.body
 
     # STRICT: Check that they have a virtue and a vice
     if strict:
@@ -264,6 +263,7 @@ def lint(character, fix=False, *, strict=False, sk_data=None):
     if dirty and data:
         with open(character.path, 'w') as char_file:
             char_file.write(data)
+        character.body = data
 
     return problems
 
@@ -35,8 +35,7 @@ def lint(character, fix=False, *, strict=False):
         return problems
 
     # Load the sheet for deep linting
-    with open(character.path, 'r') as char_file:
-        data = char_file.read()
+    data = character.body
 
     # Check that they have a vice and a virtue
     if strict:
@@ -45,5 +44,6 @@ def lint(character, fix=False, *, strict=False):
     if dirty and data:
         with open(character.path, 'w') as char_file:
             char_file.write(data)
+        character.body = data
 
     return problems
@@ -2,7 +2,7 @@
 Linters for verifying the correctness of a Settings object
 """
 
-from . import changeling, werewolf
+from . import changeling, werewolf, parser
 from .settings_linter import SettingsLinter
 
 def lint(prefs):
@@ -21,5 +21,6 @@ def lint(prefs):
 
     problems.extend(changeling.lint(prefs))
     problems.extend(werewolf.lint(prefs))
+    problems.extend(parser.lint(prefs))
 
     return problems
@@ -0,0 +1,44 @@
+"""
+Lint loaded parser settings
+"""
+
+from npc.parser.cache import VALIDATION_MODES
+from .settings_linter import SettingsLinter
+
+def lint(prefs):
+    """
+    Check correctness of the settings used to read character files.
+
+    Args:
+        prefs (Settings): Settings object to check
+
+    Returns:
+        A list of string error messages, or an empty list if no errors were
+        found.
+    """
+
+    linter = ParserSettingsLinter(prefs)
+    return linter.lint()
+
+class ParserSettingsLinter(SettingsLinter):
+    def lint(self):
+        """
+        Lint the given prefs
+
+        Checks done:
+        * Cache validation mode must be recognized
+
+        Returns:
+            A list of strings representing errors.
+        """
+        self.check_cache_validation()
+
+        if not self.valid:
+            self.errors.insert(0, 'Parser settings are not correct:')
+        return self.errors
+
+    def check_cache_validation(self):
+        mode = self.prefs.get('parser.cache.validate', 'mtime')
+
+        if mode not in VALIDATION_MODES:
+            self.add_error("Unrecognized cache validation mode '{}'. Use one of: {}".format(mode, ', '.join(VALIDATION_MODES)))
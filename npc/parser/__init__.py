@@ -0,0 +1,10 @@
+"""
+Parse character files into Character objects
+
+The main entry point is get_characters, which creates a list of characters. To
+parse a single file, use parse_character instead.
+"""
+
+from .core import *
+from . import archive, cache, dumps, lazy, names, summaries
+from .cache import ParseCache
@@ -0,0 +1,171 @@
+"""
+Read character files straight out of zip and tar archives
+
+An archive can be used as a search path, as if it were a directory holding
+its contents. Members are read one at a time without being extracted, and
+their paths are the archive's path joined with the member name, like
+`Campaign.tar.gz/Characters/Bob.nwod`.
+
+Ignore rules work the same as they do on disk. The archive's root stands in
+for the campaign root, so `paths.ignore_patterns` applies to member names, and
+`.npcignore` members apply to their own directory and everything below it.
+"""
+
+import posixpath
+import tarfile
+import zipfile
+from os import path
+
+from . import ignore
+
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+"""tuple: file name endings of the archives that can be searched"""
+
+def is_archive(file_path) -> bool:
+    """
+    Determine whether a search path is an archive
+
+    Only the name is checked, so files are not opened just to find out.
+
+    Args:
+        file_path (str): Path to check
+
+    Returns:
+        True if the path names an existing file with an archive suffix, False
+        if not
+    """
+    return str(file_path).lower().endswith(ARCHIVE_SUFFIXES) and path.isfile(str(file_path))
+
+def members(archive_path, ignored=frozenset(), patterns=None, accept=None):
+    """
+    Open the files inside an archive that are not ignored
+
+    Zip archives are read through their central directory. Tar archives have
+    their headers read first, so that `.npcignore` members are known before
+    anything else is opened. Compressed tarballs are decompressed twice as a
+    result, which is still much cheaper than extracting them.
+
+    Args:
+        archive_path (str): Path to a zip or tar archive
+        ignored (set): Absolute paths to skip. Members are compared by their
+            member path.
+        patterns (PatternList|None): Gitignore-style patterns, relative to
+            the root of the archive
+        accept (callable|None): Function that takes a file name and returns
+            whether the file is wanted
+
+    Yields:
+        Tuples of (member path, binary file object). Each file object is
+        closed once the next member is requested.
+    """
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as zip_file:
+            files = [(info.filename, info) for info in zip_file.infolist() if not info.filename.endswith('/')]
+            yield from _select(archive_path, files, zip_file.open, ignored, patterns, accept)
+        return
+
+    with tarfile.open(archive_path, 'r:*') as tar_file:
+        files = [(member.name, member) for member in tar_file.getmembers() if member.isfile()]
+        yield from _select(archive_path, files, tar_file.extractfile, ignored, patterns, accept)
+
+def _select(archive_path, files, opener, ignored, patterns, accept):
+    """
+    Apply ignore rules to archive members and open the rest
+
+    Args:
+        archive_path (str): Path to the archive
+        files (list): Tuples of (member name, handle) for every regular file
+            in archive order
+        opener (callable): Function that opens a handle as a binary file
+        ignored (set): Absolute paths to skip
+        patterns (PatternList|None): Patterns relative to the archive root
+        accept (callable|None): Function that takes a file name and returns
+            whether the file is wanted
+
+    Yields:
+        Tuples of (member path, binary file object)
+    """
+    entries = []
+    for name, handle in files:
+        rel_name = _normalize(name)
+        if rel_name is not None:
+            entries.append((rel_name, handle))
+
+    ignore_files = {rel_name: handle for rel_name, handle in entries if posixpath.basename(rel_name) == ignore.IGNORE_FILE_NAME}
+    dir_rules = {}
+
+    def rules_for(dir_name):
+        """Get the rules for the contents of a directory, or None if it is ignored"""
+        if dir_name in dir_rules:
+            return dir_rules[dir_name]
+
+        if not dir_name:
+            rules = ignore.IgnoreRules()
+            if patterns is not None:
+                rules = rules.with_patterns(patterns)
+        else:
+            parent_name, base_name = posixpath.split(dir_name)
+            rules = rules_for(parent_name)
+            if rules is not None:
+                if rules.ignores(base_name, True) or _member_path(archive_path, dir_name, ignored) is None:
+                    rules = None
+                else:
+                    rules = rules.child(base_name)
+
+        ignore_name = posixpath.join(dir_name, ignore.IGNORE_FILE_NAME)
+        if rules is not None and ignore_name in ignore_files:
+            with opener(ignore_files[ignore_name]) as ignore_file:
+                lines = ignore_file.read().decode('utf-8', 'replace').splitlines()
+            rules = rules.with_patterns(ignore.PatternList(lines, source=path.join(archive_path, ignore_name)))
+
+        dir_rules[dir_name] = rules
+        return rules
+
+    for rel_name, handle in entries:
+        dir_name, base_name = posixpath.split(rel_name)
+        if accept is not None and not accept(base_name):
+            continue
+
+        rules = rules_for(dir_name)
+        if rules is None or rules.ignores(base_name, False):
+            continue
+
+        member_path = _member_path(archive_path, rel_name, ignored)
+        if member_path is None:
+            continue
+
+        with opener(handle) as member_file:
+            yield member_path, member_file
+
+def _normalize(name):
+    """
+    Clean up a member name
+
+    Args:
+        name (str): Name as stored in the archive
+
+    Returns:
+        Relative name using `/` separators, or None if the name points outside
+        of the archive
+    """
+    parts = [part for part in name.replace('\\', '/').split('/') if part not in ('', '.')]
+    if not parts or '..' in parts:
+        return None
+    return '/'.join(parts)
+
+def _member_path(archive_path, rel_name, ignored):
+    """
+    Get the path of a member, unless it is ignored
+
+    Args:
+        archive_path (str): Path to the archive
+        rel_name (str): Normalized member name
+        ignored (set): Absolute paths to skip
+
+    Returns:
+        Path string, or None if the path is in ignored
+    """
+    member_path = path.join(archive_path, *rel_name.split('/'))
+    if ignored and path.abspath(member_path) in ignored:
+        return None
+    return member_path
@@ -0,0 +1,360 @@
+"""
+On-disk cache of parsed character files
+
+The cache stores the records scanned from each character file, keyed by the
+file's absolute path. An entry is only used while the file's size and
+modification time match what was recorded, or, in "hash" mode, while its
+contents hash to the same value. The whole cache is discarded when the parser
+version or any parsing settings change.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from os import path
+
+import npc
+from npc.util import print_err
+
+from . import core, tokenizer
+
+CACHE_FILE_NAME = 'parse.json'
+"""str: name of the cache file within the cache directory"""
+
+VALIDATION_MODES = ('mtime', 'hash')
+"""tuple: recognized ways of checking whether a cache entry is still good"""
+
+NON_PARSING_SETTINGS = ('cache', 'jobs', 'io_threads')
+"""tuple: keys in the `parser` settings that do not change parsed data"""
+
+RACY_WINDOW_NS = 2 * 10**9
+"""
+int: files modified this close to the time the cache is saved are not stored.
+Their mtime could still change without the value moving forward.
+"""
+
+def for_campaign(prefs):
+    """
+    Get the parse cache for the current campaign
+
+    The cache lives in the campaign's settings directory, so no cache is used
+    when that directory does not exist.
+
+    Args:
+        prefs (Settings): Settings object to use
+
+    Returns:
+        ParseCache object, or None if caching is disabled or there is no
+        campaign settings directory.
+    """
+    directory = cache_dir(prefs)
+    if directory is None:
+        return None
+
+    return ParseCache(
+        directory.joinpath(CACHE_FILE_NAME),
+        fingerprint=fingerprint(prefs),
+        validate=prefs.get('parser.cache.validate', 'mtime'))
+
+def cache_dir(prefs):
+    """
+    Get the directory that holds the campaign's cache files
+
+    The parse cache and the other stores kept next to it all live here.
+
+    Args:
+        prefs (Settings): Settings object to use
+
+    Returns:
+        Path object, or None if caching is disabled or there is no campaign
+        settings directory
+    """
+    if not prefs.get('parser.cache.enabled', False):
+        return None
+
+    settings_dir = prefs.campaign_settings_path
+    if not settings_dir.is_dir():
+        return None
+
+    return settings_dir.joinpath(prefs.get('parser.cache.directory', 'cache'))
+
+def fingerprint(prefs=None):
+    """
+    Summarize everything that can change the result of scanning a file
+
+    Includes the locale encoding, since files are decoded with it.
+
+    Args:
+        prefs (Settings|None): Settings object. Every key in its `parser`
+            section is included, except the ones in NON_PARSING_SETTINGS.
+
+    Returns:
+        Hex digest string
+    """
+    parse_settings = {}
+    if prefs is not None:
+        parse_settings = {k: v for k, v in prefs.get('parser', {}).items() if k not in NON_PARSING_SETTINGS}
+
+    parts = {
+        'npc': npc.__version__.__version__,
+        'parser': core.PARSER_VERSION,
+        'encoding': tokenizer.default_encoding(),
+        'settings': parse_settings,
+    }
+    encoded = json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+class JsonStore:
+    """
+    Entries keyed by absolute path, kept in a JSON file between runs
+
+    Entries are loaded lazily the first time they are needed, and written back
+    by save() only if something changed. Saved entries are thrown out when any
+    value from header() differs from the saved one, as when the parser or its
+    settings change.
+
+    Subclasses say which modification times each entry depends on through
+    entry_mtimes(), so that save() can leave out entries for files that
+    changed too recently to trust.
+    """
+    description = 'store'
+    """str: what the store holds, for error messages"""
+
+    def __init__(self, store_path, *, fingerprint=None):
+        """
+        Create a new store
+
+        Args:
+            store_path (PathLike): Path to the store file. Its parent
+                directory is created on save if needed.
+            fingerprint (str|None): Value that must match the saved
+                fingerprint for saved entries to be used
+        """
+        self.store_path = store_path
+        self.fingerprint = fingerprint
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = None
+        self._seen = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self):
+        """
+        dict: Entries keyed by absolute path. Loaded on first use.
+        """
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._entries = self._load()
+        return self._entries
+
+    def header(self):
+        """
+        Get the values saved alongside the entries
+
+        Returns:
+            Dict of values that must all match the saved ones for saved
+            entries to be used
+        """
+        return {'fingerprint': self.fingerprint}
+
+    def entry_mtimes(self, entry):
+        """
+        Get the modification times an entry depends on
+
+        Args:
+            entry: Entry from the store
+
+        Returns:
+            Iterable of modification times in nanoseconds
+        """
+        raise NotImplementedError
+
+    def _load(self):
+        """
+        Read the store file
+
+        A missing, unreadable, or outdated file results in an empty store.
+
+        Returns:
+            Dict of entries
+        """
+        try:
+            with open(self.store_path, 'r') as store_file:
+                data = json.load(store_file)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or any(data.get(key) != value for key, value in self.header().items()):
+            self._dirty = True
+            return {}
+
+        return data.get('entries', {})
+
+    def save(self):
+        """
+        Write the store to disk if it changed
+
+        Entries for paths that were not seen during this run and no longer
+        exist are dropped. Entries that depend on a file modified within
+        RACY_WINDOW_NS of now are left out as well, since its mtime cannot be
+        trusted yet.
+
+        The file is written in full and then moved into place. Write errors
+        are reported but otherwise ignored: stores are only an optimization.
+        """
+        if not self._dirty:
+            return
+
+        now = int(time.time() * 10**9)
+        entries = {}
+        for key, entry in self.entries.items():
+            if key not in self._seen and not path.exists(key):
+                continue
+            if any(now - mtime < RACY_WINDOW_NS for mtime in self.entry_mtimes(entry)):
+                continue
+            entries[key] = entry
+
+        data = self.header()
+        data['entries'] = entries
+
+        store_dir = path.dirname(str(self.store_path))
+        temp_path = "{}.tmp".format(self.store_path)
+        try:
+            os.makedirs(store_dir, exist_ok=True)
+            with open(temp_path, 'w') as store_file:
+                json.dump(data, store_file)
+            os.replace(temp_path, str(self.store_path))
+        except OSError as err:
+            print_err("Could not save {} '{}': {}".format(self.description, self.store_path, err.strerror))
+            return
+
+        self._dirty = False
+
+class ParseCache(JsonStore):
+    """
+    Store scanned character records between runs
+
+    Entries are loaded lazily the first time they are needed, and written back
+    by save() only if something changed.
+    """
+    description = 'parse cache'
+
+    def __init__(self, cache_path, *, fingerprint=None, validate='mtime'):
+        """
+        Create a new parse cache
+
+        Args:
+            cache_path (PathLike): Path to the cache file. Its parent directory
+                is created on save if needed.
+            fingerprint (str|None): Value that must match the saved
+                fingerprint for saved entries to be used
+            validate (str): How to check if an entry is stale. One of 'mtime'
+                (size and modification time) or 'hash' (size and a hash of the
+                file contents).
+        """
+        if validate not in VALIDATION_MODES:
+            raise ValueError("Unrecognized cache validation mode '{}'".format(validate))
+
+        super().__init__(cache_path, fingerprint=fingerprint)
+        self.validate = validate
+
+    def header(self):
+        header = super().header()
+        header['validate'] = self.validate
+        return header
+
+    def entry_mtimes(self, entry):
+        if self.validate == 'mtime':
+            return (entry['signature'][1],)
+        return ()
+
+    def _signature(self, file_path, stat_result):
+        """
+        Get the values used to decide whether an entry is still good
+
+        Args:
+            file_path (str): Path to the file
+            stat_result (os.stat_result): Current stat data for the file
+
+        Returns:
+            List of size and either mtime in nanoseconds or content hash
+        """
+        if self.validate == 'hash':
+            with open(file_path, 'rb') as char_file:
+                digest = hashlib.sha1(char_file.read()).hexdigest()
+            return [stat_result.st_size, digest]
+
+        return [stat_result.st_size, stat_result.st_mtime_ns]
+
+    def records(self, file_path, reader):
+        """
+        Get the records for a file, scanning it only when needed
+
+        Args:
+            file_path (str): Path to the character file
+            reader (callable): Function that scans the file. Called with
+                file_path when the cache cannot be used.
+
+        Returns:
+            List of `(tag, value)` records
+        """
+        records, signature = self.lookup(file_path)
+        if records is None:
+            records = reader(file_path)
+            self.store(file_path, signature, records)
+        return records
+
+    def lookup(self, file_path, stat_result=None):
+        """
+        Get the cached records for a file, if they are still good
+
+        Args:
+            file_path (str): Path to the character file
+            stat_result (os.stat_result|None): Stat data for the file, if the
+                caller already has it
+
+        Returns:
+            Tuple of (records, signature). Records is None when the file has to
+            be scanned again, in which case the signature should be passed to
+            store() along with the new records.
+        """
+        key = path.abspath(file_path)
+
+        if stat_result is None:
+            stat_result = os.stat(file_path)
+        signature = self._signature(file_path, stat_result)
+        entry = self.entries.get(key)
+
+        with self._lock:
+            self._seen.add(key)
+            if entry is not None and entry['signature'] == signature:
+                self.hits += 1
+                return entry['records'], signature
+
+            self.misses += 1
+        return None, signature
+
+    def store(self, file_path, signature, records):
+        """
+        Add or replace the records for a file
+
+        Args:
+            file_path (str): Path to the character file
+            signature (list): Signature from lookup(), taken before the file
+                was scanned
+            records (list): Records scanned from the file
+        """
+        entries = self.entries
+        with self._lock:
+            entries[path.abspath(file_path)] = {
+                'signature': signature,
+                'records': records,
+            }
+            self._dirty = True
@@ -0,0 +1,1168 @@
+"""
+Parse character files into Character objects
+
+The main entry point is get_characters, which creates a list of characters. To
+parse a single file, use parse_character instead.
+
+Parsing happens in two steps. First, the header of a character file is scanned
+into a list of records: `(tag, value)` pairs in file order, where description
+lines use a tag of None. Then those records are used to build the Character
+object. The records are plain data, so they can be stored in a ParseCache and
+replayed later without opening the file again.
+"""
+
+import io
+import re
+import itertools
+from collections import deque
+from functools import lru_cache, partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from os import path, scandir, cpu_count, stat
+from pathlib import Path
+from npc import character
+from npc.character.tags import UnknownTag
+from npc.util import ListedPath, print_err
+from npc.util.interning import intern
+
+from . import archive, ignore, tokenizer
+from . import lazy as lazy_characters
+
+VALID_EXTENSIONS = ('.nwod', '.dnd3', '.dfrpg')
+"""tuple: file extensions that should be parsed"""
+
+DEPRECATED_TAGS = ('hidegroup', 'hideranks')
+
+CHUNK_SIZE = 64
+"""int: number of files handed to a worker process at once"""
+
+PARSER_VERSION = 2
+"""int: version of the record format. Bump when scanning or building behavior
+changes, since directory summaries are made from built characters."""
+
+PROJECTION_TAGS = ('name', 'type')
+"""tuple: tags that are always built, since the character class depends on them"""
+
+INTERNED_TAGS = frozenset((
+    'type', 'faketype', 'group', 'rank', 'location', 'foreign',
+    'court', 'motley', 'entitlement', 'freehold', 'seeming', 'kith',
+    'auspice', 'tribe', 'pack', 'lodge',
+))
+"""frozenset: tags whose values repeat across a campaign. Their values are
+pooled with npc.util.interning, as are all tag names."""
+
+SECTION_RE = re.compile(r'^--.+--\s*$')
+TAG_RE = re.compile(r'^@(?P<tag>#\w+|\w+)\s+(?P<value>.*)$')
+HIDE_RE = re.compile(r'\s*>>\s*')
+
+def get_characters(search_paths=None, ignore_paths=None, *, ignore_patterns=None, cache=None, jobs=None, io_threads=None, on_alias=None, tags=None, keep_body=False, summaries=None, wanted=None, lazy=False):
+    """
+    Get data from character files
+
+    Ignore paths are compared by their absolute paths. An ignored directory is
+    skipped along with everything inside it. Gitignore-style patterns from
+    ignore_patterns and from `.npcignore` files are applied too. See the
+    ignore module.
+
+    Every physical file is parsed once and every directory is entered once,
+    even when search paths overlap or symlinks lead back to a directory that
+    was already searched.
+
+    Zip and tar archives can be used as search paths. Their members are read
+    without being extracted, and the path of each character is the archive
+    path joined with its member name. See the archive module.
+
+    Args:
+        search_paths (list): Paths to search for character files
+        ignore_paths (list): Paths to exclude from the search
+        ignore_patterns (list|None): Gitignore-style patterns to exclude from
+            the search, relative to the campaign root
+        cache (ParseCache|None): Cache of previously parsed files. When given,
+            unchanged files are rebuilt from the cache instead of being read,
+            and the cache is saved once every path has been parsed.
+        jobs (int|None): Number of worker processes to parse files with. None
+            or 1 parses everything in this process. Zero uses one worker per
+            CPU.
+        io_threads (int|None): Number of threads used to stat and read files
+            ahead of parsing. Keeps many reads in flight at once, which helps
+            on network filesystems. None or 1 reads one file at a time. Only
+            used when parsing in a single process.
+        on_alias (callable|None): Function to call when a file or directory is
+            skipped because it was already reached through another path. It
+            gets the skipped path and the path that was used instead.
+        tags (iter|None): Names of the tags to build. Other tags and the
+            description are skipped, which saves time when a command only
+            looks at a few tags. The name and type are always built. None
+            builds everything.
+        keep_body (bool): Whether to keep the full text of each file that is
+            read on its Character, as Character.body. Files are then read in
+            full instead of stopping after the header, so commands that look
+            at the whole sheet, like lint, only read each file once. Archive
+            members are kept the same way. Files rebuilt from the cache still
+            load their body when it is first used.
+        summaries (SummaryIndex|None): Tag summaries of each directory. When
+            given along with wanted, directories whose summary is up to date
+            and rejected by wanted are skipped without parsing their files.
+            Out of date summaries are rebuilt, and the index is saved once
+            every path has been parsed. See the summaries module.
+        wanted (callable|None): Function that takes a directory's tag summary
+            and returns whether any of its characters could be wanted
+        lazy (bool): Whether to build only a summary of each character at
+            first, along with the tags in tags. The rest of the tags are
+            built the first time one of them is used, from the cache when
+            there is one. See the lazy module. Characters from archives are
+            always built in full.
+
+    Returns:
+        Iterator of Characters generated from every parseable character file
+        within every path of search_paths, but not in ignore_paths. Characters
+        are produced as soon as they are parsed, so the whole campaign is never
+        held in memory unless the caller keeps it. The order is the same no
+        matter how many jobs are used.
+    """
+    if tags is not None:
+        tags = frozenset(tag.lower() for tag in tags)
+    full_tags = tags
+    if lazy:
+        tags = lazy_characters.indexed_tags(tags)
+
+    if jobs == 0:
+        jobs = cpu_count() or 1
+
+    def parse(in_archive, items):
+        if in_archive:
+            return (_build_member(member_path, records, body, full_tags) for member_path, records, body in items)
+        if summaries is not None and wanted is not None:
+            items = summaries.select(items, wanted)
+        if jobs and jobs > 1:
+            characters = _parse_parallel(items, jobs, cache=cache, tags=tags, keep_body=keep_body)
+        elif io_threads and io_threads > 1:
+            characters = _parse_overlapped(items, io_threads, cache=cache, tags=tags, keep_body=keep_body)
+        else:
+            characters = (parse_character(p, cache=cache, tags=tags, keep_body=keep_body) for p in items)
+        if lazy:
+            return (lazy_characters.make_lazy(c, tags, partial(parse_character, c.path, cache=cache)) for c in characters)
+        return characters
+
+    sources = find_sources(search_paths, ignore_paths, ignore_patterns=ignore_patterns, on_alias=on_alias, keep_body=keep_body)
+    characters = itertools.chain.from_iterable(itertools.starmap(parse, sources))
+
+    if summaries is not None and wanted is not None:
+        characters = _summarize(characters, summaries, cache, tags)
+
+    if cache is None:
+        return characters
+
+    return _save_when_done(characters, cache)
+
+def _build_member(member_path, records, body, tags):
+    """
+    Build the character for an archive member
+
+    Args:
+        member_path (str): Path of the member, including the archive path
+        records (list): Records scanned from the member
+        body (str|None): Text of the member, if it was kept
+        tags (frozenset|None): Names of the tags to build
+
+    Returns:
+        Character object
+    """
+    new_char = build_character(member_path, records, tags)
+    if body is not None:
+        new_char.body = body
+    return new_char
+
+def _summarize(characters, summaries, cache, tags):
+    """
+    Pass characters through while rebuilding out of date directory summaries
+
+    Summaries need every tag, so characters that were built with only some
+    tags are built again in full. Their records come from the cache when
+    there is one, so the file is not read twice.
+
+    Args:
+        characters (iter): Characters to yield
+        summaries (SummaryIndex): Summaries to update, and to save once
+            characters is exhausted
+        cache (ParseCache|None): Cache of parsed files
+        tags (frozenset|None): Names of the tags the characters were built with
+
+    Yields:
+        Every item from characters
+    """
+    for new_char in characters:
+        if summaries.needs(new_char):
+            if tags is None:
+                summaries.record(new_char)
+            else:
+                summaries.record(parse_character(new_char.path, cache=cache))
+        yield new_char
+    summaries.save()
+
+def _save_when_done(characters, cache):
+    """
+    Pass characters through, then save the cache
+
+    Args:
+        characters (iter): Characters to yield
+        cache (ParseCache): Cache to save once characters is exhausted
+
+    Yields:
+        Every item from characters
+    """
+    yield from characters
+    cache.save()
+
+def character_files(search_paths=None, ignore_paths=None, *, ignore_patterns=None, on_alias=None):
+    """
+    Find the character files to parse
+
+    This is the search done by get_characters, without parsing anything.
+
+    Args:
+        search_paths (list): Paths to search for character files
+        ignore_paths (list): Paths to exclude from the search
+        ignore_patterns (list|None): Gitignore-style patterns to exclude from
+            the search, relative to the campaign root
+        on_alias (callable|None): Function to call when a file or directory is
+            skipped because it was already reached through another path
+
+    Yields:
+        Path strings for every parseable file within every path of
+        search_paths, but not in ignore_paths. Each physical file is only
+        yielded once. Archives are skipped, since their members cannot be
+        opened by path.
+    """
+    sources = find_sources(search_paths, ignore_paths, ignore_patterns=ignore_patterns, on_alias=on_alias)
+    for in_archive, items in sources:
+        if not in_archive:
+            yield from items
+
+def find_sources(search_paths=None, ignore_paths=None, *, ignore_patterns=None, on_alias=None, keep_body=False):
+    """
+    Find the character files to parse, including those inside archives
+
+    Search paths are split into runs of archives and runs of everything else,
+    keeping their order. Each run must be used up before the next one is
+    requested.
+
+    Args:
+        search_paths (list): Paths to search for character files
+        ignore_paths (list): Paths to exclude from the search
+        ignore_patterns (list|None): Gitignore-style patterns to exclude from
+            the search, relative to the campaign root. Inside an archive, they
+            are relative to the archive's root.
+        on_alias (callable|None): Function to call when a file or directory is
+            skipped because it was already reached through another path
+        keep_body (bool): Whether to read archive members in full and keep
+            their text
+
+    Yields:
+        Tuples of (in_archive, items). When in_archive is False, items yields
+        file path strings. When it is True, items yields
+        `(path, records, body)` tuples for the character files in the archives
+        of that run. Body is None unless keep_body is true.
+    """
+    if search_paths is None:
+        search_paths = ['.']
+
+    ignored = _ignore_set(ignore_paths)
+    patterns = ignore.PatternList(ignore_patterns or [], source='ignore_patterns')
+    visited = Visited(on_alias)
+
+    for in_archive, run in itertools.groupby(search_paths, key=archive.is_archive):
+        if in_archive:
+            yield True, _archive_records(run, ignored, patterns, visited, keep_body)
+        else:
+            yield False, _search_files(run, ignored, patterns, visited)
+
+def _search_files(search_paths, ignored, patterns, visited):
+    """
+    Find the character files within several search paths
+
+    Args:
+        search_paths (iter): Paths to search
+        ignored (set): Absolute paths to exclude, as from _ignore_set
+        patterns (PatternList): Gitignore-style patterns to exclude
+        visited (Visited): Files and directories that were already reached
+
+    Yields:
+        Path strings for every parseable file
+    """
+    for search_path in search_paths:
+        yield from _find_files(search_path, ignored, patterns=patterns, visited=visited)
+
+def _archive_records(archive_paths, ignored, patterns, visited, keep_body=False):
+    """
+    Scan the character files inside several archives
+
+    Args:
+        archive_paths (iter): Paths to zip or tar archives
+        ignored (set): Absolute paths to exclude, as from _ignore_set
+        patterns (PatternList): Gitignore-style patterns to exclude, relative
+            to each archive's root
+        visited (Visited): Files and directories that were already reached.
+            An archive is only read once, but its members are not tracked.
+        keep_body (bool): Whether to read each member in full and keep its
+            text
+
+    Yields:
+        Tuples of (path, records, body) for every character file in the
+        archives. Body is None unless keep_body is true.
+    """
+    for archive_path in archive_paths:
+        if ignored and path.abspath(archive_path) in ignored:
+            continue
+        if not visited.first_visit(stat(archive_path), archive_path):
+            continue
+
+        members = archive.members(archive_path, ignored, patterns, accept=_is_character_file)
+        for member_path, member_file in members:
+            if keep_body:
+                data = member_file.read()
+                yield member_path, scan_bytes(data), decode_text(data)
+            else:
+                yield member_path, scan_file(member_file), None
+
+def _is_character_file(file_name) -> bool:
+    """
+    Determine whether a file name has a recognized extension
+
+    Args:
+        file_name (str): Name of the file
+
+    Returns:
+        True if the extension is in VALID_EXTENSIONS, False if not
+    """
+    _, ext = path.splitext(file_name)
+    return ext in VALID_EXTENSIONS
+
+def _ignore_set(ignore_paths):
+    """
+    Normalize paths to ignore for fast lookups
+
+    Args:
+        ignore_paths (list|None): Paths to exclude from the search
+
+    Returns:
+        Frozenset of absolute path strings
+    """
+    if not ignore_paths:
+        return frozenset()
+    return frozenset(path.abspath(p) for p in ignore_paths)
+
+def _find_files(start_path, ignored=frozenset(), include_bare=False, patterns=None, visited=None):
+    """
+    Find the character files under a directory
+
+    Args:
+        start_path (str): Path to search. If this is a file, it is yielded
+            as-is, unless it is a ListedPath. Listed files are checked the
+            same way as the files found in a directory, and listed paths that
+            do not exist are skipped.
+        ignored (set): Absolute paths to exclude, as from _ignore_set
+        include_bare (bool): Whether to include files without an extension in
+            addition to recognized files.
+        patterns (PatternList|None): Gitignore-style patterns to exclude,
+            relative to the campaign root. Patterns in `.npcignore` files are
+            always used.
+        visited (Visited|None): Files and directories that were already
+            reached. Each physical file is only yielded once.
+
+    Yields:
+        Path strings for every parseable file within start_path, but not in
+        ignored.
+    """
+    def accept(name):
+        _, ext = path.splitext(name)
+        return ext in VALID_EXTENSIONS or (include_bare and not ext)
+
+    if isinstance(start_path, ListedPath):
+        if not path.exists(start_path):
+            return
+        if path.isfile(start_path):
+            if accept(path.basename(start_path)) and not _listed_file_ignored(start_path, ignored, patterns):
+                if visited is None or visited.first_visit(stat(start_path), start_path):
+                    yield start_path
+            return
+    elif path.isfile(start_path):
+        if visited is None or visited.first_visit(stat(start_path), start_path):
+            yield start_path
+        return
+
+    rules = ignore.rules_for(start_path, patterns)
+    if rules is None:
+        return
+
+    for entry in _walk_files(start_path, ignored, rules, visited, accept):
+        yield entry.path
+
+def _listed_file_ignored(file_path, ignored, patterns):
+    """
+    Determine whether a listed file would be skipped by a directory search
+
+    Args:
+        file_path (str): Path of the file
+        ignored (set): Absolute paths to exclude, as from _ignore_set
+        patterns (PatternList|None): Gitignore-style patterns to exclude,
+            relative to the campaign root
+
+    Returns:
+        True if the file, or a directory above it, is in ignored, or if the
+        ignore patterns and `.npcignore` files exclude it
+    """
+    abs_path = path.abspath(file_path)
+    if ignored:
+        current = abs_path
+        while True:
+            if current in ignored:
+                return True
+            parent = path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+
+    dir_path = path.dirname(abs_path)
+    rules = ignore.rules_for(dir_path, patterns)
+    if rules is None:
+        return True
+    rules = rules.with_file(path.join(dir_path, ignore.IGNORE_FILE_NAME))
+    return rules.ignores(path.basename(abs_path), False)
+
+def _parse_parallel(file_paths, jobs, cache=None, chunk_size=CHUNK_SIZE, tags=None, keep_body=False):
+    """
+    Parse character files using a pool of worker processes
+
+    Files are sent to the workers in chunks. Only a few chunks per worker are
+    in flight at once, and results are yielded in the same order as
+    file_paths.
+
+    The workers build the Character objects themselves, since that is most of
+    the work. Cache lookups and updates happen in this process: cached records
+    are sent along with their chunk so the workers can skip reading those
+    files.
+
+    Args:
+        file_paths (iter): Paths of the files to parse
+        jobs (int): Number of worker processes
+        cache (ParseCache|None): Cache of previously parsed files
+        chunk_size (int): Number of files to send to a worker at once
+        tags (frozenset|None): Names of the tags to build
+        keep_body (bool): Whether to keep the text of each file that is read
+
+    Yields:
+        Character objects in the same order as file_paths
+    """
+    def finish(job):
+        future, signatures = job
+        for (character, records), signature in zip(future.result(), signatures):
+            if records is not None and cache is not None:
+                cache.store(character.path, signature, records)
+            yield character
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        file_paths = iter(file_paths)
+        while True:
+            chunk = list(itertools.islice(file_paths, chunk_size))
+            if not chunk:
+                break
+
+            work = []
+            signatures = []
+            for file_path in chunk:
+                records = signature = None
+                if cache is not None:
+                    records, signature = cache.lookup(file_path)
+                work.append((file_path, records))
+                signatures.append(signature)
+            pending.append((executor.submit(_parse_chunk, work, tags, keep_body), signatures))
+
+            if len(pending) > jobs * 2:
+                yield from finish(pending.popleft())
+
+        while pending:
+            yield from finish(pending.popleft())
+
+def _parse_overlapped(file_paths, threads, cache=None, window=None, tags=None, keep_body=False):
+    """
+    Parse character files while a thread pool does the file I/O
+
+    Files are handled in batches. Each batch is stat'd (and checked against the
+    cache) in the pool, then the files that need reading are read in inode
+    order, which keeps disk and network filesystems closer to sequential
+    access. The next batch is started before the current one is parsed, so
+    there is always I/O in flight. The file contents are scanned and built into
+    characters in this thread, in the same order as file_paths.
+
+    Args:
+        file_paths (iter): Paths of the files to parse
+        threads (int): Number of I/O threads
+        cache (ParseCache|None): Cache of previously parsed files
+        window (int|None): Number of files per batch. Defaults to four per
+            thread.
+        tags (frozenset|None): Names of the tags to build
+        keep_body (bool): Whether to keep the text of each file that is read
+
+    Yields:
+        Character objects in the same order as file_paths
+    """
+    if window is None:
+        window = threads * 4
+
+    def prepare(file_path):
+        stat_result = stat(file_path)
+        records = signature = None
+        if cache is not None:
+            records, signature = cache.lookup(file_path, stat_result)
+        return stat_result.st_ino, records, signature
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        def start(batch):
+            return batch, [executor.submit(prepare, p) for p in batch]
+
+        def start_reads(job):
+            batch, prepared_futures = job
+            prepared = [f.result() for f in prepared_futures]
+            misses = [i for i, (_, records, _) in enumerate(prepared) if records is None]
+            misses.sort(key=lambda i: prepared[i][0])
+            reads = {i: executor.submit(_read_file, batch[i]) for i in misses}
+            return batch, prepared, reads
+
+        file_paths = iter(file_paths)
+        def next_batch():
+            batch = list(itertools.islice(file_paths, window))
+            return start(batch) if batch else None
+
+        upcoming = next_batch()
+        while upcoming:
+            batch, prepared, reads = start_reads(upcoming)
+            upcoming = next_batch()
+
+            for index, file_path in enumerate(batch):
+                _, records, signature = prepared[index]
+                data = None
+                if records is None:
+                    data = reads.pop(index).result()
+                    records = scan_bytes(data)
+                    if cache is not None:
+                        cache.store(file_path, signature, records)
+
+                new_char = build_character(file_path, records, tags)
+                if keep_body and data is not None:
+                    new_char.body = decode_text(data)
+                yield new_char
+
+def _read_file(file_path):
+    """
+    Read the raw contents of a file
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        Bytes of the whole file
+    """
+    with open(file_path, 'rb') as char_file:
+        return char_file.read()
+
+def _parse_chunk(work, tags=None, keep_body=False):
+    """
+    Parse a chunk of files in a worker process
+
+    Args:
+        work (list): List of (path, records) tuples. When records is None,
+            the file is read.
+        tags (frozenset|None): Names of the tags to build
+        keep_body (bool): Whether to keep the text of each file that is read
+
+    Returns:
+        List of (character, records) tuples. Records is only included if the
+        file had to be read, so it can be added to the cache.
+    """
+    results = []
+    for file_path, records in work:
+        new_records = body = None
+        if records is None:
+            if keep_body:
+                records, body = read_body(file_path)
+            else:
+                records = read_records(file_path)
+            new_records = records
+
+        new_char = build_character(file_path, records, tags)
+        if body is not None:
+            new_char.body = body
+        results.append((new_char, new_records))
+    return results
+
+def _walk_files(root, ignored=frozenset(), rules=None, visited=None, accept=None):
+    """
+    Recursively list the files in a directory tree, skipping ignored paths
+
+    Directories are visited in the same top-down order as os.walk, following
+    symlinks. The type information from os.scandir is reused, so entries are
+    not stat'd again. Ignored directories are pruned before they are listed.
+
+    Any `.npcignore` file found along the way adds its patterns to the rules
+    for its directory and everything below it.
+
+    Args:
+        root (str): Directory to start at
+        ignored (set): Absolute paths to skip over, as from _ignore_set
+        rules (IgnoreRules|None): Ignore patterns that apply to the contents of
+            root, as from ignore.rules_for
+        visited (Visited|None): Files and directories that were already
+            reached. Directories are only entered and files only yielded the
+            first time they are reached through any path, which also stops
+            symlink loops.
+        accept (callable|None): Function that takes a file name and returns
+            whether the file is wanted. Only wanted files are checked against
+            visited.
+
+    Yields:
+        os.DirEntry objects for every entry that is not a directory. Their paths
+        start with root.
+    """
+    abs_root = path.abspath(root) if ignored else None
+    if abs_root in ignored:
+        return
+    if rules is None:
+        rules = ignore.IgnoreRules()
+
+    root_dev = None
+    if visited is not None:
+        try:
+            root_stat = stat(root)
+        except OSError:
+            return
+        if not visited.first_visit(root_stat, root):
+            return
+        root_dev = root_stat.st_dev
+
+    pending = [(root, abs_root, rules, root_dev)]
+    while pending:
+        dir_path, abs_dir, rules, dir_dev = pending.pop()
+        try:
+            entries = list(scandir(dir_path))
+        except OSError:
+            # unreadable directories are skipped, same as os.walk
+            continue
+
+        for entry in entries:
+            if entry.name == ignore.IGNORE_FILE_NAME:
+                rules = rules.with_file(entry.path)
+                break
+
+        files = []
+        subdirs = []
+        for entry in entries:
+            if ignored:
+                abs_path = path.join(abs_dir, entry.name)
+                if abs_path in ignored:
+                    continue
+            else:
+                abs_path = None
+
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if rules and rules.ignores(entry.name, is_dir):
+                continue
+
+            if is_dir:
+                entry_dev = None
+                if visited is not None:
+                    try:
+                        entry_stat = entry.stat()
+                    except OSError:
+                        continue
+                    if not visited.first_visit(entry_stat, entry.path):
+                        continue
+                    entry_dev = entry_stat.st_dev
+                subdirs.append((entry.path, abs_path, rules.child(entry.name), entry_dev))
+            else:
+                if accept is not None and not accept(entry.name):
+                    continue
+                if visited is not None and not visited.first_entry(entry, dir_dev):
+                    continue
+                files.append(entry)
+
+        yield from files
+        pending.extend(reversed(subdirs))
+
+class Visited:
+    """
+    Physical files and directories that a search has already reached
+
+    Items are identified by their device and inode numbers, so symlinks, hard
+    links, and overlapping search paths all resolve to the same item.
+    """
+    def __init__(self, on_alias=None):
+        """
+        Create an empty visited set
+
+        Args:
+            on_alias (callable|None): Function to call when an item is reached
+                again through a different path. It gets the new path and the
+                path the item was first reached by.
+        """
+        self.on_alias = on_alias
+        self.seen = {}
+
+    def first_visit(self, stat_result, item_path) -> bool:
+        """
+        Record that an item was reached
+
+        Args:
+            stat_result (os.stat_result): Stat data for the item, following
+                symlinks
+            item_path (str): Path the item was reached by
+
+        Returns:
+            True if this is the first time the item was reached, False if not
+        """
+        return self._record((stat_result.st_dev, stat_result.st_ino), item_path)
+
+    def first_entry(self, entry, dir_dev) -> bool:
+        """
+        Record that a file was reached while listing a directory
+
+        Regular files are on the same device as their directory, so they are
+        identified without another stat call. Symlinks are followed.
+
+        Args:
+            entry (os.DirEntry): Directory entry for the file
+            dir_dev (int): Device number of the directory being listed
+
+        Returns:
+            True if this is the first time the file was reached, False if not
+        """
+        try:
+            if entry.is_symlink():
+                return self.first_visit(entry.stat(), entry.path)
+            return self._record((dir_dev, entry.inode()), entry.path)
+        except OSError:
+            return True
+
+    def _record(self, key, item_path) -> bool:
+        """
+        Record an item by its identity
+
+        Args:
+            key (tuple): Device and inode numbers of the item
+            item_path (str): Path the item was reached by
+
+        Returns:
+            True if this is the first time the item was reached, False if not
+        """
+        if not key[1]:
+            # some filesystems do not have real inode numbers
+            return True
+
+        original = self.seen.get(key)
+        if original is None:
+            self.seen[key] = item_path
+            return True
+
+        if self.on_alias is not None:
+            self.on_alias(item_path, original)
+        return False
+
+def parse_character(char_file_path, *, cache=None, tags=None, keep_body=False) -> character.Character:
+    """
+    Parse a single character file
+
+    Args:
+        char_file_path (str): Path to the character file to parse
+        cache (ParseCache|None): Cache of previously parsed files. If the file
+            has not changed since it was cached, it is not opened at all.
+        tags (iter|None): Names of the tags to build. See build_character.
+        keep_body (bool): Whether to read the whole file and keep its text as
+            Character.body. When the records come from the cache, the body is
+            left to load on first use instead.
+
+    Returns:
+        Character object. Most keys store a list of values from the character.
+        The string keys store a simple string, and the `rank` key stores
+        a dict of list entries. Those keys are individual group names.
+    """
+    body = None
+    def read(file_path):
+        nonlocal body
+        records, body = read_body(file_path)
+        return records
+    reader = read if keep_body else read_records
+
+    if cache is not None:
+        records = cache.records(char_file_path, reader)
+    else:
+        records = reader(char_file_path)
+
+    new_char = build_character(char_file_path, records, tags)
+    if body is not None:
+        new_char.body = body
+    return new_char
+
+def read_records(char_file_path):
+    """
+    Scan the header of a character file
+
+    Args:
+        char_file_path (str): Path to the character file to scan
+
+    Returns:
+        List of `(tag, value)` records. See scan_lines.
+    """
+    with open(char_file_path, 'rb') as char_file:
+        return scan_file(char_file)
+
+def read_body(char_file_path):
+    """
+    Read a whole character file and scan its header
+
+    Args:
+        char_file_path (str): Path to the character file to read
+
+    Returns:
+        Tuple of (records, body). Records is a list of `(tag, value)` records,
+        as from scan_lines, and body is the text of the file as if it were
+        opened in text mode.
+    """
+    data = _read_file(char_file_path)
+    return scan_bytes(data), decode_text(data)
+
+def decode_text(data):
+    """
+    Decode the raw contents of a file exactly as if it were opened in text mode
+
+    Args:
+        data (bytes): Contents of the file
+
+    Returns:
+        String with universal newlines
+    """
+    return io.TextIOWrapper(io.BytesIO(data), encoding=tokenizer.default_encoding()).read()
+
+def scan_file(char_file):
+    """
+    Scan the header of an open character file
+
+    Args:
+        char_file (file): Binary file object, positioned at the start of the
+            character file
+
+    Returns:
+        List of `(tag, value)` records. See scan_lines.
+    """
+    encoding = tokenizer.default_encoding()
+    if not tokenizer.ascii_compatible(encoding):
+        return scan_lines(io.TextIOWrapper(char_file, encoding=encoding))
+
+    return tokenizer.tokenize_file(char_file, encoding)
+
+def scan_bytes(data):
+    """
+    Scan the raw contents of a character file into records
+
+    The bytes are decoded and split into lines exactly as if the file had been
+    opened in text mode. Uses the bytes-level tokenizer when the text encoding
+    allows it, and scan_lines otherwise.
+
+    Args:
+        data (bytes): Contents of the file
+
+    Returns:
+        List of `(tag, value)` records. See scan_lines.
+    """
+    encoding = tokenizer.default_encoding()
+    if tokenizer.ascii_compatible(encoding):
+        return tokenizer.tokenize(data, encoding)
+
+    return scan_lines(io.TextIOWrapper(io.BytesIO(data), encoding=encoding))
+
+def scan_lines(lines):
+    """
+    Turn the header lines of a character sheet into records
+
+    This is the line-by-line scanner. Files are normally scanned by
+    tokenizer.tokenize instead, which produces the same records.
+
+    Scanning stops at the first section marker, like `--Stats--`. Tag names are
+    lowercased, comment tags are dropped, and blank description lines are
+    skipped.
+
+    Args:
+        lines (iter): Lines of text from a character file, including their
+            line endings.
+
+    Returns:
+        List of `(tag, value)` tuples in file order. Description lines are
+        stored with a tag of None and their whitespace stripped.
+    """
+    records = []
+    for line in lines:
+        # stop processing once we see game stats
+        if SECTION_RE.match(line):
+            break
+
+        match = TAG_RE.match(line)
+        if match:
+            tag = match.group('tag').lower()
+
+            # skip comment tags
+            if tag[0] == '#':
+                continue
+
+            records.append((tag, match.group('value')))
+        else:
+            # all remaining text goes in the description
+            text = line.strip()
+            if text:
+                records.append((None, text))
+
+    return records
+
+def name_from_path(char_file_path):
+    """
+    Get the name a character file gives its character
+
+    The name is the file's basename, without its extension or anything after
+    the first ` - `.
+
+    Args:
+        char_file_path (str): Path to the character file
+
+    Returns:
+        Name string
+    """
+    basename = path.basename(char_file_path)
+    return path.splitext(basename)[0].split(' - ', 1)[0]
+
+def build_character(char_file_path, records, tags=None) -> character.Character:
+    """
+    Create a character object from scanned records
+
+    When tags is given, only those tags are built. Records for other tags are
+    skipped, along with the description unless it is asked for. Tags that
+    change other tags are still applied where it matters: @realname and the
+    compound @changeling and @werewolf tags always run, and @hide runs when
+    the tag it hides is built. Group tags and their subtags are built
+    together.
+
+    Args:
+        char_file_path (str): Path to the character file the records came from.
+            Used as the character's path and to derive its name.
+        records (list): List of `(tag, value)` records, as from scan_lines
+        tags (iter|None): Names of the tags to build, in lowercase. The tags
+            in PROJECTION_TAGS are always built. None builds every tag.
+
+    Returns:
+        Character object of the appropriate class
+    """
+    wanted = None
+    if tags is not None:
+        wanted = _projection(frozenset(tags))
+
+    # instantiate the right class up front, so its tags are filled directly
+    klass = character.character_klass_from_type(type_from_records(records))
+    parsed_char = klass(
+        name=[name_from_path(char_file_path)],
+        path=char_file_path
+    )
+    # the records supply the type, so drop any default the class added
+    parsed_char.tags('type').clear()
+    typed_groups = _stand_in_typed_groups(parsed_char)
+
+    subtag_registry = {}
+
+    for tag, value in records:
+        if tag is None:
+            if wanted is None or 'description' in wanted:
+                parsed_char.tags('description').append(value)
+            continue
+
+        tag = intern(tag)
+        build_tag = COMPOUND_TAGS.get(tag)
+        if build_tag is not None:
+            if wanted is None or tag != 'hide' or HIDE_RE.split(value, 1)[0] in wanted:
+                build_tag(parsed_char, value)
+            continue
+
+        if wanted is not None and tag not in wanted:
+            continue
+
+        if tag in INTERNED_TAGS:
+            value = intern(value)
+
+        # handle rank logic for group tags
+        if parsed_char.tags(tag).subtag_name:
+            subtag_registry[parsed_char.tags(tag).subtag_name] = (tag, value)
+        if tag in subtag_registry:
+            supertag, supervalue = subtag_registry[tag]
+            parsed_char.tags(supertag)[supervalue].append(value)
+            continue
+
+        if tag in DEPRECATED_TAGS:
+            print_err("The tag '{}' in `{}` is deprecated and will stop working in the future".format(tag, char_file_path))
+
+        parsed_char.tags(tag).append(value)
+
+    for group in typed_groups:
+        group.update(parsed_char.tags(group.name))
+        parsed_char.tags.data[group.name] = group
+
+    return parsed_char
+
+def _stand_in_typed_groups(parsed_char):
+    """
+    Swap the class's own group tags for plain tags while records are applied
+
+    A generic character has none of the group tags that a type adds, like
+    @court or @pack, so their values are kept as plain tags and their ranks
+    are not their subtags. Filling plain tags in their place keeps records
+    going to the same tags, and converting them afterward gives the same
+    result as copying a generic character into the typed class.
+
+    Args:
+        parsed_char (Character): Character being built
+
+    Returns:
+        List of the empty group tags that were swapped out. Each is filled
+        from its stand-in and put back once the records are applied.
+    """
+    swapped = [tag for tag in parsed_char.tags.all() if tag.subtag_name and tag.name not in BASE_GROUP_TAGS]
+    for group in swapped:
+        parsed_char.tags.data[group.name] = UnknownTag(group.name)
+    return swapped
+
+def type_from_records(records):
+    """
+    Find the type that a character's records give it
+
+    This is the first value the type tag would get while building the
+    character, whether from @type or from a compound tag that sets it.
+
+    Args:
+        records (list): List of `(tag, value)` records, as from scan_lines
+
+    Returns:
+        Type string, or None if the records have no type
+    """
+    for tag, value in records:
+        if tag == 'type' and value.strip():
+            return value
+        if tag in TYPE_TAGS:
+            return TYPE_TAGS[tag]
+    return None
+
+@lru_cache(maxsize=32)
+def _projection(tags):
+    """
+    Get every tag name needed to build the given tags
+
+    Args:
+        tags (frozenset): Names of the requested tags
+
+    Returns:
+        Frozenset of the requested tags, the tags in PROJECTION_TAGS, and the
+        group tags and subtags that go with any of them
+    """
+    wanted = set(tags).union(PROJECTION_TAGS)
+    for name, subtag_name in BASE_GROUP_TAGS.items():
+        if name in wanted or subtag_name in wanted:
+            wanted.update((name, subtag_name))
+    return frozenset(wanted)
+
+def _build_changeling(parsed_char, value):
+    """
+    Handle the compound @changeling tag
+
+    Args:
+        parsed_char (Character): Character being built
+        value (str): Seeming, optionally followed by kith
+    """
+    # grab attributes from compound tag
+    bits = value.split(maxsplit=1)
+    parsed_char.tags('type').append(TYPE_TAGS['changeling'])
+    if len(bits):
+        parsed_char.tags('seeming').append(intern(bits[0]))
+    if len(bits) > 1:
+        parsed_char.tags('kith').append(intern(bits[1]))
+
+def _build_werewolf(parsed_char, value):
+    """
+    Handle the compound @werewolf tag
+
+    Args:
+        parsed_char (Character): Character being built
+        value (str): Auspice
+    """
+    parsed_char.tags('type').append(TYPE_TAGS['werewolf'])
+    parsed_char.tags('auspice').append(intern(value))
+
+def _build_realname(parsed_char, value):
+    """
+    Handle the @realname tag by replacing the first name
+
+    Args:
+        parsed_char (Character): Character being built
+        value (str): Real name of the character
+    """
+    parsed_char.tags('name')[0] = value
+
+def _build_hide(parsed_char, value):
+    """
+    Handle the @hide tag by marking tags, values, or subtags hidden
+
+    Args:
+        parsed_char (Character): Character being built
+        value (str): Tag name, optionally followed by `>> value` and
+            `>> subvalue` or `>> subtags`
+    """
+    # parsing has always left an empty 'hide' tag behind, which strict
+    # linting reports as unrecognized
+    parsed_char.tags('hide')
+
+    parts = HIDE_RE.split(value)
+
+    tagname = parts.pop(0)
+    if not parts:
+        parsed_char.tags(tagname).hidden = True
+        return
+
+    first_value = parts.pop(0)
+    if not parts:
+        parsed_char.tags(tagname).hide_value(first_value)
+        return
+
+    second_value = parts.pop(0)
+    if not parts:
+        if second_value == 'subtags':
+            parsed_char.tags(tagname).subtag(first_value).hidden = True
+        else:
+            parsed_char.tags(tagname).subtag(first_value).hide_value(second_value)
+        return
+
+    # If we can't parse the hide string, hide the whole thing as
+    # a tag and let the Character object deal with it.
+    parsed_char.tags(value).hidden = True
+
+COMPOUND_TAGS = {
+    'changeling': _build_changeling,
+    'werewolf': _build_werewolf,
+    'realname': _build_realname,
+    'hide': _build_hide,
+}
+"""dict: functions that build tags which do more than add their value"""
+
+TYPE_TAGS = {
+    'changeling': 'Changeling',
+    'werewolf': 'Werewolf',
+}
+"""dict: compound tags that set the character's type, and the type they add"""
+
+BASE_GROUP_TAGS = {tag.name: tag.subtag_name for tag in character.Character().tags.all() if tag.subtag_name}
+"""dict: subtag names of the group tags every character has, by group tag name"""
@@ -0,0 +1,116 @@
+"""
+Read characters back from the output of the dump command
+
+A dump is either the JSON array written by `npc dump`, or an NDJSON stream
+with one character object per line. Either way, each object holds a
+character's tag values and its path. Metadata objects, which have a `meta`
+key, are skipped.
+
+Hidden tags and values, and flags that were set without a value, are stored
+as header lines under each character's `directives` key when the dump was
+made with `--directives`. They are applied the same way the parser applies
+them.
+"""
+
+import json
+import sys
+
+from npc import character
+
+from . import core
+
+def load_dump(dump_path):
+    """
+    Read the characters in a dump file
+
+    Args:
+        dump_path (str): Path to the dump file. Use `-` to read from stdin.
+
+    Yields:
+        Character objects in the same order as the dump
+    """
+    if dump_path == '-':
+        yield from read_dump(sys.stdin)
+        return
+
+    with open(dump_path, 'r') as dump_file:
+        yield from read_dump(dump_file)
+
+def read_dump(stream):
+    """
+    Read the characters in a dump
+
+    The format is detected from the first character: a dump that starts with
+    `[` is a JSON array, and anything else is NDJSON. NDJSON is read one line
+    at a time, so characters are produced as the stream arrives.
+
+    Args:
+        stream (file): Text stream holding the dump
+
+    Yields:
+        Character objects in the same order as the dump
+    """
+    first_line = stream.readline()
+    if first_line.lstrip().startswith('['):
+        entries = json.loads(first_line + stream.read())
+    else:
+        entries = (json.loads(line) for line in _chain_lines(first_line, stream) if line.strip())
+
+    for entry in entries:
+        if 'meta' in entry:
+            continue
+        yield build_from_dump(entry)
+
+def _chain_lines(first_line, stream):
+    """
+    Yield a line that was already read, then the rest of the stream
+
+    Args:
+        first_line (str): Line that was read to detect the format
+        stream (file): Text stream to read the remaining lines from
+
+    Yields:
+        Lines of text
+    """
+    yield first_line
+    yield from stream
+
+def build_from_dump(entry):
+    """
+    Create a character object from one dumped character
+
+    Args:
+        entry (dict): Character data, as from Character.dump(). Plain tags are
+            lists of values, and group tags are dicts of group names to lists
+            of subtag values. The optional `directives` key holds header lines
+            for hidden data and bare flags.
+
+    Returns:
+        Character object of the appropriate class
+    """
+    entry = dict(entry)
+    char_path = entry.pop('path', None)
+    directives = entry.pop('directives', [])
+    groups = {key: entry.pop(key) for key, value in list(entry.items()) if isinstance(value, dict)}
+
+    if entry.get('type'):
+        new_char = character.build(attributes=entry)
+    else:
+        new_char = character.Character(attributes=entry)
+    new_char.path = char_path if char_path is not None else ''
+
+    for tag_name, group_values in groups.items():
+        tag = new_char.tags(tag_name)
+        for group_name, subvalues in group_values.items():
+            tag.append(group_name)
+            for subvalue in subvalues:
+                tag.subtag(group_name).append(subvalue)
+
+    for tag, value in core.scan_lines(line + "\n" for line in directives):
+        build_tag = core.COMPOUND_TAGS.get(tag)
+        if build_tag is not None:
+            build_tag(new_char, value)
+        else:
+            new_char.tags(tag).append(value)
+
+    return new_char
@@ -0,0 +1,349 @@
+"""
+Gitignore-style patterns for skipping paths while searching for characters
+
+Patterns come from `.npcignore` files, which can be placed in any directory,
+and from the `paths.ignore_patterns` setting, which is relative to the campaign
+root. They follow the same rules as gitignore files:
+
+* Blank lines and lines starting with `#` are skipped
+* `*` matches anything except `/`, `?` matches one character, and `[abc]`
+  matches one character from a set
+* `**/` matches any number of directories, and a trailing `/**` matches
+  everything inside a directory
+* A pattern with a `/` at the start or in the middle is relative to the
+  directory holding it. Otherwise it matches a name at any depth.
+* A trailing `/` only matches directories
+* A leading `!` re-includes paths that an earlier pattern ignored. Paths inside
+  an ignored directory cannot be re-included, since it is never listed.
+
+The last matching pattern wins, and patterns from deeper `.npcignore` files
+take precedence over shallower ones.
+"""
+
+import os
+import re
+from os import path
+
+IGNORE_FILE_NAME = '.npcignore'
+"""str: name of the pattern files that are read while searching"""
+
+def compile_pattern(pattern: str):
+    """
+    Turn a single gitignore-style pattern into a regex
+
+    Args:
+        pattern (str): Pattern line
+
+    Returns:
+        Tuple of (regex, negated, dir_only), or None if the line holds no
+        valid pattern.
+    """
+    if pattern.startswith('#'):
+        return None
+
+    # trailing spaces are ignored unless escaped
+    pattern = re.sub(r'(?<!\\)\s+$', '', pattern.rstrip('\n'))
+    if not pattern:
+        return None
+
+    negated = pattern.startswith('!')
+    if negated:
+        pattern = pattern[1:]
+    elif pattern.startswith('\\!') or pattern.startswith('\\#'):
+        pattern = pattern[1:]
+
+    dir_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    if not pattern:
+        return None
+
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+
+    regex = _translate(pattern)
+    if not anchored:
+        regex = '(?:.*/)?' + regex
+
+    try:
+        return re.compile(regex + r'\Z', re.DOTALL), negated, dir_only
+    except re.error:
+        # like git, a malformed pattern matches nothing
+        return None
+
+def _translate(pattern: str) -> str:
+    """
+    Translate the glob syntax of a pattern into regex syntax
+
+    Args:
+        pattern (str): Pattern without negation, anchoring, or trailing slash
+
+    Returns:
+        Regex string that matches a whole relative path
+    """
+    parts = []
+    index = 0
+    length = len(pattern)
+    while index < length:
+        char = pattern[index]
+        if index == 0 and pattern.startswith('**/'):
+            parts.append('(?:.*/)?')
+            index += 3
+        elif pattern.startswith('/**/', index):
+            parts.append('/(?:.*/)?')
+            index += 4
+        elif pattern.startswith('/**', index) and index + 3 == length:
+            parts.append('/.*')
+            index += 3
+        elif char == '*':
+            while index < length and pattern[index] == '*':
+                index += 1
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+            index += 1
+        elif char == '[':
+            end = _class_end(pattern, index)
+            if end < 0:
+                parts.append(re.escape(char))
+                index += 1
+                continue
+            contents = pattern[index + 1:end]
+            if contents[0] in '!^':
+                contents = '^/' + contents[1:]
+            parts.append('[' + contents.replace('\\', '\\\\').replace('[', '\\[') + ']')
+            index = end + 1
+        elif char == '\\' and index + 1 < length:
+            parts.append(re.escape(pattern[index + 1]))
+            index += 2
+        else:
+            parts.append(re.escape(char))
+            index += 1
+
+    return ''.join(parts)
+
+def _class_end(pattern: str, start: int) -> int:
+    """
+    Find the closing bracket of a character class
+
+    Args:
+        pattern (str): Pattern holding the class
+        start (int): Index of the opening bracket
+
+    Returns:
+        Index of the closing bracket, or -1 if the class is not closed
+    """
+    index = start + 1
+    if index < len(pattern) and pattern[index] in '!^':
+        index += 1
+    # a bracket right at the start is part of the class
+    if index < len(pattern) and pattern[index] == ']':
+        index += 1
+    return pattern.find(']', index)
+
+class PatternList:
+    """
+    Ordered patterns that share a base directory
+    """
+    def __init__(self, patterns, source=None):
+        """
+        Compile a list of patterns
+
+        Args:
+            patterns (iter): Pattern strings, as from the lines of a
+                `.npcignore` file
+            source (str|None): Where the patterns came from
+        """
+        self.source = source
+        self.rules = [r for r in (compile_pattern(p) for p in patterns) if r]
+
+        # without negations, a path is ignored if any pattern matches, so
+        # the patterns can be checked all at once
+        self._combined = None
+        if not any(negated for _, negated, _ in self.rules):
+            self._combined = (
+                self._combine(r for r in self.rules if not r[2]),
+                self._combine(r for r in self.rules))
+
+    @classmethod
+    def from_file(cls, file_path):
+        """
+        Read the patterns in a file
+
+        Args:
+            file_path (str): Path to the pattern file
+
+        Returns:
+            PatternList object. Empty if the file could not be read.
+        """
+        try:
+            with open(file_path, 'r') as pattern_file:
+                return cls(pattern_file, source=file_path)
+        except OSError:
+            return cls([], source=file_path)
+
+    @staticmethod
+    def _combine(rules):
+        """
+        Join several pattern regexes into one
+
+        Args:
+            rules (iter): Compiled rules, as from compile_pattern
+
+        Returns:
+            Compiled regex, or None if there are no rules
+        """
+        regexes = ['(?:{})'.format(regex.pattern) for regex, _, _ in rules]
+        if not regexes:
+            return None
+        return re.compile('|'.join(regexes), re.DOTALL)
+
+    def __bool__(self):
+        return len(self.rules) > 0
+
+    def match(self, rel_path: str, is_dir: bool):
+        """
+        Check a path against these patterns
+
+        Args:
+            rel_path (str): Path relative to the base directory of the
+                patterns, using `/` as the separator
+            is_dir (bool): Whether the path is a directory
+
+        Returns:
+            True if the path is ignored, False if it is re-included by a
+            negated pattern, or None if no pattern matches it.
+        """
+        if self._combined is not None:
+            regex = self._combined[1] if is_dir else self._combined[0]
+            if regex is not None and regex.match(rel_path):
+                return True
+            return None
+
+        for regex, negated, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                return not negated
+
+        return None
+
+class IgnoreRules:
+    """
+    The pattern lists that apply to the contents of one directory
+
+    Rules are immutable. Going down into a subdirectory or adding the patterns
+    from another `.npcignore` file creates a new object, so each directory in a
+    walk can hold its own rules.
+    """
+    def __init__(self, lists=()):
+        """
+        Create a new set of rules
+
+        Args:
+            lists (tuple): Tuples of (PatternList, prefix), from shallowest to
+                deepest. The prefix is the path of the current directory
+                relative to the base of the pattern list, ending with `/` or
+                empty.
+        """
+        self.lists = lists
+
+    def __bool__(self):
+        return len(self.lists) > 0
+
+    def with_patterns(self, pattern_list):
+        """
+        Add patterns whose base is the current directory
+
+        Args:
+            pattern_list (PatternList): Patterns to add
+
+        Returns:
+            IgnoreRules object. This object if pattern_list is empty.
+        """
+        if not pattern_list:
+            return self
+        return IgnoreRules(self.lists + ((pattern_list, ''),))
+
+    def with_file(self, file_path):
+        """
+        Add the patterns from a pattern file in the current directory
+
+        Args:
+            file_path (str): Path to the file
+
+        Returns:
+            IgnoreRules object
+        """
+        return self.with_patterns(PatternList.from_file(file_path))
+
+    def child(self, name: str):
+        """
+        Get the rules for a subdirectory
+
+        Args:
+            name (str): Name of the subdirectory
+
+        Returns:
+            IgnoreRules object
+        """
+        if not self.lists:
+            return self
+        return IgnoreRules(tuple((patterns, prefix + name + '/') for patterns, prefix in self.lists))
+
+    def ignores(self, name: str, is_dir: bool) -> bool:
+        """
+        Determine whether an entry of the current directory is ignored
+
+        Args:
+            name (str): Name of the file or directory
+            is_dir (bool): Whether the entry is a directory
+
+        Returns:
+            True if the entry should be skipped, False if not
+        """
+        for patterns, prefix in reversed(self.lists):
+            result = patterns.match(prefix + name, is_dir)
+            if result is not None:
+                return result
+        return False
+
+def rules_for(root, patterns=None, base='.'):
+    """
+    Get the ignore rules for the contents of a search root
+
+    The patterns and any `.npcignore` files in the directories from base down
+    to root are included, so searching a subdirectory ignores the same things
+    as searching the whole campaign.
+
+    Args:
+        root (str): Directory that will be searched
+        patterns (PatternList|None): Patterns relative to base, as from the
+            `paths.ignore_patterns` setting
+        base (str): Campaign root
+
+    Returns:
+        IgnoreRules object for the contents of root, or None if root itself is
+        ignored. Roots outside of base only get their own `.npcignore` files.
+    """
+    abs_root = path.abspath(root)
+    abs_base = path.abspath(base)
+    try:
+        rel_root = path.relpath(abs_root, abs_base)
+    except ValueError:
+        # root is on a different drive
+        return IgnoreRules()
+    if rel_root == os.pardir or rel_root.startswith(os.pardir + os.sep):
+        return IgnoreRules()
+
+    rules = IgnoreRules()
+    if patterns is not None:
+        rules = rules.with_patterns(patterns)
+    current = abs_base
+    for part in ([] if rel_root == os.curdir else rel_root.split(os.sep)):
+        rules = rules.with_file(path.join(current, IGNORE_FILE_NAME))
+        if rules.ignores(part, True):
+            return None
+        rules = rules.child(part)
+        current = path.join(current, part)
+
+    return rules
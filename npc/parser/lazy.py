@@ -0,0 +1,202 @@
+"""
+Characters that build most of their tags only when they are used
+
+A lazy character starts out with just a summary: its name, type, faketype,
+group tags, and flags, plus any other tags asked for up front. Those are
+enough to sort, section, skip, and filter characters by type or group. The
+first time any other tag is used, including the description, the whole
+character file is parsed and the rest of the tags are filled in.
+
+Lazy characters are ordinary Character objects of the class for their type.
+Only their tag container is different, so every part of the Character API
+works on them as usual.
+"""
+
+from copy import copy
+from functools import lru_cache, partial
+
+from npc import character
+from npc.character.tags import TagContainer, UnknownTag, Flag, GroupTag
+
+from . import core
+
+SUMMARY_TAGS = ('name', 'type', 'faketype')
+"""tuple: tags that every summary has, along with all group tags and flags"""
+
+@lru_cache(maxsize=None)
+def summary_tags():
+    """
+    Get the names of the tags that summaries always include
+
+    Returns:
+        Frozenset of the tags in SUMMARY_TAGS and the names of every group tag
+        and flag that a character class declares
+    """
+    names = set(SUMMARY_TAGS)
+    for klass in (character.Character, character.Changeling, character.Werewolf, character.Spirit):
+        names.update(tag.name for tag in klass().tags.all() if isinstance(tag, (GroupTag, Flag)))
+    return frozenset(names)
+
+class LazyTags(TagContainer):
+    """
+    Tag container that holds a summary until other tags are needed
+
+    Getting an indexed tag by calling the container, by key, with get(), or
+    testing for one with `in` uses the summary. Anything else loads every
+    tag first. Indexed tag objects are kept when the rest are loaded, so
+    references to them stay good.
+
+    When pickled or copied, the container loads every tag and becomes a
+    plain TagContainer.
+    """
+    def __init__(self, summary, indexed, load):
+        """
+        Wrap a summary container
+
+        Args:
+            summary (TagContainer): Container whose indexed tags are built in
+                full
+            indexed (frozenset): Names of the tags that summary holds
+            load (callable): Function that returns a container with every tag
+        """
+        # the summary supplies the tags, so TagContainer.__init__ is skipped
+        self._data = summary.data
+        self.problems = summary.problems
+        self.indexed = indexed
+        self._load = load
+
+    @property
+    def data(self):
+        """
+        dict: Every tag object, keyed by name. Loads the tags that are not
+        indexed.
+        """
+        if self._load is not None:
+            self._fill()
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+        self._load = None
+
+    @property
+    def loaded(self):
+        """
+        bool: Whether every tag has been loaded
+        """
+        return self._load is None
+
+    def _fill(self):
+        """
+        Load every tag, keeping the indexed tag objects
+        """
+        load, self._load = self._load, None
+        data = load().data
+        for name, tag in self._data.items():
+            if name in self.indexed:
+                data[name] = tag
+        self._data = data
+
+    def _summarized(self, tag_name):
+        """
+        Determine whether a tag can be answered from the summary
+
+        Args:
+            tag_name (str): Name of the tag
+
+        Returns:
+            True if the tags are not loaded yet and tag_name is indexed
+        """
+        return self._load is not None and tag_name in self.indexed
+
+    def __call__(self, tag_name: str):
+        if self._summarized(tag_name):
+            tag = self._data.get(tag_name)
+            if tag is None:
+                tag = self._data[tag_name] = UnknownTag(tag_name)
+            return tag
+        return super().__call__(tag_name)
+
+    def __getitem__(self, tag_name):
+        if self._summarized(tag_name):
+            return self._data[tag_name]
+        return super().__getitem__(tag_name)
+
+    def __contains__(self, tag_name):
+        if self._summarized(tag_name):
+            return tag_name in self._data
+        return super().__contains__(tag_name)
+
+    def get(self, tag_name, default=None):
+        if self._summarized(tag_name):
+            return self._data.get(tag_name, default)
+        return super().get(tag_name, default)
+
+    def __copy__(self):
+        return copy(_plain_container(self.data, self.problems))
+
+    def copy(self):
+        return copy(self)
+
+    def __reduce__(self):
+        return (_plain_container, (self.data, self.problems))
+
+def _plain_container(data, problems):
+    """
+    Make a plain container holding some tags
+
+    Args:
+        data (dict): Tag objects keyed by name
+        problems (list): Validation problems
+
+    Returns:
+        TagContainer object
+    """
+    container = TagContainer()
+    container.data = data
+    container.problems = problems
+    return container
+
+def make_lazy(char, indexed, load):
+    """
+    Turn a summary character into a lazy character
+
+    Args:
+        char (Character): Character built with only the indexed tags
+        indexed (frozenset): Names of the tags that were built
+        load (callable): Function that returns the fully built character
+
+    Returns:
+        The same character object, with a LazyTags container
+    """
+    char.tags = LazyTags(char.tags, indexed, partial(_load_tags, load))
+    return char
+
+def _load_tags(load):
+    """
+    Get the tags of a fully built character
+
+    Args:
+        load (callable): Function that returns the fully built character
+
+    Returns:
+        TagContainer object
+    """
+    return load().tags
+
+def indexed_tags(tags=None):
+    """
+    Get the names of the tags a summary holds
+
+    Args:
+        tags (iter|None): Names of other tags to build up front
+
+    Returns:
+        Frozenset of tag names, including the group tags and subtags that go
+        with them
+    """
+    names = summary_tags()
+    if tags:
+        names = names.union(tag.lower() for tag in tags)
+    return core._projection(names)
@@ -0,0 +1,174 @@
+"""
+Look up character names without parsing character files
+
+A character's first name comes from its file name. Only the `@realname` tag
+replaces it, and `@name` tags add more names. Those tags are rare, so the
+names of most characters can be worked out from a directory listing.
+
+The NameIndex keeps the name records of every file it has seen, along with the
+file's size and modification time. Files that have not changed since then are
+never opened. Most entries hold no records at all, so the index stays small
+even for large campaigns.
+"""
+
+import os
+from os import path
+
+from . import cache, core
+
+NAMES_FILE_NAME = 'names.json'
+"""str: name of the name index file within the cache directory"""
+
+NAME_TAGS = ('name', 'realname')
+"""tuple: tags whose records change a character's names"""
+
+def for_campaign(prefs):
+    """
+    Get the name index for the current campaign
+
+    The index is stored next to the parse cache and uses the same settings. It
+    is only used when the cache checks files by modification time, since
+    hashing would mean reading every file anyway.
+
+    Args:
+        prefs (Settings): Settings object to use
+
+    Returns:
+        NameIndex object, or None if caching is disabled, uses hashes, or
+        there is no campaign settings directory.
+    """
+    if prefs.get('parser.cache.validate', 'mtime') != 'mtime':
+        return None
+
+    directory = cache.cache_dir(prefs)
+    if directory is None:
+        return None
+
+    return NameIndex(directory.joinpath(NAMES_FILE_NAME), fingerprint=cache.fingerprint(prefs))
+
+def get_names(search_paths=None, ignore_paths=None, *, ignore_patterns=None, index=None, on_alias=None):
+    """
+    Get the names of every character, parsing as little as possible
+
+    Searches the same files as parser.get_characters. Without an index, each
+    file is scanned but no Character objects are built. Members of archives
+    are always scanned, since they are not in the index.
+
+    Args:
+        search_paths (list): Paths to search for character files
+        ignore_paths (list): Paths to exclude from the search
+        ignore_patterns (list|None): Gitignore-style patterns to exclude from
+            the search, relative to the campaign root
+        index (NameIndex|None): Index of name records. When given, unchanged
+            files are not opened, and the index is saved once every path has
+            been searched.
+        on_alias (callable|None): Function to call when a file or directory is
+            skipped because it was already reached through another path
+
+    Yields:
+        Tuples of (path, names), where names is the list of values the
+        character's name tag would have
+    """
+    sources = core.find_sources(search_paths, ignore_paths, ignore_patterns=ignore_patterns, on_alias=on_alias)
+    for in_archive, items in sources:
+        if in_archive:
+            for member_path, records, _ in items:
+                yield member_path, names_from_records(member_path, records)
+        else:
+            yield from _file_names(items, index)
+
+    if index is not None:
+        index.save()
+
+def _file_names(file_paths, index):
+    """
+    Get the names of the characters in some files
+
+    Args:
+        file_paths (iter): Paths of the character files
+        index (NameIndex|None): Index of name records
+
+    Yields:
+        Tuples of (path, names)
+    """
+    for file_path in file_paths:
+        if index is not None:
+            records = index.name_records(file_path)
+        else:
+            records = name_records(core.read_records(file_path))
+        yield file_path, names_from_records(file_path, records)
+
+def name_records(records):
+    """
+    Pick out the records that change a character's names
+
+    Args:
+        records (list): List of `(tag, value)` records, as from
+            core.scan_lines
+
+    Returns:
+        List of the records whose tag is in NAME_TAGS, in file order
+    """
+    return [(tag, value) for tag, value in records if tag in NAME_TAGS]
+
+def names_from_records(char_file_path, records):
+    """
+    Work out a character's names the same way core.build_character does
+
+    Args:
+        char_file_path (str): Path to the character file
+        records (list): Name records for the file, as from name_records. Other
+            records are ignored.
+
+    Returns:
+        List of name strings
+    """
+    names = [core.name_from_path(char_file_path)]
+    for tag, value in records:
+        if tag == 'realname':
+            names[0] = value
+        elif tag == 'name' and value.strip():
+            names.append(value)
+    return names
+
+class NameIndex(cache.JsonStore):
+    """
+    Store the name records of character files between runs
+
+    Like ParseCache, entries are loaded lazily and only written back by save()
+    if something changed. Each entry is a list of size, mtime in nanoseconds,
+    and, if there are any, name records.
+    """
+    description = 'name index'
+
+    def entry_mtimes(self, entry):
+        return (entry[1],)
+
+    def name_records(self, file_path, stat_result=None):
+        """
+        Get the name records for a file, scanning it only when needed
+
+        Args:
+            file_path (str): Path to the character file
+            stat_result (os.stat_result|None): Stat data for the file, if the
+                caller already has it
+
+        Returns:
+            List of `(tag, value)` records whose tag is in NAME_TAGS
+        """
+        key = path.abspath(file_path)
+        if stat_result is None:
+            stat_result = os.stat(file_path)
+        signature = [stat_result.st_size, stat_result.st_mtime_ns]
+        entry = self.entries.get(key)
+
+        self._seen.add(key)
+        if entry is not None and entry[:2] == signature:
+            self.hits += 1
+            return [tuple(record) for record in entry[2:]]
+
+        self.misses += 1
+        records = name_records(core.read_records(file_path))
+        self.entries[key] = signature + [list(record) for record in records]
+        self._dirty = True
+        return records
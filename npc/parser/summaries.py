@@ -0,0 +1,250 @@
+"""
+Summarize the tag values found in each directory of character files
+
+A summary lists, for every tag, the values that any character in a directory
+has for it. A search for `court:winter` can skip a directory whose summary has
+no court value containing "winter" without parsing any of its files.
+
+Summaries are checked against the size and modification time of every file in
+the directory, not just the directory's own mtime, since editing a file in
+place does not change its directory. Checking them still costs a stat call per
+file, which is far cheaper than building the characters.
+
+Tags with too many distinct values in a directory, and the description, are
+recorded as unknown. Unknown tags never rule a directory out.
+"""
+
+import itertools
+import os
+from os import path
+
+from npc.character.tags import GroupTag
+
+from . import cache
+
+SUMMARIES_FILE_NAME = 'summaries.json'
+"""str: name of the summary file within the cache directory"""
+
+MAX_VALUES = 64
+"""int: most distinct values kept for a tag before it is recorded as unknown"""
+
+UNSUMMARIZED_TAGS = ('description',)
+"""tuple: tags that are always recorded as unknown"""
+
+def for_campaign(prefs):
+    """
+    Get the directory summaries for the current campaign
+
+    Summaries are stored next to the parse cache and use the same settings.
+    Like the name index, they are only used when the cache checks files by
+    modification time.
+
+    Args:
+        prefs (Settings): Settings object to use
+
+    Returns:
+        SummaryIndex object, or None if caching is disabled, uses hashes, or
+        there is no campaign settings directory.
+    """
+    if prefs.get('parser.cache.validate', 'mtime') != 'mtime':
+        return None
+
+    directory = cache.cache_dir(prefs)
+    if directory is None:
+        return None
+
+    return SummaryIndex(directory.joinpath(SUMMARIES_FILE_NAME), fingerprint=cache.fingerprint(prefs))
+
+def tag_values(character):
+    """
+    Get the values that Tag.contains would test for each of a character's tags
+
+    Args:
+        character (Character): Character to summarize
+
+    Returns:
+        Dict of tag names to sets of casefolded values. Tags without values
+        are left out.
+    """
+    values = {}
+    for tag_name, tag in character.tags.items():
+        found = {value.casefold() for value in tag}
+        if isinstance(tag, GroupTag):
+            for group_name in tag:
+                found.update(value.casefold() for value in tag[group_name])
+        if found:
+            values[tag_name] = found
+    return values
+
+def could_contain(summary, tag, text) -> bool:
+    """
+    Determine whether any character in a summary might contain a value
+
+    Matches the rules of Tag.contains, so a False result means that
+    `character.tags(tag).contains(text)` is False for every summarized
+    character.
+
+    Args:
+        summary (dict): Tag summary, as from SummaryIndex.select
+        tag (str): Name of the tag to test
+        text (str): Casefolded text to look for, or `*` for any value
+
+    Returns:
+        True if a character might contain the text, False if none can
+    """
+    if tag not in summary:
+        return False
+
+    values = summary[tag]
+    if values is None or text == '*':
+        return True
+
+    return any(text in value for value in values)
+
+class SummaryIndex(cache.JsonStore):
+    """
+    Store a tag summary for each directory of character files between runs
+
+    Like NameIndex, entries are loaded lazily and only written back by save()
+    if something changed. Each entry holds the signatures of the files it was
+    built from, and the summary of their tags. Entries are keyed by absolute
+    directory path.
+    """
+    description = 'directory summaries'
+
+    def __init__(self, index_path, *, fingerprint=None):
+        """
+        Create a new summary index
+
+        Args:
+            index_path (PathLike): Path to the summary file. Its parent
+                directory is created on save if needed.
+            fingerprint (str|None): Value that must match the saved
+                fingerprint for saved entries to be used
+        """
+        super().__init__(index_path, fingerprint=fingerprint)
+        self.pruned = 0
+        self._pending = {}
+
+    def entry_mtimes(self, entry):
+        return (signature[1] for signature in entry['files'].values())
+
+    def select(self, file_paths, wanted):
+        """
+        Skip the directories whose summary rules out every character
+
+        Files are grouped by directory, in the order they are searched. The
+        files of a directory are only passed on if the directory's summary is
+        out of date or wanted accepts it. Out of date directories are
+        summarized again from the characters passed to record().
+
+        Args:
+            file_paths (iter): Paths of character files, with the files of each
+                directory next to each other
+            wanted (callable): Function that takes a summary and returns
+                whether any of its characters could be wanted. A summary is a
+                dict of tag names to lists of casefolded values, or to None
+                when the values are unknown.
+
+        Yields:
+            Path strings for the files that need to be parsed
+        """
+        for dir_path, group in itertools.groupby(file_paths, key=path.dirname):
+            group = list(group)
+            key = path.abspath(dir_path)
+            files = _signatures(group)
+
+            self._seen.add(key)
+            entry = self.entries.get(key)
+            if entry is not None and entry['files'] == files:
+                self.hits += 1
+                if not wanted(entry['tags']):
+                    self.pruned += len(group)
+                    continue
+            else:
+                self.misses += 1
+                self._pending[key] = {'files': files, 'tags': {}, 'remaining': set(files)}
+
+            yield from group
+
+    def current(self, dir_path, file_paths):
+        """
+        Get the saved summary of a directory, if it is up to date
+
+        Args:
+            dir_path (str): Path of the directory
+            file_paths (list): Paths of every character file in the directory
+
+        Returns:
+            Summary dict, as passed to the wanted function of select(), or None
+            if the directory has no saved summary or its files have changed
+        """
+        entry = self.entries.get(path.abspath(dir_path))
+        if entry is None or entry['files'] != _signatures(file_paths):
+            return None
+        return entry['tags']
+
+    def needs(self, character) -> bool:
+        """
+        Determine whether a character is needed to summarize its directory
+
+        Args:
+            character (Character): Character that was parsed
+
+        Returns:
+            True if record() should be called with the character
+        """
+        pending = self._pending.get(path.abspath(path.dirname(character.path)))
+        return pending is not None and path.basename(character.path) in pending['remaining']
+
+    def record(self, character):
+        """
+        Add a character to the summary of its directory
+
+        The summary replaces the saved one once every file in the directory
+        has been recorded.
+
+        Args:
+            character (Character): Character built with every tag
+        """
+        key = path.abspath(path.dirname(character.path))
+        pending = self._pending.get(key)
+        if pending is None:
+            return
+
+        summary = pending['tags']
+        for tag_name, values in tag_values(character).items():
+            if tag_name in UNSUMMARIZED_TAGS:
+                summary[tag_name] = None
+                continue
+            known = summary.setdefault(tag_name, set())
+            if known is None:
+                continue
+            known.update(values)
+            if len(known) > MAX_VALUES:
+                summary[tag_name] = None
+
+        pending['remaining'].discard(path.basename(character.path))
+        if not pending['remaining']:
+            del self._pending[key]
+            self.entries[key] = {
+                'files': pending['files'],
+                'tags': {tag: sorted(values) if values is not None else None for tag, values in summary.items()},
+            }
+            self._dirty = True
+
+def _signatures(file_paths):
+    """
+    Get the size and modification time of some files
+
+    Args:
+        file_paths (list): Paths of the files
+
+    Returns:
+        Dict of file names to lists of their size and mtime in nanoseconds
+    """
+    files = {}
+    for file_path in file_paths:
+        stat_result = os.stat(file_path)
+        files[path.basename(file_path)] = [stat_result.st_size, stat_result.st_mtime_ns]
+    return files
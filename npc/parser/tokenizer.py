@@ -0,0 +1,206 @@
+"""
+Bytes-level scanner for character file headers
+
+Character files are read in bulk and scanned as bytes. Only lines that start
+with `@` or `--` can be tags or section markers, so the boundary between the
+header and the first section is found with one search of the buffer, and only
+the header before it is copied and decoded. Every other line is description text and is
+never run through a regex.
+
+The records are identical to the ones made by core.scan_lines, which reads the
+file line by line in text mode. That function is still used for encodings that
+this scanner cannot handle.
+"""
+
+import io
+import re
+from functools import lru_cache
+
+SECTION_LINE_RE = re.compile(r'--.+--\s*$')
+"""
+re: matches a section marker line with its line ending removed. Same result
+as core.SECTION_RE on the line with its ending.
+"""
+
+TAG_LINE_RE = re.compile(r'@(?P<tag>#\w+|\w+)(?:\s+(?P<value>.*))?$')
+"""
+re: matches a tag line with its line ending removed. When the value group is
+missing, the line only matches core.TAG_RE if it had a line ending, which
+counts as the whitespace after the tag.
+"""
+
+READ_SIZE = io.DEFAULT_BUFFER_SIZE
+"""int: number of bytes read from a character file at a time"""
+
+@lru_cache(maxsize=None)
+def default_encoding():
+    """
+    Get the encoding used when opening files in text mode
+
+    Returns:
+        Name of the encoding
+    """
+    return io.TextIOWrapper(io.BytesIO()).encoding
+
+@lru_cache(maxsize=None)
+def ascii_compatible(encoding):
+    """
+    Determine whether the tokenizer can scan bytes in an encoding
+
+    The scan looks for the raw bytes of newlines, dashes, and at signs, so the
+    encoding has to store those characters as their single ASCII bytes.
+
+    Args:
+        encoding (str): Name of the encoding
+
+    Returns:
+        True if the encoding is ASCII compatible, False if not
+    """
+    try:
+        return '\n\r-@'.encode(encoding) == b'\n\r-@'
+    except (LookupError, UnicodeError):
+        return False
+
+def tokenize_file(char_file, encoding='utf-8'):
+    """
+    Turn a character file into records
+
+    The file is read in bulk. Most headers fit in the first block, so the rest
+    of the file is only read when the first block has no section marker.
+
+    Args:
+        char_file (file): File object opened in binary mode
+        encoding (str): Encoding of the file. Must be ascii_compatible.
+
+    Returns:
+        List of `(tag, value)` tuples in file order, exactly as from
+        core.scan_lines.
+    """
+    data = char_file.read(READ_SIZE)
+    lines = universal_newlines(data)
+    start = section_start(lines, encoding, final=len(data) < READ_SIZE)
+    if start is None:
+        lines = universal_newlines(data + char_file.read())
+        start = section_start(lines, encoding)
+
+    return tokenize_header(lines[:start], encoding)
+
+def tokenize(data, encoding='utf-8'):
+    """
+    Turn the contents of a character sheet into records
+
+    Args:
+        data (bytes): Contents of the character file
+        encoding (str): Encoding of the file. Must be ascii_compatible.
+
+    Returns:
+        List of `(tag, value)` tuples in file order, exactly as from
+        core.scan_lines.
+    """
+    lines = universal_newlines(data)
+    return tokenize_header(lines[:section_start(lines, encoding)], encoding)
+
+def universal_newlines(data):
+    """
+    Convert every newline style to `\\n`, same as text mode
+
+    Args:
+        data (bytes): Bytes to convert
+
+    Returns:
+        Converted bytes
+    """
+    if b'\r' not in data:
+        return data
+    return data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+def tokenize_header(header, encoding='utf-8'):
+    """
+    Turn the header of a character sheet into records
+
+    Args:
+        header (bytes): Contents of the character file before the first
+            section marker, with newlines converted by universal_newlines
+        encoding (str): Encoding of the file. Must be ascii_compatible.
+
+    Returns:
+        List of `(tag, value)` tuples in file order, exactly as from
+        core.scan_lines.
+    """
+    lines = header.decode(encoding).split('\n')
+    # whatever follows the last newline is an unterminated line, or empty
+    last_line = lines.pop()
+
+    records = []
+    append = records.append
+    for line in lines:
+        if line[:1] == '@':
+            match = TAG_LINE_RE.match(line)
+            if match:
+                tag = match.group('tag').lower()
+                if tag[0] != '#':
+                    append((tag, match.group('value') or ''))
+                continue
+
+        text = line.strip()
+        if text:
+            append((None, text))
+
+    if last_line[:1] == '@':
+        match = TAG_LINE_RE.match(last_line)
+        if match and match.group('value') is not None:
+            tag = match.group('tag').lower()
+            if tag[0] != '#':
+                append((tag, match.group('value')))
+            return records
+
+    text = last_line.strip()
+    if text:
+        append((None, text))
+
+    return records
+
+def section_start(data, encoding='utf-8', final=True):
+    """
+    Find where the first section of a character sheet begins
+
+    Args:
+        data (bytes): Contents of the character file, or the first part of
+            them, with newlines converted by universal_newlines
+        encoding (str): Encoding of the file. Must be ascii_compatible.
+        final (bool): Whether data is the whole rest of the file. When False,
+            the section may be in a part that has not been read yet.
+
+    Returns:
+        Offset of the first section marker line. When there is no section, the
+        length of data, or None if data is not final.
+    """
+    start = 0 if data.startswith(b'--') else _next_dash_line(data, 0)
+    while start >= 0:
+        end = data.find(b'\n', start)
+        if end < 0:
+            if not final:
+                # the rest of the line has not been read
+                return None
+            end = len(data)
+        if SECTION_LINE_RE.match(data[start:end].decode(encoding)):
+            return start
+        start = _next_dash_line(data, end)
+
+    return len(data) if final else None
+
+def _next_dash_line(data, position):
+    """
+    Find the next line that starts with two dashes
+
+    Args:
+        data (bytes): Bytes to search, with `\\n` newlines
+        position (int): Offset to start searching at
+
+    Returns:
+        Offset of the start of the line, or -1 if there is none
+    """
+    found = data.find(b'\n--', position)
+    if found < 0:
+        return -1
+    return found + 1
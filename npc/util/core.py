@@ -2,13 +2,14 @@
 Helper functions shared between the other modules
 """
 
+import io
 import re
 import json
 import sys
 import subprocess
 import yaml
 from . import errors
-from os import getcwd
+from os import getcwd, path
 from pathlib import Path
 
 def load_settings(file_path):
@@ -144,6 +145,75 @@ def flatten(thing):
         else:
             yield item
 
+class ListedPath(str):
+    """
+    Path that came from a list of paths instead of from the command line
+
+    Listed files are checked like the files found by walking a directory:
+    their extension has to be recognized, ignore rules apply, and files that
+    do not exist are skipped. Paths named on the command line are used as-is.
+    """
+    __slots__ = ()
+
+def read_path_list(stream, base=None):
+    """
+    Read a list of paths, like the output of `git diff --name-only`
+
+    Paths can be separated by newlines or by NUL characters, as from
+    `git diff --name-only -z`. The first block of the list decides which: if it
+    has a NUL, the list is split on NULs. Carriage returns before a newline
+    are dropped, and blank entries are skipped.
+
+    The list is read a block at a time as the paths are used, so parsing can
+    start before the whole list has arrived.
+
+    Args:
+        stream (file): Text stream holding the list
+        base (str|None): Directory the listed paths are relative to. When
+            given, the paths are converted to be relative to the current
+            directory instead.
+
+    Yields:
+        ListedPath strings in list order
+    """
+    separator = None
+    pending = ''
+    while True:
+        block = stream.read(io.DEFAULT_BUFFER_SIZE)
+        if separator is None:
+            separator = '\0' if '\0' in block else '\n'
+
+        entries = (pending + block).split(separator)
+        pending = entries.pop() if block else ''
+        for entry in entries:
+            if separator == '\n':
+                entry = entry.rstrip('\r')
+            if entry:
+                yield ListedPath(_rebase_path(entry, base))
+
+        if not block:
+            return
+
+def _rebase_path(entry, base):
+    """
+    Make a listed path relative to the current directory
+
+    Args:
+        entry (str): Path from the list
+        base (str|None): Directory the path is relative to
+
+    Returns:
+        Path string. Unchanged when base is None. Absolute when the path is on
+        a different drive than the current directory.
+    """
+    if base is None:
+        return entry
+    full_path = path.join(base, entry)
+    try:
+        return path.relpath(full_path)
+    except ValueError:
+        return full_path
+
 def merge_to_dict(target_dict: dict, key: str, value):
     """
     Merge a key and value into an existing dict
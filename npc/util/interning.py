@@ -0,0 +1,117 @@
+"""
+Share one string object between equal tag values
+
+Values like a character's type, court, or group repeat across a whole
+campaign, but every parsed line makes a new string for them. Passing them
+through a ValuePool leaves one object per distinct value, which saves memory
+and lets equality checks stop at the identity test.
+
+The module-level functions use one pool for the whole process, which in
+practice means one pool per campaign. It holds at most MAX_POOLED strings, so
+long-running processes that parse again and again do not keep every value
+they ever saw. They can also clear it once a batch of characters is built.
+"""
+
+MAX_POOLED = 65536
+"""int: most strings the shared pool holds"""
+
+class ValuePool:
+    """
+    Dictionary of the distinct strings seen so far, and their casefolded forms
+    """
+    def __init__(self, limit=None):
+        """
+        Create an empty pool
+
+        Args:
+            limit (int|None): Most strings to hold. Once the pool is full, new
+                strings are passed through without being added. None holds
+                any number.
+        """
+        self.limit = limit
+        self._values = {}
+        self._folded = {}
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, value):
+        return value in self._values
+
+    def intern(self, value: str) -> str:
+        """
+        Get the pooled copy of a string
+
+        Args:
+            value (str): String to look up
+
+        Returns:
+            The first string equal to value that was passed to this pool.
+            Value itself is added to the pool if there was none and the pool
+            is not full.
+        """
+        pooled = self._values.get(value)
+        if pooled is not None:
+            return pooled
+        if self.limit is not None and len(self._values) >= self.limit:
+            return value
+        self._values[value] = value
+        return value
+
+    def folded(self, value: str) -> str:
+        """
+        Get the casefolded form of a string
+
+        The folded form is only kept for strings in the pool, so values that
+        are not pooled are folded every time.
+
+        Args:
+            value (str): String to fold
+
+        Returns:
+            Casefolded string
+        """
+        folded = self._folded.get(value)
+        if folded is not None:
+            return folded
+
+        folded = value.casefold()
+        if value in self._values:
+            folded = self._folded[value] = self.intern(folded)
+        return folded
+
+    def clear(self):
+        """
+        Forget every pooled string
+
+        Strings already handed out stay shared by the objects holding them.
+        """
+        self._values.clear()
+        self._folded.clear()
+
+values = ValuePool(MAX_POOLED)
+"""ValuePool: pool used by intern() and folded()"""
+
+def intern(value: str) -> str:
+    """
+    Get the pooled copy of a string from the shared pool
+
+    Args:
+        value (str): String to look up
+
+    Returns:
+        Pooled string equal to value
+    """
+    return values.intern(value)
+
+def folded(value: str) -> str:
+    """
+    Get the casefolded form of a string, using the shared pool
+
+    Args:
+        value (str): String to fold
+
+    Returns:
+        Casefolded string
+    """
+    return values.folded(value)
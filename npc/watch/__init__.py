@@ -0,0 +1,10 @@
+"""
+Package for keeping a campaign's characters parsed in a long-running process
+
+The watch command serves a CampaignIndex. Other commands ask it for characters
+through the client module, and parse files themselves when no server is
+running.
+"""
+
+from .core import *
+from . import client, monitor
@@ -0,0 +1,153 @@
+"""
+Ask a running watch server about the campaign's characters
+
+Every function here returns None when there is no server to ask, or when the
+server cannot answer. Callers should then do the work themselves.
+"""
+
+import json
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+from os import path
+
+from .core import address_file
+
+def characters(prefs, search, ignore):
+    """
+    Get the characters that a search would find
+
+    Args:
+        prefs (Settings): Settings object to use
+        search (list): Paths to search for character files
+        ignore (list): Paths to ignore
+
+    Returns:
+        List of Character objects, or None if the server cannot answer
+    """
+    response = _request(prefs, {
+        'command': 'query',
+        'search': _absolute(search),
+        'ignore': _absolute(ignore),
+    })
+    if response is None or response.get('status') != 'ok':
+        return None
+
+    found = response['characters']
+    for character in found:
+        character.path = _as_found(character.path, search)
+    return found
+
+def find(prefs, search, ignore, rules):
+    """
+    Get the paths of the characters that match some find rules
+
+    The rules are checked by the server, so only the paths are sent back.
+
+    Args:
+        prefs (Settings): Settings object to use
+        search (list): Paths to search for character files
+        ignore (list): Paths to ignore
+        rules (list): Rule strings, as for commands.find_characters
+
+    Returns:
+        List of path strings, or None if the server cannot answer
+    """
+    response = _request(prefs, {
+        'command': 'query',
+        'search': _absolute(search),
+        'ignore': _absolute(ignore),
+        'rules': list(rules),
+    })
+    if response is None or response.get('status') != 'ok':
+        return None
+
+    return [_as_found(file_path, search) for file_path in response['paths']]
+
+def status(prefs):
+    """
+    Get the state of the server
+
+    Args:
+        prefs (Settings): Settings object to use
+
+    Returns:
+        Dict with the number of indexed `characters` and the number of files
+        `parsed` since the server started, or None if no server is running
+    """
+    return _request(prefs, {'command': 'status'})
+
+def stop(prefs):
+    """
+    Tell the server to stop
+
+    Args:
+        prefs (Settings): Settings object to use
+
+    Returns:
+        True if the server was told to stop, False if no server is running
+    """
+    return _request(prefs, {'command': 'stop'}) is not None
+
+def _request(prefs, request):
+    """
+    Send a request to the server and wait for its response
+
+    Args:
+        prefs (Settings): Settings object to use
+        request (dict): Request to send
+
+    Returns:
+        Response dict, or None if the server could not be reached
+    """
+    try:
+        with open(str(address_file(prefs)), 'r') as address_in:
+            details = json.load(address_in)
+        address = details['address']
+        if isinstance(address, list):
+            address = tuple(address)
+        authkey = bytes.fromhex(details['authkey'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    try:
+        with Client(address, authkey=authkey) as conn:
+            conn.send(request)
+            return conn.recv()
+    except (OSError, EOFError, AuthenticationError):
+        return None
+
+def _absolute(paths):
+    """
+    Make paths absolute, the way the server stores them
+
+    Args:
+        paths (iter): Path strings
+
+    Returns:
+        List of absolute path strings
+    """
+    return [path.abspath(p) for p in paths]
+
+def _as_found(file_path, search):
+    """
+    Write a path from the server the way searching from the search paths would
+
+    A search joins the names it finds onto the search path it started from, so
+    a search of `.` finds `./Bob.nwod` and a search of `Characters` finds
+    `Characters/Bob.nwod`.
+
+    Args:
+        file_path (str): Absolute path string
+        search (list): Paths to search for character files, as they were given
+
+    Returns:
+        Path string under the first search path that holds it, or file_path if
+        none of them do
+    """
+    for search_path in search:
+        relative = path.relpath(file_path, path.abspath(search_path))
+        if relative == path.curdir:
+            return search_path
+        if relative != path.pardir and not relative.startswith(path.pardir + path.sep):
+            return path.join(search_path, relative)
+    return file_path
@@ -0,0 +1,458 @@
+"""
+Keep a campaign's characters parsed in memory and answer queries about them
+
+The CampaignIndex holds every parsed character along with the size and mtime
+of its file. When a monitor reports a change, only the affected directories
+are listed again, and only the files that changed are parsed again.
+
+serve() runs the index behind a multiprocessing listener, so other processes
+can ask for characters without parsing anything. The listener's address and
+key are written to `watch.json` in the campaign settings directory, where
+the client module finds them.
+"""
+
+import json
+import os
+import threading
+from multiprocessing.connection import Listener
+from os import path
+
+from npc import character, parser
+from npc.util import interning
+
+from . import monitor
+
+ADDRESS_FILE_NAME = 'watch.json'
+"""str: name of the file holding the server address, within the campaign
+settings directory"""
+
+def address_file(prefs):
+    """
+    Get the path of the address file for the current campaign
+
+    Args:
+        prefs (Settings): Settings object to use
+
+    Returns:
+        Path object
+    """
+    return prefs.campaign_settings_path.joinpath(ADDRESS_FILE_NAME)
+
+def _within(file_path, roots):
+    """
+    Determine whether a path is one of some roots or inside one
+
+    Args:
+        file_path (str): Absolute path to check
+        roots (iter): Absolute paths
+
+    Returns:
+        True if file_path is within a root, False if not
+    """
+    for root in roots:
+        if file_path == root or file_path.startswith(root.rstrip(os.sep) + os.sep):
+            return True
+    return False
+
+class CampaignIndex:
+    """
+    Parsed characters for a set of search paths, kept up to date on request
+    """
+    def __init__(self, search_paths, ignore_paths=None, *, ignore_patterns=None, cache=None):
+        """
+        Create an empty index
+
+        Call sync() to fill it.
+
+        Args:
+            search_paths (list): Paths to search for character files
+            ignore_paths (list|None): Paths to exclude from the search
+            ignore_patterns (list|None): Gitignore-style patterns to exclude
+                from the search, relative to the campaign root
+            cache (ParseCache|None): Cache of previously parsed files. Files
+                are parsed through it, and it is saved after each sync that
+                parsed anything.
+        """
+        self.search_paths = [path.abspath(p) for p in search_paths]
+        self.ignore_paths = [path.abspath(p) for p in ignore_paths or []]
+        self.ignore_patterns = ignore_patterns
+        self.cache = cache
+
+        self.parsed = 0
+        self._entries = {}
+        self._order = []
+        self._table = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def characters(self):
+        """
+        Get every indexed character
+
+        Returns:
+            List of Character objects, in the order a search of the indexed
+            paths finds them
+        """
+        return [self._entries[key][1] for key in self._ordered_keys()]
+
+    def _ordered_keys(self):
+        """
+        Get the keys of the indexed characters in search order
+
+        New files can turn up anywhere in the search, so when any were added
+        since the order was last worked out, the indexed paths are listed
+        again. Nothing is parsed to do that.
+
+        Returns:
+            List of absolute path strings
+        """
+        if self._order is None:
+            order = []
+            for root in self.search_paths:
+                order.extend(self._list(root))
+            self._order = _unique(order)
+        return [key for key in self._order if key in self._entries]
+
+    def _list(self, root):
+        """
+        List the character files under one indexed path
+
+        Args:
+            root (str): Absolute path to list
+
+        Returns:
+            List of absolute path strings, in search order
+        """
+        if not path.exists(root):
+            return []
+        return [path.abspath(file_path) for file_path in parser.character_files([root], self.ignore_paths, ignore_patterns=self.ignore_patterns)]
+
+    def table(self):
+        """
+        Get a columnar table of every indexed character
+
+        The table is built the first time it is needed after the index
+        changes, and reused until the next change.
+
+        Returns:
+            CharacterTable object, with rows in the same order as
+            characters()
+        """
+        if self._table is None:
+            self._table = character.table.CharacterTable(self.characters())
+        return self._table
+
+    def sync(self, dirs=None):
+        """
+        Bring the index up to date
+
+        The shared pool of tag values is cleared after anything is parsed, so
+        a long-running index does not keep values that are no longer used.
+
+        Args:
+            dirs (iter|None): Directories whose contents may have changed.
+                Their whole subtrees are checked. None checks everything.
+
+        Returns:
+            Number of files that were parsed
+        """
+        if dirs is None:
+            roots = self.search_paths
+        else:
+            roots = {path.abspath(d) for d in dirs}
+            roots = [d for d in roots if _within(d, self.search_paths) and not _within(d, roots - {d})]
+
+        parsed = 0
+        found = []
+        for root in roots:
+            for key in self._list(root):
+                if key not in self._entries:
+                    self._order = None
+                found.append(key)
+                if self._refresh(key):
+                    parsed += 1
+
+        if dirs is None:
+            # a full sync lists everything in search order
+            self._order = _unique(found)
+
+        found = set(found)
+        removed = 0
+        for key in list(self._entries):
+            if key not in found and _within(key, roots):
+                del self._entries[key]
+                removed += 1
+
+        if parsed or removed:
+            self._table = None
+        if parsed:
+            # the indexed characters keep their shared values, so the pool
+            # does not need to hold them between syncs
+            interning.values.clear()
+            if self.cache is not None:
+                self.cache.save()
+        self.parsed += parsed
+        return parsed
+
+    def _refresh(self, key):
+        """
+        Parse a file again if it changed
+
+        Args:
+            key (str): Absolute path of the character file
+
+        Returns:
+            True if the file was parsed, False if its entry was current
+        """
+        try:
+            stat_result = os.stat(key)
+        except OSError:
+            if self._entries.pop(key, None) is not None:
+                self._table = None
+            return False
+
+        signature = (stat_result.st_size, stat_result.st_mtime_ns)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return False
+
+        self._entries[key] = (signature, parser.parse_character(key, cache=self.cache))
+        return True
+
+    def covers(self, search_paths, ignore_paths):
+        """
+        Determine whether a search can be answered from this index
+
+        Every search path has to be inside the indexed paths, and every path
+        the index ignores has to be ignored by the search as well.
+
+        Args:
+            search_paths (list): Absolute paths of the search
+            ignore_paths (list): Absolute paths the search ignores
+
+        Returns:
+            True if the search would find a subset of the indexed characters
+        """
+        if not search_paths:
+            return False
+        if not all(_within(p, self.search_paths) for p in search_paths):
+            return False
+        return all(_within(p, ignore_paths) for p in self.ignore_paths)
+
+    def select(self, search_paths, ignore_paths):
+        """
+        Get the indexed characters that a search would find
+
+        Args:
+            search_paths (list): Absolute paths of the search
+            ignore_paths (list): Absolute paths the search ignores
+
+        Returns:
+            List of Character objects, in the order the search would find
+            them. The characters under each search path come in turn, and a
+            character is only included once.
+        """
+        return [self._entries[key][1] for key in _search_order(self._ordered_keys(), search_paths, ignore_paths)]
+
+def _unique(keys):
+    """
+    Drop repeated paths, keeping the first of each
+
+    Args:
+        keys (list): Path strings
+
+    Returns:
+        List of path strings
+    """
+    seen = set()
+    unique = []
+    for key in keys:
+        if key not in seen:
+            seen.add(key)
+            unique.append(key)
+    return unique
+
+def _search_order(keys, search_paths, ignore_paths):
+    """
+    Put paths in the order a search would find them
+
+    Args:
+        keys (list): Absolute paths in the order a search of the indexed paths
+            finds them
+        search_paths (list): Absolute paths of the search
+        ignore_paths (list): Absolute paths the search ignores
+
+    Returns:
+        List of the paths within search_paths and not within ignore_paths.
+        The paths within each search path come in turn, in their order from
+        keys.
+    """
+    keys = [key for key in keys if not _within(key, ignore_paths)]
+    if len(search_paths) == 1:
+        return [key for key in keys if _within(key, search_paths)]
+
+    ordered = []
+    for search_path in search_paths:
+        ordered.extend(key for key in keys if _within(key, [search_path]))
+    return _unique(ordered)
+
+def serve(index, prefs, *, find=None, poll=False, interval=1.0, ready=None):
+    """
+    Answer queries about an index until told to stop
+
+    A background thread waits on a monitor and syncs the index as files
+    change. Queries are answered one at a time, and always see a consistent
+    index.
+
+    Requests are dicts with a `command` key:
+
+    * `query`: takes `search` and `ignore` lists of absolute paths, and
+      optionally a list of find `rules`. Answers with the matching `paths`
+      when rules are given, or all the `characters` otherwise. Answers with
+      the status `unsupported` if the index does not cover the search.
+    * `status`: answers with the number of indexed and parsed characters
+    * `stop`: stops the server
+
+    Args:
+        index (CampaignIndex): Index to serve. It is synced before the server
+            starts listening.
+        prefs (Settings): Settings object to use
+        find (callable|None): Function that takes rules and a CharacterTable
+            and returns the matching paths, like commands.find_in_table.
+            Queries with rules are unsupported without it.
+        poll (bool): Whether to poll for changes even if inotify is available
+        interval (float): Seconds between checks when polling
+        ready (callable|None): Function to call once the server is listening.
+            It gets the monitor in use.
+    """
+    lock = threading.Lock()
+    index.sync()
+    watcher = monitor.make_monitor(index.search_paths, poll=poll, interval=interval)
+    stopping = threading.Event()
+
+    def keep_current():
+        while not stopping.is_set():
+            changed = watcher.wait(0.5)
+            if changed == set():
+                continue
+            with lock:
+                index.sync(changed)
+
+    authkey = os.urandom(32)
+    with _listen(prefs, authkey) as listener:
+        _write_address(prefs, listener.address, authkey)
+        thread = threading.Thread(target=keep_current, daemon=True)
+        thread.start()
+        if ready is not None:
+            ready(watcher)
+
+        try:
+            while not stopping.is_set():
+                try:
+                    conn = listener.accept()
+                except OSError:
+                    continue
+                with conn:
+                    try:
+                        request = conn.recv()
+                    except (EOFError, OSError):
+                        continue
+                    with lock:
+                        response = _answer(index, request, find)
+                    if request.get('command') == 'stop':
+                        stopping.set()
+                    try:
+                        conn.send(response)
+                    except OSError:
+                        pass
+        finally:
+            stopping.set()
+            thread.join()
+            watcher.close()
+            try:
+                os.remove(str(address_file(prefs)))
+            except OSError:
+                pass
+
+def _listen(prefs, authkey):
+    """
+    Open a listener for clients
+
+    A Unix socket next to the address file is used where possible. Otherwise,
+    or if the socket path is too long, a local TCP port is used.
+
+    Args:
+        prefs (Settings): Settings object to use
+        authkey (bytes): Key clients must use
+
+    Returns:
+        Listener object
+    """
+    socket_path = str(address_file(prefs).with_suffix('.sock'))
+    if hasattr(os, 'fork'):
+        if path.exists(socket_path):
+            os.remove(socket_path)
+        try:
+            return Listener(socket_path, family='AF_UNIX', authkey=authkey)
+        except OSError:
+            pass
+    return Listener(('localhost', 0), family='AF_INET', authkey=authkey)
+
+def _answer(index, request, find):
+    """
+    Work out the response to a request
+
+    Args:
+        index (CampaignIndex): Index to answer from
+        request (dict): Request from a client
+        find (callable|None): Function that finds paths in a CharacterTable
+            by find rules
+
+    Returns:
+        Response dict with a `status` key
+    """
+    command = request.get('command')
+    if command == 'status':
+        return {'status': 'ok', 'characters': len(index), 'parsed': index.parsed}
+    if command == 'stop':
+        return {'status': 'ok'}
+    if command != 'query':
+        return {'status': 'error', 'message': "Unknown command '{}'".format(command)}
+
+    search = request.get('search', [])
+    ignore = request.get('ignore', [])
+    rules = request.get('rules')
+    if not index.covers(search, ignore) or (rules is not None and find is None):
+        return {'status': 'unsupported'}
+
+    if rules is None:
+        return {'status': 'ok', 'characters': index.select(search, ignore)}
+
+    paths = [
+        char_path for char_path in find(rules, index.table())
+        if _within(path.abspath(char_path), search) and not _within(path.abspath(char_path), ignore)
+    ]
+    return {'status': 'ok', 'paths': paths}
+
+def _write_address(prefs, address, authkey):
+    """
+    Save the server address where clients can find it
+
+    The file holds the authentication key, so only the owner can read it.
+
+    Args:
+        prefs (Settings): Settings object to use
+        address (str|tuple): Listener address. A string is a Unix socket, and a
+            tuple is a host and port.
+        authkey (bytes): Key clients must use
+    """
+    file_path = str(address_file(prefs))
+    data = {
+        'pid': os.getpid(),
+        'address': address,
+        'authkey': authkey.hex(),
+    }
+    descriptor = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, 'w') as address_out:
+        json.dump(data, address_out)
@@ -0,0 +1,264 @@
+"""
+Notice changes to the files under a set of directories
+
+The InotifyMonitor asks Linux to report changes as they happen, through the
+inotify calls in libc. Everywhere else, and whenever inotify cannot be set up,
+the PollingMonitor rechecks everything on a timer instead.
+
+Both monitors have the same interface: wait() blocks until something changes
+and reports what needs to be looked at again.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from os import path
+
+from npc import parser
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+"""int: inotify events that can change which characters exist or what they hold"""
+
+EVENT_HEADER = struct.Struct('iIII')
+"""Struct: layout of the fixed part of an inotify_event"""
+
+SETTLE_TIME = 0.05
+"""float: seconds to keep collecting events after the first one, so a burst of
+writes is handled at once"""
+
+def make_monitor(roots, *, poll=False, interval=1.0):
+    """
+    Create the best available monitor
+
+    Args:
+        roots (list): Directories to watch, along with everything below them
+        poll (bool): Whether to poll even when inotify is available
+        interval (float): Seconds between checks when polling
+
+    Returns:
+        InotifyMonitor or PollingMonitor object
+    """
+    if not poll:
+        try:
+            return InotifyMonitor(roots)
+        except OSError:
+            pass
+    return PollingMonitor(interval)
+
+def _is_dir(entry):
+    """
+    Determine whether a directory entry is a directory, following symlinks
+
+    Args:
+        entry (os.DirEntry): Entry to check
+
+    Returns:
+        True if the entry is a directory, False if not or if it cannot be
+        checked
+    """
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+class PollingMonitor:
+    """
+    Report that everything may have changed, once per interval
+    """
+    def __init__(self, interval=1.0):
+        """
+        Create a polling monitor
+
+        Args:
+            interval (float): Seconds between checks
+        """
+        self.interval = interval
+        self._next = time.monotonic()
+
+    def wait(self, timeout=None):
+        """
+        Wait for the next check
+
+        Args:
+            timeout (float|None): Most seconds to wait. None waits until the
+                next check is due.
+
+        Returns:
+            None when it is time to check everything, or an empty set if the
+            timeout ran out first
+        """
+        delay = self._next - time.monotonic()
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            return set()
+
+        if delay > 0:
+            time.sleep(delay)
+        self._next = time.monotonic() + self.interval
+        return None
+
+    def close(self):
+        """
+        Release any resources. Polling holds none.
+        """
+        pass
+
+class InotifyMonitor:
+    """
+    Report the directories whose contents changed, using inotify
+
+    Every directory under the roots is watched, and new directories are
+    watched as soon as they appear.
+    """
+    def __init__(self, roots):
+        """
+        Start watching some directories
+
+        Args:
+            roots (list): Directories to watch, along with everything below
+                them
+
+        Raises:
+            OSError: inotify is not available
+        """
+        library = ctypes.util.find_library('c')
+        if library is None:
+            raise OSError(errno.ENOSYS, "libc not found")
+        self._libc = ctypes.CDLL(library, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        self._watches = {}
+        for root in roots:
+            self._watch_tree(root)
+
+    def _watch_tree(self, root):
+        """
+        Watch a directory and every directory below it
+
+        Symlinks to directories are followed, but each directory is only
+        watched once, so symlink loops end. Directories that cannot be
+        watched, like those that vanish while being listed, are skipped.
+
+        Args:
+            root (str): Directory to start at
+        """
+        visited = parser.Visited()
+        pending = [root]
+        while pending:
+            dir_path = pending.pop()
+            try:
+                if not visited.first_visit(os.stat(dir_path), dir_path):
+                    continue
+                entries = list(os.scandir(dir_path))
+            except OSError:
+                continue
+
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), WATCH_MASK)
+            if wd >= 0:
+                self._watches[wd] = dir_path
+            pending.extend(entry.path for entry in entries if _is_dir(entry))
+
+    def wait(self, timeout=None):
+        """
+        Wait for changes
+
+        Args:
+            timeout (float|None): Most seconds to wait. None waits forever.
+
+        Returns:
+            Set of the directory paths whose contents changed, or None if
+            events were lost and everything must be checked. The set is empty
+            if the timeout ran out first.
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        deadline = time.monotonic() + SETTLE_TIME
+        while True:
+            if not self._read_events(changed):
+                return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                break
+        return changed
+
+    def _read_events(self, changed):
+        """
+        Read all pending events
+
+        Args:
+            changed (set): Set to add changed directory paths to
+
+        Returns:
+            False if the event queue overflowed, True otherwise
+        """
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return True
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + name_len].rstrip(b'\0'))
+                offset += name_len
+
+                if mask & IN_Q_OVERFLOW:
+                    return False
+
+                dir_path = self._watches.get(wd)
+                if dir_path is None:
+                    continue
+
+                if mask & IN_IGNORED:
+                    del self._watches[wd]
+                    continue
+
+                changed.add(dir_path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    new_dir = path.join(dir_path, name)
+                    self._watch_tree(new_dir)
+                    changed.add(new_dir)
+
+    def close(self):
+        """
+        Stop watching
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
@@ -58,6 +58,9 @@ setup(
         "test": [
             "pytest>=3.9.1",
             "pytest-qt>=2.1.0"
+        ],
+        "numpy": [
+            "numpy>=1.11"
         ]
     },
     package_data={
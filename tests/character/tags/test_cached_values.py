@@ -0,0 +1,88 @@
+"""
+Test that values worked out from a tag are forgotten when it changes
+"""
+
+import pytest
+from npc.character.tags import Tag, Flag
+
+@pytest.mark.parametrize('change', [
+    lambda tag: tag.append('Chief'),
+    lambda tag: tag.update(['Chief']),
+    lambda tag: tag.extend(['Chief']),
+    lambda tag: tag.insert(0, 'Chief'),
+    lambda tag: tag.__setitem__(0, 'Chief'),
+    lambda tag: setattr(tag, 'data', ['Chief']),
+])
+def test_filling_changes_are_seen(change):
+    tag = Tag('title', ' ')
+    assert not tag.filled
+
+    change(tag)
+
+    assert tag.filled
+    assert 'Chief' in tag.filled_data
+
+@pytest.mark.parametrize('change', [
+    lambda tag: tag.clear(),
+    lambda tag: tag.pop(),
+    lambda tag: tag.remove('Boss'),
+    lambda tag: tag.__delitem__(0),
+    lambda tag: tag.update([]),
+])
+def test_emptying_changes_are_seen(change):
+    tag = Tag('title', 'Boss')
+    assert tag.filled
+
+    change(tag)
+
+    assert not tag.filled
+    assert tag.filled_data == []
+
+def test_sanitize_is_seen():
+    tag = Tag('title', 'Boss')
+    tag.hide_value('Boss')
+    assert tag.filled
+
+    tag.sanitize()
+
+    assert not tag.filled
+
+def test_flag_clear_is_seen():
+    flag = Flag('dead', 'Yes')
+    assert flag.present
+
+    flag.clear()
+
+    assert not flag.present
+
+def test_filled_data_skips_blanks():
+    tag = Tag('title', 'Boss', '  ', 'Chief')
+
+    assert tag.filled_data == ['Boss', 'Chief']
+
+def test_revision_counts_changes():
+    tag = Tag('title')
+    start = tag.revision
+
+    tag.append('Boss')
+    tag.clear()
+
+    assert tag.revision == start + 2
+
+def test_copies_do_not_share_cached_values():
+    tag = Tag('title', 'Boss')
+    assert tag.filled
+    sliced = tag[1:]
+
+    assert not sliced.filled
+    assert tag.filled
+
+def test_updated_tags_do_not_share_values():
+    source = Tag('title', 'Boss')
+    tag = Tag('title')
+    tag.update(source)
+    assert tag.filled_data == ['Boss']
+
+    source.append('Chief')
+
+    assert tag.filled_data == ['Boss']
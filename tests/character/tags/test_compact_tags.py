@@ -0,0 +1,105 @@
+"""
+Test the compact storage of tag objects
+"""
+
+import pickle
+from copy import copy
+import pytest
+from npc.character.tags import Tag, Flag, GroupTag, SubTag, UnknownTag, DescriptionTag
+
+@pytest.mark.parametrize('klass, args', [
+    (Tag, ('title',)),
+    (Flag, ('dead',)),
+    (GroupTag, ('group',)),
+    (SubTag, ('rank',)),
+    (UnknownTag, ('whatever',)),
+    (DescriptionTag, ()),
+])
+def test_no_instance_dict(klass, args):
+    tag = klass(*args)
+
+    assert not hasattr(tag, '__dict__')
+
+class TestSharedEmptyLists:
+    def test_fresh_tags_share_hidden_values(self):
+        assert Tag('title')._hidden_values is Tag('name')._hidden_values
+
+    def test_hiding_does_not_touch_other_tags(self):
+        tag = Tag('title', 'Boss')
+        other = Tag('name')
+
+        tag.hide_value('Boss')
+
+        assert tag.hidden_values == ['Boss']
+        assert other.hidden_values == []
+
+    def test_valid_tags_keep_shared_problems(self):
+        tag = Tag('title', 'Boss', required=True)
+
+        tag.validate()
+
+        assert tag._problems is Tag('name')._problems
+
+    def test_problems_are_kept(self):
+        tag = Tag('title', required=True)
+
+        tag.validate()
+
+        assert tag.problems == ["No values for tag 'title'"]
+
+class TestListBehavior:
+    def test_equals_list(self):
+        assert Tag('title', 'Boss', 'Chief') == ['Boss', 'Chief']
+
+    def test_equals_tag(self):
+        assert Tag('title', 'Boss') == Tag('name', 'Boss')
+
+    def test_slice_is_tag(self):
+        sliced = Tag('title', 'Boss', 'Chief')[1:]
+
+        assert sliced.name == 'title'
+        assert sliced == ['Chief']
+
+    def test_extend(self):
+        tag = Tag('title', 'Boss')
+
+        tag.extend(Tag('title', 'Chief'))
+
+        assert tag == ['Boss', 'Chief']
+
+    def test_copy_has_own_data(self):
+        tag = Flag('dead', 'Yes')
+        tag.touch()
+        duplicate = copy(tag)
+        duplicate.append('Twice')
+
+        assert tag == ['Yes']
+        assert duplicate.present
+
+class TestGroupDictBehavior:
+    def test_keys(self):
+        tag = GroupTag('group', 'Bar', 'Club')
+
+        assert list(tag.keys()) == ['Bar', 'Club']
+
+    def test_copy_has_own_data(self):
+        tag = GroupTag('group', 'Bar')
+        duplicate = copy(tag)
+        duplicate.append('Club')
+
+        assert list(tag) == ['Bar']
+
+@pytest.mark.parametrize('tag', [
+    Tag('title', 'Boss', hidden=True),
+    Flag('dead'),
+    GroupTag('group', 'Bar'),
+])
+def test_pickles(tag):
+    tag.hide_value('Boss')
+
+    rebuilt = pickle.loads(pickle.dumps(tag))
+
+    assert type(rebuilt) == type(tag)
+    assert rebuilt.name == tag.name
+    assert list(rebuilt) == list(tag)
+    assert rebuilt.hidden_values == ['Boss']
@@ -255,6 +255,32 @@ class TestSanitize:
         tag.sanitize()
         assert list(tag) == ['value1', 'value2', 'value3']
 
+class TestSanitized:
+    def test_nothing_hidden_returns_same_tag(self):
+        tag = GroupTag('group', 'value1', 'value2')
+        tag.subtag('value1').append('subvalue')
+        assert tag.sanitized() is tag
+
+    def test_when_hidden_returns_empty_copy(self):
+        tag = GroupTag('group', 'value1', 'value2', hidden=True)
+        assert not tag.sanitized()
+        assert list(tag) == ['value1', 'value2']
+
+    def test_hidden_value_is_left_out_of_copy(self):
+        tag = GroupTag('group', 'value1', 'value2', 'value3')
+        tag.hide_value('value2')
+        assert list(tag.sanitized()) == ['value1', 'value3']
+        assert list(tag) == ['value1', 'value2', 'value3']
+
+    def test_hidden_subtag_is_emptied_in_copy(self):
+        tag = GroupTag('group', 'value1', 'value2')
+        tag.subtag('value1').append('subvalue')
+        tag.subtag('value1').hidden = True
+        clean = tag.sanitized()
+        assert not clean.subtag('value1')
+        assert clean.subtag('value2') is tag.subtag('value2')
+        assert tag.subtag('value1').data == ['subvalue']
+
 
 def test_touch_shows_error(capsys):
     tag = GroupTag('group')
@@ -220,6 +220,22 @@ class TestSanitize:
         tag.sanitize()
         assert tag.data == ['value1', 'value2', 'value3']
 
+class TestSanitized:
+    def test_nothing_hidden_returns_same_tag(self):
+        tag = Tag('type', 'value1', 'value2')
+        assert tag.sanitized() is tag
+
+    def test_when_hidden_returns_empty_copy(self):
+        tag = Tag('type', 'value1', 'value2', hidden=True)
+        assert not tag.sanitized()
+        assert tag.data == ['value1', 'value2']
+
+    def test_hidden_value_is_left_out_of_copy(self):
+        tag = Tag('type', 'value1', 'value2', 'value3')
+        tag.hide_value('value2')
+        assert tag.sanitized().data == ['value1', 'value3']
+        assert tag.data == ['value1', 'value2', 'value3']
+
 def test_touch_shows_error(capsys):
     tag = Tag('type')
     tag.touch()
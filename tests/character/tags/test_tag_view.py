@@ -0,0 +1,74 @@
+import pytest
+from npc.character.tags import TagContainer, TagView, Tag, Flag, UnknownTag
+
+@pytest.fixture
+def container():
+    container = TagContainer()
+    container.append(Tag('type', 'human'))
+    container.append(Tag('name'))
+    container.append(Flag('dead'))
+    return container
+
+def test_present_is_a_view(container):
+    assert isinstance(container.present(), TagView)
+
+def test_includes_only_present_tags(container):
+    view = container.present()
+
+    assert 'type' in view
+    assert 'name' not in view
+    assert list(view) == ['type']
+    assert len(view) == 1
+
+def test_reflects_later_changes(container):
+    view = container.present()
+
+    container('name').append('Bob')
+
+    assert 'name' in view
+
+def test_call_returns_shared_tag(container):
+    assert container.present()('type') is container('type')
+
+def test_call_missing_tag_returns_empty_unknown_tag(container):
+    view = container.present()
+
+    tag = view('motley')
+
+    assert isinstance(tag, UnknownTag)
+    assert not tag.filled
+    assert 'motley' not in container
+
+def test_call_excluded_tag_returns_empty_unknown_tag(container):
+    tag = container.present()('name')
+
+    assert tag is not container('name')
+    assert not tag.filled
+
+def test_getitem_excluded_tag_raises(container):
+    with pytest.raises(KeyError):
+        container.present()['name']
+
+def test_read_only(container):
+    with pytest.raises(TypeError):
+        container.present()['name'] = Tag('name', 'Bob')
+
+def test_values_and_all(container):
+    view = container.present()
+
+    assert list(view.values()) == [container('type')]
+    assert list(view.all()) == [container('type')]
+
+def test_copy_is_separate_container(container):
+    copied = container.present().copy()
+    copied.add_tag('realname', 'Robert')
+
+    assert isinstance(copied, TagContainer)
+    assert list(copied.names()) == ['type', 'realname']
+    assert 'realname' not in container
+
+def test_filtered(container):
+    view = container.filtered(lambda tag: isinstance(tag, Flag))
+
+    assert list(view) == ['dead']
+    assert list(view.present()) == []
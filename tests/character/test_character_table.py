@@ -0,0 +1,88 @@
+"""
+Test the columnar character table
+"""
+
+import pytest
+from collections import Counter
+from npc import character
+from npc.character.table import CharacterTable
+from npc.commands import find_characters, find_in_table
+from npc.util import flatten
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+@pytest.fixture(params=[False, True], ids=['array', 'numpy'])
+def use_numpy(request):
+    if request.param and numpy is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+def make(path, **attributes):
+    attributes.setdefault('type', ['Human'])
+    char = character.build(attributes=attributes)
+    char.path = path
+    return char
+
+@pytest.fixture
+def characters():
+    chars = [
+        make('Bob.nwod', name=['Bob Marley'], court=['Winter'], title=['Boss']),
+        make('Alice.nwod', name=['Alice Smith'], type=['Changeling'], court=['Spring', 'Winter']),
+        make('Tom.nwod', name=['Tom Jones'], title=['  ']),
+        make('Ann.nwod', name=['Ann Smith'], court=['Autumn']),
+        make('Zed.nwod', name=['Zed'], type=['Changeling']),
+    ]
+    chars[0].tags('group').append('The Bar')
+    chars[0].tags('group')['The Bar'].append('Owner')
+    chars[2].tags('group').append('Police')
+    return chars
+
+class TestCounts:
+    @pytest.mark.parametrize('tag', ['court', 'title', 'group', 'type', 'mood'])
+    def test_matches_counting_characters(self, characters, use_numpy, tag):
+        table = CharacterTable(characters, use_numpy=use_numpy)
+        expected = Counter(flatten([c.tags.get(tag, 'None') for c in characters]))
+
+        assert list(table.counts(tag).items()) == list(expected.items())
+
+    def test_empty_table(self, use_numpy):
+        table = CharacterTable([], use_numpy=use_numpy)
+
+        assert table.counts('court') == Counter()
+
+class TestFind:
+    @pytest.mark.parametrize('rules', [
+        ['court:winter'],
+        ['court~:winter'],
+        ['court:*'],
+        ['title:*'],
+        ['title~:*'],
+        ['group:owner'],
+        ['group:*'],
+        ['smith'],
+        ['court:w', 'name~:bob'],
+        ['mood:happy'],
+        ['mood~:happy'],
+        [],
+    ])
+    def test_matches_find_characters(self, characters, use_numpy, rules):
+        table = CharacterTable(characters, use_numpy=use_numpy)
+        expected = [c.path for c in find_characters(rules, characters)]
+
+        assert find_in_table(rules, table) == expected
+
+    def test_only_stores_requested_tags(self, characters, use_numpy):
+        table = CharacterTable(characters, ['court'], use_numpy=use_numpy)
+
+        assert list(table.names()) == ['court']
+        assert table.column('title') is None
+
+def test_use_numpy_without_numpy(monkeypatch):
+    monkeypatch.setattr(character.table, 'numpy', None)
+
+    with pytest.raises(ImportError):
+        CharacterTable([], use_numpy=True)
+    assert not CharacterTable([]).uses_numpy
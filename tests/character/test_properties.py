@@ -18,6 +18,20 @@ class TestTypeKey:
         char = Character()
         assert char.type_key is None
 
+    def test_follows_type_changes(self):
+        char = Character(type=['Fish'])
+        assert char.type_key == 'fish'
+
+        char.tags('type')[0] = 'Bird'
+        assert char.type_key == 'bird'
+
+    def test_follows_replaced_type_tag(self):
+        char = Character(type=['Fish'])
+        assert char.type_key == 'fish'
+
+        char.tags['type'] = npc.character.tags.Tag('type', 'Bird')
+        assert char.type_key == 'bird'
+
 class TestLocations:
     def test_foreign(self):
         char = Character()
@@ -0,0 +1,83 @@
+"""Tests the read-only sanitized overlay of a character"""
+
+import json
+import pytest
+from npc.character import Character, Changeling, CharacterEncoder
+
+def make_secretive():
+    char = Changeling(type=['changeling'], faketype=['human'], name=['Bob'], location=['France', 'Spain'], title=['Spy'])
+    char.tags('location').hide_value('Spain')
+    char.tags('title').hidden = True
+    char.tags('court').append('Winter')
+    char.tags('court')['Winter'].append('Knight')
+    char.tags('court')['Winter'].hidden = True
+    char.tags('motley').append('Secret')
+    char.tags('motley').hide_value('Secret')
+    return char
+
+def test_faketype_replaces_type():
+    c1 = Character(type=['vampire'], faketype=['human'])
+    overlay = c1.sanitized()
+
+    assert overlay.tags('type').first_value() == 'human'
+    assert overlay.type_key == 'human'
+    assert c1.tags('type').first_value() == 'vampire'
+    assert c1.type_key == 'vampire'
+
+def test_missing_type_gets_default():
+    c1 = Character()
+    overlay = c1.sanitized()
+
+    assert overlay.tags('type').first_value() == 'Unknown'
+    assert not c1.tags('type').filled
+
+def test_hidden_tags_are_left_out():
+    c1 = Character(type=['human'], location=['France'])
+    c1.tags('location').hidden = True
+    overlay = c1.sanitized()
+
+    assert not overlay.tags('location').present
+    assert 'location' not in overlay.tags.present()
+    assert c1.tags('location').present
+
+def test_keeps_class():
+    assert type(make_secretive().sanitized()) == Changeling
+
+def test_shares_tags_with_nothing_hidden():
+    c1 = make_secretive()
+    overlay = c1.sanitized()
+
+    assert overlay.tags('name') is c1.tags('name')
+    assert overlay.tags('location') is not c1.tags('location')
+
+def test_matches_sanitize():
+    c1 = make_secretive()
+    overlay = c1.sanitized()
+    c2 = make_secretive()
+    c2.sanitize()
+
+    assert json.dumps(overlay.tags, cls=CharacterEncoder) == json.dumps(c2.tags, cls=CharacterEncoder)
+    assert {name: tag.present for name, tag in overlay.tags.items()} == {name: tag.present for name, tag in c2.tags.items()}
+
+def test_original_is_unchanged():
+    c1 = make_secretive()
+    before = c1.build_header()
+    overlay = c1.sanitized()
+    json.dumps(overlay.tags, cls=CharacterEncoder)
+
+    assert c1.build_header() == before
+
+def test_missing_tag_is_not_added():
+    c1 = Character(type=['human'])
+    overlay = c1.sanitized()
+
+    assert not overlay.tags('mood').present
+    assert 'mood' not in c1.tags
+
+def test_present_view_copies_to_container():
+    c1 = make_secretive()
+    container = c1.sanitized().tags.present().copy()
+    container('mood').append('grumpy')
+
+    assert container('location').data == ['France']
+    assert 'mood' not in c1.tags
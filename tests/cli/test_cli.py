@@ -34,3 +34,58 @@ class TestBatch:
         output, _ = capsys.readouterr()
 
         assert output == ''
+
+class TestSearchFrom:
+    @pytest.fixture
+    def campaign(self, tmp_path):
+        for name in ['Alice', 'Bob', 'Carol']:
+            sheet = tmp_path / 'Characters' / '{}.nwod'.format(name)
+            sheet.parent.mkdir(exist_ok=True)
+            sheet.write_text("@type human\n")
+        return tmp_path
+
+    def test_reads_file(self, campaign, capsys, monkeypatch):
+        monkeypatch.chdir(str(campaign))
+        list_path = campaign / 'changed.txt'
+        list_path.write_text("Characters/Alice.nwod\0Characters/Carol.nwod\0")
+
+        npc.cli.start(['--campaign', str(campaign), 'find', 'name:', '--dryrun', '--search-from', str(list_path)])
+        output, _ = capsys.readouterr()
+
+        assert output.split() == ['Characters/Alice.nwod', 'Characters/Carol.nwod']
+
+    def test_reads_stdin(self, campaign, capsys, monkeypatch):
+        import io
+        monkeypatch.chdir(str(campaign))
+        monkeypatch.setattr('sys.stdin', io.StringIO("Characters/Bob.nwod\n"))
+
+        npc.cli.start(['--campaign', str(campaign), 'find', 'name:', '--dryrun', '--search-from', '-'])
+        output, _ = capsys.readouterr()
+
+        assert output.split() == ['Characters/Bob.nwod']
+
+    def test_paths_are_relative_to_caller(self, campaign, capsys, monkeypatch):
+        import io
+        monkeypatch.chdir(str(campaign / 'Characters'))
+        monkeypatch.setattr('sys.stdin', io.StringIO("Bob.nwod\n"))
+
+        npc.cli.start(['--campaign', str(campaign), 'find', 'name:', '--dryrun', '--search-from', '-'])
+        output, _ = capsys.readouterr()
+
+        assert output.split() == ['Characters/Bob.nwod']
+
+    def test_missing_file(self, campaign, capsys):
+        code = npc.cli.start(['--campaign', str(campaign), 'lint', '--search-from', str(campaign / 'nope.txt')])
+        _, err = capsys.readouterr()
+
+        assert code == 4
+        assert 'No such file or directory' in err
+
+def test_from_dump(tmp_path, capsys, monkeypatch):
+    monkeypatch.chdir(str(tmp_path))
+    (tmp_path / 'dump.ndjson').write_text('{"name": ["Bob"], "type": ["human"], "path": "Characters/Bob.nwod"}\n')
+
+    npc.cli.start(['--campaign', str(tmp_path), 'find', 'type:human', '--dryrun', '--from-dump', 'dump.ndjson'])
+    output, _ = capsys.readouterr()
+
+    assert output.split() == ['Characters/Bob.nwod']
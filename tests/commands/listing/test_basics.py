@@ -30,3 +30,15 @@ def test_progress_callback(tmp_path, capsys):
     npc.commands.listing.make_list(search, fmt='markdown', outfile=str(outfile), progress=lambda i, t: print("{} of {}".format(i, t), file=sys.stderr))
     _, errtext = capsys.readouterr()
     assert "0 of 3\n1 of 3\n2 of 3\n3 of 3\n" == errtext
+
+def test_listing_from_dump(tmp_path):
+    search = fixture_dir('parsing', 'tags')
+    dump_path = tmp_path / 'dump.json'
+    npc.commands.dump(search, directives=True, outfile=str(dump_path))
+    from_sheets = tmp_path / 'sheets.json'
+    from_dump = tmp_path / 'dumped.json'
+
+    npc.commands.listing.make_list(search, fmt='json', outfile=str(from_sheets))
+    npc.commands.listing.make_list('nowhere', fmt='json', outfile=str(from_dump), from_dump=str(dump_path))
+
+    assert from_dump.read_text() == from_sheets.read_text()
@@ -8,10 +8,20 @@ from npc.commands.listing import _refine_characters
 from npc.character import Character
 
 def test_characters_with_skip_are_excluded():
-    c1 = Character(type=['human'])
-    c2 = Character(type=['human'], skip=True)
+    c1 = Character(type=['human'], name=['Kept'])
+    c2 = Character(type=['human'], name=['Skipped'], skip=True)
 
     charlist = list(_refine_characters([c1, c2]))
 
-    assert c1 in charlist
-    assert c2 not in charlist
+    assert [c.tags('name').first_value() for c in charlist] == ['Kept']
+
+def test_characters_are_not_changed():
+    c1 = Character(type=['vampire'], faketype=['human'], location=['France'])
+    c1.tags('location').hidden = True
+
+    charlist = list(_refine_characters([c1]))
+
+    assert charlist[0].tags('type').first_value() == 'human'
+    assert not charlist[0].tags('location').present
+    assert c1.tags('type').first_value() == 'vampire'
+    assert c1.tags('location').present
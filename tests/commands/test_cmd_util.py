@@ -64,3 +64,14 @@ class TestSmartOpen:
             writer.write('hello friend')
         out, _ = capsys.readouterr()
         assert out == 'hello friend'
+
+class TestWriteJsonList:
+    @pytest.mark.parametrize('items', [[], [1], [{'a': [1, 2]}, 'b', None]])
+    def test_matches_json_dump(self, items):
+        import io
+        import json
+        stream = io.StringIO()
+
+        npc.commands.util.write_json_list(iter(items), stream)
+
+        assert stream.getvalue() == json.dumps(items)
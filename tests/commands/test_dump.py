@@ -56,3 +56,46 @@ def test_directive(list_json_output):
 
     data = list_json_output('Adrian Test.nwod')
     assert data[0]['faketype'][0] == 'Vampire'
+
+def test_streamed_output_matches_json_dump(tmp_path):
+    outfile = tmp_path / 'output.json'
+    search = fixture_dir('dump')
+
+    npc.commands.dump(search, outfile=str(outfile))
+
+    characters = [c.dump() for c in npc.parser.get_characters(search_paths=[str(search)])]
+    assert outfile.read_text() == json.dumps(characters, cls=npc.character.CharacterEncoder)
+
+def test_empty_output(tmp_path):
+    outfile = tmp_path / 'output.json'
+
+    npc.commands.dump(str(tmp_path / 'nothing'), outfile=str(outfile))
+
+    assert outfile.read_text() == '[]'
+
+def test_dump_does_not_change_character():
+    char = npc.parser.parse_character(str(fixture_dir('dump', 'test mann.nwod')))
+
+    char.dump()
+
+    assert 'path' not in char.tags
+
+def test_directives(list_json_output):
+    data = list_json_output()
+
+    assert all('directives' not in c for c in data)
+
+class TestDirectivesOption:
+    def test_left_out_by_default(self, tmp_path):
+        outfile = tmp_path / 'output.json'
+
+        npc.commands.dump(fixture_dir('parsing', 'tags', 'Hidden Tags.nwod'), outfile=str(outfile))
+
+        assert 'directives' not in load_json(outfile)[0]
+
+    def test_added_when_asked(self, tmp_path):
+        outfile = tmp_path / 'output.json'
+
+        npc.commands.dump(fixture_dir('parsing', 'tags', 'Hidden Tags.nwod'), directives=True, outfile=str(outfile))
+
+        assert load_json(outfile)[0]['directives']
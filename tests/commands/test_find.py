@@ -1,6 +1,7 @@
 import npc
 from npc.character import Character
 import pytest
+from tests.util import fixture_dir
 
 def test_find_desc():
     char = Character(description=['crazed moon staring guy'])
@@ -57,3 +58,47 @@ class TestWildcard:
         assert 'char1' in res
         assert 'char2' in res
         assert 'char3' not in res
+
+def test_find_characters_matches_all_rules_in_order():
+    char1 = Character(name=['Alpha'], type=['human'], court=['winter'])
+    char2 = Character(name=['Beta'], type=['human'], court=['summer'])
+    char3 = Character(name=['Gamma'], type=['fetch'], court=['winter'])
+
+    res = npc.commands.find_characters(["type: human", "court~:summer"], [char3, char1, char2])
+
+    assert res == [char1]
+
+def test_find_characters_leaves_rules_alone():
+    rules = ["type: human"]
+
+    npc.commands.find_characters(rules, [Character(name=['Alpha'], type=['human'])])
+
+    assert rules == ["type: human"]
+
+def test_find_tags():
+    assert npc.commands.find_tags(["type: human", "desc~:moon", "bob"]) == {'type', 'description', 'name'}
+
+def test_find_parses_only_rule_tags(mocker):
+    spy = mocker.spy(npc.parser, 'get_characters')
+
+    npc.commands.find("court: winter", search=[str(fixture_dir('parsing'))])
+
+    assert set(spy.call_args[1]['tags']) == {'court'}
+
+def test_find_from_dump(tmp_path):
+    search = fixture_dir('parsing', 'characters')
+    dump_path = tmp_path / 'dump.json'
+    npc.commands.dump(search, outfile=str(dump_path))
+
+    from_sheets = npc.commands.find("type: changeling", search=[str(search)], dryrun=True)
+    from_dump = npc.commands.find("type: changeling", search=['nowhere'], dryrun=True, from_dump=str(dump_path))
+
+    assert from_dump.printables == from_sheets.printables
+    assert from_dump.printables
+
+def test_find_rank_after_type_group():
+    search = fixture_dir('parsing', 'characters')
+
+    result = npc.commands.find("rank: jester", search=[str(search)], dryrun=True)
+
+    assert [p.endswith('Kabana Matansa.nwod') for p in result.printables] == [True]
@@ -0,0 +1,147 @@
+"""
+Test pruning find searches with the path hierarchy
+"""
+
+import npc
+import os
+import pytest
+from npc.commands import util
+
+OLD_TIME = 1500000000
+
+@pytest.fixture
+def campaign(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    def write(name, text):
+        sheet_path = tmp_path.joinpath('Characters', name)
+        sheet_path.parent.mkdir(parents=True, exist_ok=True)
+        sheet_path.write_text(text)
+    write('Changelings/Winter/Bob.nwod', "@changeling Beast Hunterheart\n@court Winter\n")
+    write('Changelings/Summer/Alice.nwod', "@changeling Beast Hunterheart\n@court Summer\n")
+    write('Humans/Carol.nwod', "@type human\n")
+    write('Dave.nwod', "@changeling Beast Hunterheart\n@court Winter\n")
+    write.root = tmp_path.joinpath('Characters')
+    return write
+
+@pytest.fixture
+def prefs():
+    prefs = npc.settings.Settings()
+    prefs.update_key('paths.trust_hierarchy', True)
+    return prefs
+
+def pruned(tests, prefs):
+    return sorted(os.path.relpath(p, 'Characters') for p in util.pruned_branches(tests, prefs=prefs))
+
+def test_prunes_other_types(campaign, prefs):
+    assert pruned([('type', 'human')], prefs) == ['Changelings']
+
+def test_prunes_other_tag_values(campaign, prefs):
+    assert pruned([('court', 'winter')], prefs) == ['Changelings/Summer']
+
+def test_partial_text_matches_like_find(campaign, prefs):
+    assert pruned([('court', 'er')], prefs) == []
+
+def test_keeps_siblings_when_no_directory_passes(campaign, prefs):
+    assert pruned([('court', 'spring')], prefs) == []
+
+def test_wildcards_do_not_prune(campaign, prefs):
+    assert pruned([('court', '*')], prefs) == []
+
+def test_unrecognized_directories_are_kept(campaign, prefs):
+    campaign('Archive/Erin.nwod', "@type human\n")
+
+    assert 'Archive' not in pruned([('type', 'human')], prefs)
+
+def test_group_components_stop_pruning(campaign, prefs):
+    prefs.update_key('paths.hierarchy', '{type}/{groups}/{court}')
+    campaign('Changelings/Guild/Summer/Frank.nwod', "@changeling Beast Hunterheart\n")
+
+    assert pruned([('court', 'winter')], prefs) == []
+
+def test_find_skips_pruned_branches(campaign, prefs, mocker):
+    build = mocker.spy(npc.parser.core, 'build_character')
+
+    result = npc.commands.find('court:winter', search=['Characters'], dryrun=True, prefs=prefs)
+
+    assert sorted(os.path.basename(p) for p in result.printables) == ['Bob.nwod', 'Dave.nwod']
+    assert build.call_count == 3
+
+def test_find_ignores_hierarchy_by_default(campaign, mocker):
+    build = mocker.spy(npc.parser.core, 'build_character')
+
+    npc.commands.find('court:winter', search=['Characters'], dryrun=True, prefs=npc.settings.Settings())
+
+    assert build.call_count == 4
+
+def test_tests_combine(campaign, prefs):
+    assert pruned([('type', 'changeling'), ('court', 'winter')], prefs) == ['Changelings/Summer', 'Humans']
+
+def test_trusts_placement_without_summaries(campaign, prefs):
+    campaign('Changelings/Summer/Eve.nwod', "@changeling Beast Hunterheart\n@court Summer\n@court Winter\n")
+
+    assert pruned([('court', 'winter')], prefs) == ['Changelings/Summer']
+
+def test_ignored_directories_are_not_pruned(campaign, prefs):
+    assert util.pruned_branches([('court', 'winter')], prefs=prefs, ignore=['Characters/Changelings/Summer']) == []
+
+class TestWithSummaries:
+    @pytest.fixture
+    def summarized(self, campaign, prefs):
+        campaign.root.parent.joinpath('.npc').mkdir()
+        prefs.update_key('parser.cache.enabled', True)
+        def warm(ignore=None):
+            for dir_path, _, file_names in os.walk(str(campaign.root)):
+                for file_name in file_names:
+                    os.utime(os.path.join(dir_path, file_name), (OLD_TIME, OLD_TIME))
+            npc.commands.find('court:winter', search=['Characters'], ignore=ignore, dryrun=True, prefs=prefs)
+        return warm
+
+    def test_cold_summaries_keep_branches(self, campaign, prefs, summarized):
+        assert pruned([('court', 'winter')], prefs) == []
+
+    def test_warm_summaries_prune(self, campaign, prefs, summarized):
+        summarized()
+
+        assert pruned([('court', 'winter')], prefs) == ['Changelings/Summer']
+
+    def test_prunes_without_reading_files(self, campaign, prefs, summarized, mocker):
+        summarized()
+        read = mocker.spy(npc.parser, 'read_records')
+
+        pruned([('court', 'winter')], prefs)
+
+        assert read.call_count == 0
+
+    def test_changed_files_keep_branches(self, campaign, prefs, summarized):
+        summarized()
+        campaign('Changelings/Summer/Alice.nwod', "@changeling Beast Hunterheart\n@court Summer\n@title Queen\n")
+
+        assert pruned([('court', 'winter')], prefs) == []
+
+    def test_keeps_branches_with_repeated_values(self, campaign, prefs, summarized):
+        campaign('Changelings/Summer/Eve.nwod', "@changeling Beast Hunterheart\n@court Summer\n@court Winter\n")
+        summarized()
+
+        assert pruned([('court', 'winter')], prefs) == []
+
+    def test_keeps_branches_with_compound_types(self, campaign, prefs, summarized):
+        campaign('Humans/Fay.nwod', "@type Human\n@changeling Beast Hunterheart\n")
+        summarized()
+
+        assert pruned([('type', 'changeling')], prefs) == []
+
+    def test_ignored_files_do_not_keep_branches(self, campaign, prefs, summarized):
+        campaign('Changelings/Summer/Eve.nwod', "@changeling Beast Hunterheart\n@court Summer\n@court Winter\n")
+        summarized(ignore=['Characters/Changelings/Summer/Eve.nwod'])
+
+        result = util.pruned_branches([('court', 'winter')], prefs=prefs, ignore=['Characters/Changelings/Summer/Eve.nwod'])
+
+        assert [os.path.relpath(p, 'Characters') for p in result] == ['Changelings/Summer']
+
+    def test_find_includes_characters_with_repeated_values(self, campaign, prefs, summarized):
+        campaign('Changelings/Summer/Eve.nwod', "@changeling Beast Hunterheart\n@court Summer\n@court Winter\n")
+        summarized()
+
+        result = npc.commands.find('court:winter', search=['Characters'], dryrun=True, prefs=prefs)
+
+        assert sorted(os.path.basename(p) for p in result.printables) == ['Bob.nwod', 'Dave.nwod', 'Eve.nwod']
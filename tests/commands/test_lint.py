@@ -2,6 +2,7 @@
 
 import npc
 import pytest
+import zipfile
 from tests.util import fixture_dir
 
 # returns openables and printables from the underlying linter
@@ -16,3 +17,19 @@ def test_report_false_opens_files():
     result = npc.commands.lint(fixture_dir('linter'), report=False)
     assert len(result.openable) > 0
     assert len(result.printables) > 0
+
+def test_fix_refuses_archives(tmp_path):
+    archive_path = str(tmp_path / 'Campaign.zip')
+    with zipfile.ZipFile(archive_path, 'w') as zip_file:
+        zip_file.writestr('Bob.nwod', "@type human\n")
+
+    result = npc.commands.lint(archive_path, fix=True)
+
+    assert not result.success
+    assert 'archives' in result.errmsg
+
+def test_fix_refuses_dumps(tmp_path):
+    result = npc.commands.lint(str(tmp_path), fix=True, from_dump=str(tmp_path / 'dump.json'))
+
+    assert not result.success
+    assert 'dump' in result.errmsg
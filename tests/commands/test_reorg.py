@@ -1,5 +1,7 @@
 import npc
+import io
 import pytest
+import zipfile
 from pathlib import Path
 
 def do_reorg(commit=True, **kwargs):
@@ -52,6 +54,29 @@ def test_ignores_with_keep_flag(campaign):
     character = campaign.get_character('Alpha Mann.nwod')
     assert character.exists()
 
+def test_refuses_archives(campaign):
+    archive_path = campaign.get_absolute('Campaign.zip')
+    with zipfile.ZipFile(archive_path, 'w') as zip_file:
+        zip_file.writestr('Bob.nwod', "@type human\n")
+
+    result = npc.commands.reorg(archive_path, commit=True)
+
+    assert not result.success
+    assert 'archives' in result.errmsg
+
+def test_skips_streamed_archives(campaign, capsys):
+    campaign.populate_from_fixture_dir('reorg', 'by_type')
+    archive_path = campaign.get_absolute('Campaign.zip')
+    with zipfile.ZipFile(archive_path, 'w') as zip_file:
+        zip_file.writestr('Bob.nwod', "@type human\n")
+    listed = npc.util.read_path_list(io.StringIO("{}\nCharacters\n".format(archive_path)))
+
+    result = npc.commands.reorg([listed], commit=True)
+
+    assert result.success
+    assert campaign.get_character('Humans/Alpha Mann.nwod').exists()
+    assert "Skipping archive" in capsys.readouterr().err
+
 class TestPurge:
     def test_removes_directories(self, campaign):
         """Removes empty directories with purge option"""
@@ -34,3 +34,15 @@ def test_basic_count(report_json_output):
     report = report_json_output('type', 'count-types')
     assert report['type']['Human'] == 3
     assert report['type']['Changeling'] == 2
+
+def test_report_from_dump(tmp_path):
+    search = fixture_dir('report', 'valid-json')
+    dump_path = tmp_path / 'dump.json'
+    npc.commands.dump(search, outfile=str(dump_path))
+    from_sheets = tmp_path / 'sheets.json'
+    from_dump = tmp_path / 'dumped.json'
+
+    npc.commands.report('type', search=[str(search)], fmt='json', outfile=str(from_sheets))
+    npc.commands.report('type', search=['nowhere'], fmt='json', outfile=str(from_dump), from_dump=str(dump_path))
+
+    assert load_json(from_dump) == load_json(from_sheets)
@@ -0,0 +1,31 @@
+import npc
+from npc.linters.settings.parser import ParserSettingsLinter
+
+class TestLint:
+    def test_prepends_generic_warning(self):
+        prefs = npc.settings.Settings()
+        linter = ParserSettingsLinter(prefs)
+
+        linter.errors = ['hello']
+        linter.lint()
+
+        assert linter.errors[0] == 'Parser settings are not correct:'
+
+class TestChecks:
+    def test_default_cache_validation_is_fine(self):
+        prefs = npc.settings.Settings()
+        linter = ParserSettingsLinter(prefs)
+
+        linter.check_cache_validation()
+
+        assert linter.valid
+
+    def test_check_cache_validation(self):
+        prefs = npc.settings.Settings()
+        linter = ParserSettingsLinter(prefs)
+
+        prefs.update_key('parser.cache.validate', 'vibes')
+        linter.check_cache_validation()
+        error_string = '\n'.join(linter.errors)
+
+        assert "Unrecognized cache validation mode 'vibes'" in error_string
@@ -0,0 +1,134 @@
+import npc
+import os
+import tarfile
+import zipfile
+import pytest
+from tests.util import fixture_dir
+
+from npc.parser.names import get_names
+
+def make_zip(target, members):
+    with zipfile.ZipFile(str(target), 'w') as zip_file:
+        for name, text in members.items():
+            zip_file.writestr(name, text)
+    return str(target)
+
+def make_tarball(target, members, tmp_path):
+    source = tmp_path / 'source'
+    for name, text in members.items():
+        member_path = source / name
+        member_path.parent.mkdir(parents=True, exist_ok=True)
+        member_path.write_text(text)
+    with tarfile.open(str(target), 'w:gz') as tar_file:
+        tar_file.add(str(source), arcname='.')
+    return str(target)
+
+@pytest.fixture(params=['zip', 'tar.gz'])
+def archive(request, tmp_path):
+    def build(members):
+        target = tmp_path / 'Campaign.{}'.format(request.param)
+        if request.param == 'zip':
+            return make_zip(target, members)
+        return make_tarball(target, members, tmp_path)
+    return build
+
+def fixture_members():
+    root = str(fixture_dir('parsing'))
+    members = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            file_path = os.path.join(dirpath, filename)
+            rel_name = os.path.relpath(file_path, root).replace(os.sep, '/')
+            with open(file_path, 'r') as source:
+                members[rel_name] = source.read()
+    return members
+
+def test_same_characters_as_directory(archive):
+    archive_path = archive(fixture_members())
+    root = str(fixture_dir('parsing'))
+
+    from_dir = {os.path.relpath(c.path, root): c for c in npc.parser.get_characters([root])}
+    from_archive = {os.path.relpath(c.path, archive_path): c for c in npc.parser.get_characters([archive_path])}
+
+    assert from_dir.keys() == from_archive.keys()
+    for rel_name, dir_char in from_dir.items():
+        assert type(from_archive[rel_name]) == type(dir_char)
+        assert from_archive[rel_name].tags == dir_char.tags
+
+def test_member_path_is_recorded(archive):
+    archive_path = archive({'Characters/Bob.nwod': "@type human\n"})
+
+    char = next(npc.parser.get_characters([archive_path]))
+
+    assert char.path == os.path.join(archive_path, 'Characters', 'Bob.nwod')
+    assert char.tags('name') == ['Bob']
+
+def test_skips_unknown_extensions(archive):
+    archive_path = archive({'Bob.nwod': "@type human\n", 'notes.txt': "@type human\n"})
+
+    chars = list(npc.parser.get_characters([archive_path]))
+
+    assert [c.tags('name')[0] for c in chars] == ['Bob']
+
+def test_ignore_patterns_apply_inside(archive):
+    archive_path = archive({'Bob.nwod': "@type human\n", 'Old/Alice.nwod': "@type human\n"})
+
+    chars = list(npc.parser.get_characters([archive_path], ignore_patterns=['Old/']))
+
+    assert [c.tags('name')[0] for c in chars] == ['Bob']
+
+def test_npcignore_members_apply(archive):
+    archive_path = archive({
+        'Bob.nwod': "@type human\n",
+        'Minor/.npcignore': "*.nwod\n!Carol.nwod\n",
+        'Minor/Alice.nwod': "@type human\n",
+        'Minor/Carol.nwod': "@type human\n",
+    })
+
+    chars = list(npc.parser.get_characters([archive_path]))
+
+    assert sorted(c.tags('name')[0] for c in chars) == ['Bob', 'Carol']
+
+def test_ignore_paths_apply_to_members(archive):
+    archive_path = archive({'Bob.nwod': "@type human\n", 'Old/Alice.nwod': "@type human\n"})
+
+    chars = list(npc.parser.get_characters([archive_path], ignore_paths=[os.path.join(archive_path, 'Old')]))
+
+    assert [c.tags('name')[0] for c in chars] == ['Bob']
+
+def test_mixed_with_directories_keeps_order(tmp_path):
+    sheets = tmp_path / 'Sheets'
+    sheets.mkdir()
+    (sheets / 'Alice.nwod').write_text("@type human\n")
+    archive_path = make_zip(tmp_path / 'Old.zip', {'Bob.nwod': "@type human\n"})
+
+    chars = list(npc.parser.get_characters([archive_path, str(sheets)], jobs=2))
+
+    assert [c.tags('name')[0] for c in chars] == ['Bob', 'Alice']
+
+def test_projection(tmp_path):
+    archive_path = make_zip(tmp_path / 'Old.zip', {'Bob.nwod': "Some guy\n@type human\n@title Boss\n"})
+
+    char = next(npc.parser.get_characters([archive_path], tags=['title']))
+
+    assert char.tags('title') == ['Boss']
+    assert not char.tags('description').filled
+
+def test_character_files_skips_archives(tmp_path):
+    archive_path = make_zip(tmp_path / 'Old.zip', {'Bob.nwod': "@type human\n"})
+
+    assert list(npc.parser.character_files([archive_path])) == []
+
+def test_names(tmp_path):
+    archive_path = make_zip(tmp_path / 'Old.zip', {'Bobby.nwod': "@type human\n@realname Robert\n"})
+
+    names = list(get_names([archive_path]))
+
+    assert names == [(os.path.join(archive_path, 'Bobby.nwod'), ['Robert'])]
+
+def test_members_outside_the_archive_are_skipped(tmp_path):
+    archive_path = make_zip(tmp_path / 'Old.zip', {'../Bob.nwod': "@type human\n", 'Alice.nwod': "@type human\n"})
+
+    chars = list(npc.parser.get_characters([archive_path]))
+
+    assert [c.tags('name')[0] for c in chars] == ['Alice']
@@ -0,0 +1,81 @@
+import npc
+import builtins
+import pytest
+import zipfile
+from tests.util import fixture_dir, sheet
+
+BODY = "@type human\n--Stats--\nVirtue: Hope\r\nVice: Envy\n"
+
+@pytest.mark.parametrize('options', [{}, {'jobs': 2}, {'io_threads': 2}])
+def test_body_is_kept(tmp_path, options):
+    sheet(tmp_path, BODY)
+
+    char = next(npc.parser.get_characters([str(tmp_path)], keep_body=True, **options))
+
+    assert char._body == "@type human\n--Stats--\nVirtue: Hope\nVice: Envy\n"
+
+def test_body_not_kept_by_default(tmp_path):
+    sheet(tmp_path, BODY)
+
+    char = next(npc.parser.get_characters([str(tmp_path)]))
+
+    assert char._body is None
+
+def test_body_loads_on_first_use(tmp_path):
+    sheet(tmp_path, BODY)
+    char = next(npc.parser.get_characters([str(tmp_path)]))
+
+    assert char.body == "@type human\n--Stats--\nVirtue: Hope\nVice: Envy\n"
+
+def test_cached_character_loads_body_lazily(tmp_path):
+    sheet(tmp_path, BODY)
+    cache = npc.parser.ParseCache(str(tmp_path / 'cache.json'))
+    list(npc.parser.get_characters([str(tmp_path)], cache=cache))
+
+    char = next(npc.parser.get_characters([str(tmp_path)], cache=cache, keep_body=True))
+
+    assert cache.hits == 1
+    assert char._body is None
+    assert char.body.startswith("@type human\n")
+
+def test_archive_body_is_kept(tmp_path):
+    archive_path = str(tmp_path / 'Campaign.zip')
+    with zipfile.ZipFile(archive_path, 'w') as zip_file:
+        zip_file.writestr('Bob.nwod', BODY)
+
+    char = next(npc.parser.get_characters([archive_path], keep_body=True))
+
+    assert char.body == "@type human\n--Stats--\nVirtue: Hope\nVice: Envy\n"
+
+def test_body_of_missing_file_says_why(tmp_path):
+    char = npc.character.Character(path=str(tmp_path / 'Campaign.zip' / 'Bob.nwod'))
+
+    with pytest.raises(FileNotFoundError) as err:
+        char.body
+
+    assert 'not on disk' in err.value.strerror
+    assert err.value.filename == char.path
+
+def test_lint_reads_archives(tmp_path):
+    archive_path = str(tmp_path / 'Campaign.zip')
+    with zipfile.ZipFile(archive_path, 'w') as zip_file:
+        zip_file.writestr('Bob.nwod', "@changeling Beast Hunterheart\n@court Winter\n")
+
+    result = npc.commands.lint(archive_path, prefs=npc.settings.Settings())
+
+    assert result.success
+    assert not any('Could not read' in line for line in result.printables)
+
+def test_body_without_path_is_empty():
+    char = npc.character.Character()
+
+    assert char.body == ''
+
+def test_lint_reads_each_file_once(mocker):
+    opened = mocker.spy(builtins, 'open')
+
+    npc.commands.lint(fixture_dir('linter'), prefs=npc.settings.Settings())
+
+    paths = [str(call[0][0]) for call in opened.call_args_list if str(call[0][0]).endswith('.nwod')]
+    assert paths
+    assert len(paths) == len(set(paths))
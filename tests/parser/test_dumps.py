@@ -0,0 +1,74 @@
+import io
+import json
+import npc
+import pytest
+from tests.util import fixture_dir
+
+from npc.character import CharacterEncoder
+from npc.parser.dumps import read_dump, load_dump
+
+def dumped(characters):
+    return [json.loads(json.dumps(c.dump(), cls=CharacterEncoder)) for c in characters]
+
+@pytest.fixture
+def characters():
+    return list(npc.parser.get_characters(search_paths=[str(fixture_dir('parsing'))]))
+
+def test_json_round_trip(characters):
+    text = json.dumps([c.dump() for c in characters], cls=CharacterEncoder)
+
+    rebuilt = list(read_dump(io.StringIO(text)))
+
+    assert dumped(rebuilt) == dumped(characters)
+    assert [type(c) for c in rebuilt] == [type(c) for c in characters]
+
+def test_pretty_json(characters):
+    text = json.dumps([c.dump() for c in characters], cls=CharacterEncoder, indent=2)
+
+    assert dumped(read_dump(io.StringIO(text))) == dumped(characters)
+
+def test_ndjson_round_trip(characters):
+    text = "\n".join(json.dumps(c.dump(), cls=CharacterEncoder) for c in characters) + "\n\n"
+
+    assert dumped(read_dump(io.StringIO(text))) == dumped(characters)
+
+def test_skips_metadata():
+    text = '[{"meta": true, "title": "NPC Listing"}, {"name": ["Bob"], "type": ["human"], "path": "Bob.nwod"}]'
+
+    rebuilt = list(read_dump(io.StringIO(text)))
+
+    assert len(rebuilt) == 1
+    assert rebuilt[0].path == 'Bob.nwod'
+
+def test_missing_type():
+    rebuilt = next(read_dump(io.StringIO('{"name": ["Bob"], "type": []}\n')))
+
+    assert rebuilt.tags('name') == ['Bob']
+    assert rebuilt.path == ''
+
+def test_directives_restore_hidden_data():
+    char = npc.parser.parse_character(str(fixture_dir('parsing', 'tags', 'Hidden Tags.nwod')))
+
+    rebuilt = next(read_dump(io.StringIO(json.dumps(char.dump(directives=True), cls=CharacterEncoder))))
+
+    assert rebuilt.tags('title').hidden_values == ['Yer Majesty']
+    assert rebuilt.tags('group').subtag('Divers').hidden
+    char.sanitize()
+    rebuilt.sanitize()
+    assert dumped([rebuilt]) == dumped([char])
+
+def test_directives_restore_bare_flags(tmp_path):
+    sheet = tmp_path / 'Bob.nwod'
+    sheet.write_text("@type human\n@skip\n@dead\n")
+    char = npc.parser.parse_character(str(sheet))
+
+    rebuilt = next(read_dump(io.StringIO(json.dumps(char.dump(directives=True), cls=CharacterEncoder))))
+
+    assert rebuilt.tags('skip').present
+    assert rebuilt.tags('dead').present
+
+def test_load_dump_file(tmp_path, characters):
+    dump_path = tmp_path / 'dump.json'
+    dump_path.write_text(json.dumps([c.dump() for c in characters], cls=CharacterEncoder))
+
+    assert len(list(load_dump(str(dump_path)))) == len(characters)
@@ -0,0 +1,164 @@
+import npc
+import os
+import pytest
+
+from npc.parser.ignore import compile_pattern, PatternList, IgnoreRules, rules_for
+from npc.parser.core import _find_files
+
+def ignores(pattern, rel_path, is_dir=False):
+    return PatternList([pattern]).match(rel_path, is_dir) is True
+
+class TestCompilePattern:
+    @pytest.mark.parametrize('line', ['', '   ', '# comment', '/', '\n'])
+    def test_no_pattern(self, line):
+        assert compile_pattern(line) is None
+
+    def test_malformed_class_is_skipped(self):
+        assert compile_pattern('[z-a]') is None
+
+    def test_negation(self):
+        _, negated, _ = compile_pattern('!keep.nwod')
+        assert negated
+
+    def test_escaped_bang_is_literal(self):
+        regex, negated, _ = compile_pattern('\\!keep.nwod')
+        assert not negated
+        assert regex.match('!keep.nwod')
+
+    def test_trailing_slash_is_dir_only(self):
+        _, _, dir_only = compile_pattern('Archive/')
+        assert dir_only
+
+@pytest.mark.parametrize('pattern, rel_path, is_dir, expected', [
+    ('*.bak.nwod', 'Test Mann.bak.nwod', False, True),
+    ('*.bak.nwod', 'Humans/Test Mann.bak.nwod', False, True),
+    ('*.bak.nwod', 'Test Mann.nwod', False, False),
+    ('Archive', 'Humans/Archive', True, True),
+    ('Archive/', 'Humans/Archive', False, False),
+    ('Archive/', 'Humans/Archive', True, True),
+    ('/Archive', 'Archive', True, True),
+    ('/Archive', 'Humans/Archive', True, False),
+    ('Humans/Archive', 'Humans/Archive', True, True),
+    ('Humans/Archive', 'Other/Humans/Archive', True, False),
+    ('**/Archive', 'Archive', True, True),
+    ('**/Archive', 'a/b/c/Archive', True, True),
+    ('Humans/**/old', 'Humans/old', True, True),
+    ('Humans/**/old', 'Humans/a/b/old', True, True),
+    ('Humans/**', 'Humans/a/b.nwod', False, True),
+    ('Humans/**', 'Humans', True, False),
+    ('Te?t*', 'Test Mann.nwod', False, True),
+    ('*.nwod', 'a/b.nwod', False, True),
+    ('Humans/*.nwod', 'Humans/a/b.nwod', False, False),
+    ('[Tt]est*', 'test.nwod', False, True),
+    ('[!T]est*', 'Test.nwod', False, False),
+    ('[!T]est*', 'best.nwod', False, True),
+    ('scratch-*/', 'Players/scratch-alice', True, True),
+    ('with\\ space\\ ', 'with space ', False, True),
+])
+def test_pattern_matching(pattern, rel_path, is_dir, expected):
+    assert ignores(pattern, rel_path, is_dir) == expected
+
+class TestPatternList:
+    def test_last_match_wins(self):
+        patterns = PatternList(['*.nwod', '!Keep*.nwod'])
+
+        assert patterns.match('Drop Me.nwod', False) is True
+        assert patterns.match('Keep Me.nwod', False) is False
+        assert patterns.match('notes.txt', False) is None
+
+    def test_reads_file(self, tmp_path):
+        pattern_file = tmp_path / '.npcignore'
+        pattern_file.write_text("# old stuff\nArchive/\n\n*.bak.nwod\n")
+
+        patterns = PatternList.from_file(str(pattern_file))
+
+        assert len(patterns.rules) == 2
+
+    def test_missing_file_is_empty(self, tmp_path):
+        assert not PatternList.from_file(str(tmp_path / '.npcignore'))
+
+class TestIgnoreRules:
+    def test_deeper_rules_take_precedence(self):
+        rules = IgnoreRules().with_patterns(PatternList(['*.nwod']))
+        rules = rules.child('Humans').with_patterns(PatternList(['!Test Mann.nwod']))
+
+        assert not rules.ignores('Test Mann.nwod', False)
+        assert rules.ignores('Other Mann.nwod', False)
+
+    def test_child_tracks_prefix(self):
+        rules = IgnoreRules().with_patterns(PatternList(['/Humans/Archive']))
+
+        assert rules.child('Humans').ignores('Archive', True)
+        assert not rules.child('Fetches').ignores('Archive', True)
+
+def make_files(root, *names):
+    for name in names:
+        target = root.joinpath(name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.touch()
+
+def found_names(root, **kwargs):
+    return sorted(os.path.relpath(p, str(root)) for p in _find_files(str(root), **kwargs))
+
+class TestWalking:
+    def test_npcignore_in_root(self, tmp_path):
+        make_files(tmp_path, 'Humans/Test Mann.nwod', 'Humans/Test Mann.bak.nwod', 'Archive/Old Mann.nwod')
+        (tmp_path / '.npcignore').write_text("*.bak.nwod\nArchive/\n")
+
+        assert found_names(tmp_path) == [os.path.join('Humans', 'Test Mann.nwod')]
+
+    def test_npcignore_in_subdirectory(self, tmp_path):
+        make_files(tmp_path, 'Humans/Test Mann.nwod', 'Humans/Other Mann.nwod', 'Fetches/Other Mann.nwod')
+        (tmp_path / 'Humans' / '.npcignore').write_text("Other*\n")
+
+        assert found_names(tmp_path) == [os.path.join('Fetches', 'Other Mann.nwod'), os.path.join('Humans', 'Test Mann.nwod')]
+
+    def test_negation_in_deeper_file(self, tmp_path):
+        make_files(tmp_path, 'Humans/Test Mann.nwod', 'Humans/Other Mann.nwod')
+        (tmp_path / '.npcignore').write_text("*.nwod\n")
+        (tmp_path / 'Humans' / '.npcignore').write_text("!Test Mann.nwod\n")
+
+        assert found_names(tmp_path) == [os.path.join('Humans', 'Test Mann.nwod')]
+
+    def test_ignored_directory_is_not_listed(self, tmp_path, mocker):
+        make_files(tmp_path, 'Archive/Old Mann.nwod')
+        (tmp_path / '.npcignore').write_text("Archive/\n")
+        scandir = mocker.spy(npc.parser.core, 'scandir')
+
+        assert found_names(tmp_path) == []
+        assert [call[0][0] for call in scandir.call_args_list] == [str(tmp_path)]
+
+    def test_settings_patterns_relative_to_campaign(self, campaign):
+        make_files(campaign.basedir, 'Characters/Humans/Archive/Old Mann.nwod', 'Characters/Humans/Test Mann.nwod')
+        patterns = PatternList(['/Characters/Humans/Archive/'])
+
+        assert list(_find_files('Characters', patterns=patterns)) == [os.path.join('Characters', 'Humans', 'Test Mann.nwod')]
+
+    def test_parent_npcignore_applies_to_subdirectory_search(self, campaign):
+        make_files(campaign.basedir, 'Characters/Humans/Test Mann.bak.nwod', 'Characters/Humans/Test Mann.nwod')
+        (campaign.basedir / 'Characters' / '.npcignore').write_text("*.bak.nwod\n")
+
+        assert list(_find_files('Characters/Humans')) == [os.path.join('Characters/Humans', 'Test Mann.nwod')]
+
+    def test_search_path_ignored_by_parent(self, campaign):
+        make_files(campaign.basedir, 'Characters/Archive/Old Mann.nwod')
+        (campaign.basedir / 'Characters' / '.npcignore').write_text("Archive/\n")
+
+        assert rules_for('Characters/Archive') is None
+        assert list(_find_files('Characters/Archive')) == []
+
+    def test_searched_file_is_always_found(self, campaign):
+        make_files(campaign.basedir, 'Characters/Test Mann.bak.nwod')
+        (campaign.basedir / 'Characters' / '.npcignore').write_text("*.bak.nwod\n")
+
+        assert list(_find_files('Characters/Test Mann.bak.nwod')) == ['Characters/Test Mann.bak.nwod']
+
+def test_commands_use_settings_patterns(campaign, prefs, tmp_path):
+    make_files(campaign.basedir, 'Characters/Test Mann.nwod', 'Characters/Test Mann.bak.nwod')
+    prefs.update_key('paths.ignore_patterns', ['*.bak.nwod'])
+    outfile = tmp_path / 'dump.json'
+
+    npc.commands.dump('Characters', outfile=str(outfile), prefs=prefs)
+
+    assert 'Test Mann.bak.nwod' not in outfile.read_text()
+    assert 'Test Mann.nwod' in outfile.read_text()
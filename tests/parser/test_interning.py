@@ -0,0 +1,98 @@
+"""
+Test pooling repeated tag values
+"""
+
+import pytest
+from npc.parser import build_character
+from npc.util import interning
+from npc.util.interning import ValuePool
+
+def fresh(value):
+    """Make a new string object equal to value"""
+    return ''.join(list(value))
+
+class TestValuePool:
+    def test_returns_first_copy(self):
+        pool = ValuePool()
+        first = fresh('Winter')
+        second = fresh('Winter')
+
+        assert pool.intern(first) is first
+        assert pool.intern(second) is first
+        assert len(pool) == 1
+
+    def test_folded_value_is_pooled(self):
+        pool = ValuePool()
+        pool.intern(fresh('Winter'))
+
+        assert pool.folded(fresh('Winter')) == 'winter'
+        assert pool.folded(fresh('Winter')) is pool.folded(fresh('Winter'))
+
+    def test_folded_skips_unpooled_values(self):
+        pool = ValuePool()
+
+        assert pool.folded(fresh('Bob Smith')) == 'bob smith'
+        assert 'Bob Smith' not in pool
+
+    def test_clear(self):
+        pool = ValuePool()
+        pool.intern('Winter')
+        pool.folded('Winter')
+        pool.clear()
+
+        assert len(pool) == 0
+
+    def test_limit_stops_growth(self):
+        pool = ValuePool(limit=1)
+        pool.intern('Winter')
+        value = fresh('Summer')
+
+        assert pool.intern(value) is value
+        assert 'Summer' not in pool
+        assert len(pool) == 1
+
+    def test_full_pool_still_shares_pooled_values(self):
+        pool = ValuePool(limit=1)
+        first = pool.intern(fresh('Winter'))
+        pool.intern('Summer')
+
+        assert pool.intern(fresh('Winter')) is first
+
+    def test_shared_pool_is_bounded(self):
+        assert interning.values.limit == interning.MAX_POOLED
+
+class TestBuildCharacter:
+    @pytest.mark.parametrize('records, tag', [
+        ([('type', 'Human'), ('court', 'Winter')], 'court'),
+        ([('type', 'Human'), ('location', 'Downtown')], 'location'),
+        ([('changeling', 'Beast Hunterheart')], 'seeming'),
+        ([('changeling', 'Beast Hunterheart')], 'kith'),
+        ([('werewolf', 'Rahu')], 'auspice'),
+        ([('type', 'Human')], 'type'),
+    ])
+    def test_shares_repeated_values(self, records, tag):
+        char1 = build_character('Bob.nwod', [(t, fresh(v)) for t, v in records])
+        char2 = build_character('Tom.nwod', [(t, fresh(v)) for t, v in records])
+
+        assert char1.tags(tag)[0] is char2.tags(tag)[0]
+
+    def test_shares_group_names_and_ranks(self):
+        records = [('type', 'Human'), ('group', 'The Bar'), ('rank', 'Owner')]
+        char1 = build_character('Bob.nwod', [(t, fresh(v)) for t, v in records])
+        char2 = build_character('Tom.nwod', [(t, fresh(v)) for t, v in records])
+
+        assert list(char1.tags('group'))[0] is list(char2.tags('group'))[0]
+        assert char1.tags('group')['The Bar'][0] is char2.tags('group')['The Bar'][0]
+
+    def test_shares_tag_names(self):
+        char1 = build_character('Bob.nwod', [('type', 'Human'), (fresh('mood'), 'grumpy')])
+        char2 = build_character('Tom.nwod', [('type', 'Human'), (fresh('mood'), 'grumpy')])
+
+        assert char1.tags('mood').name is char2.tags('mood').name
+
+    def test_leaves_other_values_alone(self):
+        records = [('type', 'Human'), ('title', 'Bartender')]
+        char1 = build_character('Bob.nwod', [(t, fresh(v)) for t, v in records])
+        char2 = build_character('Tom.nwod', [(t, fresh(v)) for t, v in records])
+
+        assert char1.tags('title')[0] is not char2.tags('title')[0]
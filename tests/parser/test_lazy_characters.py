@@ -0,0 +1,102 @@
+import copy
+import json
+import pickle
+
+import npc
+import pytest
+from npc.character import CharacterEncoder
+from npc.parser.lazy import LazyTags, summary_tags
+from tests.util import fixture_dir, sheet
+
+def lazy_parse(char_path, **kwargs):
+    return next(npc.parser.get_characters([char_path], lazy=True, **kwargs))
+
+@pytest.fixture
+def lazy_char(tmp_path):
+    char_path = sheet(tmp_path, "Some guy\n@changeling Beast Hunterheart\n@court Winter\n@group Guild\n@rank Knight\n@title Hunter\n@skip\n")
+    return lazy_parse(char_path)
+
+def test_summary_includes_groups_and_flags():
+    assert {'name', 'type', 'faketype', 'group', 'court', 'skip', 'dead'} <= summary_tags()
+
+def test_starts_with_summary(lazy_char):
+    assert isinstance(lazy_char.tags, LazyTags)
+    assert lazy_char.tags('court').data == {'Winter': lazy_char.tags('court')['Winter']}
+    assert lazy_char.tags('group')['Guild'].data == ['Knight']
+    assert lazy_char.tags('skip').present
+    assert lazy_char.type_key == 'changeling'
+    assert 'court' in lazy_char.tags
+    assert not lazy_char.tags.loaded
+
+def test_keeps_class(lazy_char):
+    assert type(lazy_char) == npc.character.Changeling
+
+def test_loads_for_other_tags(lazy_char):
+    assert lazy_char.tags('title').data == ['Hunter']
+    assert lazy_char.tags.loaded
+
+def test_loads_for_description(lazy_char):
+    assert lazy_char.tags('description').data == ['Some guy']
+    assert lazy_char.tags.loaded
+
+def test_loads_for_whole_container(lazy_char):
+    assert lazy_char.tags('seeming').data == ['Beast']
+    assert lazy_char.tags.loaded
+
+def test_keeps_summary_tags_when_loading(lazy_char):
+    court = lazy_char.tags('court')
+    court.append('Spring')
+    lazy_char.tags('title')
+
+    assert lazy_char.tags('court') is court
+    assert 'Spring' in lazy_char.tags('court')
+
+def test_loaded_character_matches_full_parse(tmp_path):
+    char_path = sheet(tmp_path, "Some guy\n@type human\n@group Frat\n@rank Brother\n@title Boss\n@hide title\n")
+    full = npc.parser.parse_character(char_path)
+    lazy = lazy_parse(char_path)
+
+    assert json.dumps(lazy.tags, cls=CharacterEncoder) == json.dumps(full.tags, cls=CharacterEncoder)
+    assert lazy.build_header() == full.build_header()
+
+def test_pickles_as_plain_container(lazy_char):
+    unpickled = pickle.loads(pickle.dumps(lazy_char))
+
+    assert type(unpickled.tags) == npc.character.tags.TagContainer
+    assert unpickled.tags('title').data == ['Hunter']
+
+def test_copies_as_plain_container(lazy_char):
+    copied = copy.copy(lazy_char.tags)
+
+    assert type(copied) == npc.character.tags.TagContainer
+    assert copied('title').data == ['Hunter']
+
+def test_uses_cache_to_load(tmp_path):
+    char_path = sheet(tmp_path, "@type human\n@title Boss\n")
+    cache = npc.parser.ParseCache(tmp_path / 'cache' / 'parse.json')
+    lazy = lazy_parse(char_path, cache=cache)
+    reads = []
+    cache.records = lambda file_path, reader: reads.append(file_path) or [('type', 'human'), ('title', 'Boss')]
+
+    assert lazy.tags('title').data == ['Boss']
+    assert reads == [char_path]
+
+@pytest.mark.parametrize('options', [{}, {'jobs': 2}, {'io_threads': 2}])
+def test_get_characters_matches_full_parse(options):
+    full = list(npc.parser.get_characters(search_paths=[fixture_dir('parsing')]))
+    lazy = list(npc.parser.get_characters(search_paths=[fixture_dir('parsing')], lazy=True, **options))
+
+    assert len(full) == len(lazy)
+    for full_char, lazy_char in zip(full, lazy):
+        assert type(full_char) == type(lazy_char)
+        assert not lazy_char.tags.loaded
+        assert lazy_char.type_key == full_char.type_key
+        assert json.dumps(lazy_char.tags, cls=CharacterEncoder) == json.dumps(full_char.tags, cls=CharacterEncoder)
+
+def test_get_characters_builds_requested_tags_up_front(tmp_path):
+    sheet(tmp_path, "@type human\n@title Boss\n")
+
+    char = list(npc.parser.get_characters(search_paths=[str(tmp_path)], tags=['title'], lazy=True))[0]
+
+    assert char.tags('title').data == ['Boss']
+    assert not char.tags.loaded
@@ -0,0 +1,47 @@
+"""
+Test searching paths from a list, as with --search-from
+"""
+
+import io
+import os
+import pytest
+import npc
+from npc.util import ListedPath, read_path_list
+
+@pytest.fixture
+def campaign(tmp_path, monkeypatch):
+    monkeypatch.chdir(str(tmp_path))
+    tmp_path.joinpath('Characters', 'Old').mkdir(parents=True)
+    tmp_path.joinpath('Characters', 'Bob.nwod').write_text("@type human\n")
+    tmp_path.joinpath('Characters', 'Old', 'Ann.nwod').write_text("@type human\n")
+    tmp_path.joinpath('Characters', 'Draft.nwod').write_text("@type human\n")
+    tmp_path.joinpath('Characters', '.npcignore').write_text("Draft.nwod\n")
+    tmp_path.joinpath('README.md').write_text("# Campaign\n")
+    return tmp_path
+
+def found(listing, **kwargs):
+    return list(npc.parser.character_files(read_path_list(io.StringIO(listing)), **kwargs))
+
+def test_listed_character_files_are_found(campaign):
+    assert found("Characters/Bob.nwod\n") == [os.path.join('Characters', 'Bob.nwod')]
+
+def test_listed_files_need_a_character_extension(campaign):
+    assert found("README.md\nCharacters/Bob.nwod\n") == [os.path.join('Characters', 'Bob.nwod')]
+
+def test_missing_listed_files_are_skipped(campaign):
+    assert found("Characters/Gone.nwod\nCharacters/Bob.nwod\n") == [os.path.join('Characters', 'Bob.nwod')]
+
+def test_npcignore_applies_to_listed_files(campaign):
+    assert found("Characters/Draft.nwod\n") == []
+
+def test_ignore_patterns_apply_to_listed_files(campaign):
+    assert found("Characters/Bob.nwod\n", ignore_patterns=['Bob.nwod']) == []
+
+def test_ignored_directories_apply_to_listed_files(campaign):
+    assert found("Characters/Old/Ann.nwod\n", ignore_paths=['Characters/Old']) == []
+
+def test_listed_directories_are_searched(campaign):
+    assert found("Characters/Old\n") == [os.path.join('Characters', 'Old', 'Ann.nwod')]
+
+def test_named_files_are_used_as_is(campaign):
+    assert list(npc.parser.character_files(['README.md'])) == ['README.md']
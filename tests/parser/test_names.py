@@ -0,0 +1,99 @@
+import npc
+import os
+import pytest
+from tests.util import fixture_dir
+
+from npc.parser.names import NameIndex, get_names
+
+OLD_TIME = 1500000000
+
+@pytest.fixture
+def campaign(tmp_path):
+    """Create character sheets whose mtimes are safely in the past"""
+    root = tmp_path / 'Characters'
+    root.mkdir()
+    def write(name, text):
+        sheet_path = root / name
+        sheet_path.write_text(text)
+        os.utime(str(sheet_path), (OLD_TIME, OLD_TIME))
+        return str(sheet_path)
+    write.root = str(root)
+    return write
+
+def make_index(tmp_path, **kwargs):
+    return NameIndex(tmp_path / 'cache' / 'names.json', **kwargs)
+
+def test_names_match_parsed_characters():
+    search = [str(fixture_dir('parsing'))]
+
+    names = list(get_names(search))
+
+    assert names == [(c.path, c.tags('name').data) for c in npc.parser.get_characters(search)]
+
+def test_realname_and_extra_names(campaign):
+    campaign('Bobby - sidekick.nwod', "@type human\n@name Bob\n@realname Robert\n@name  \n")
+
+    names = list(get_names([campaign.root]))
+
+    assert names[0][1] == ['Robert', 'Bob']
+
+def test_unchanged_files_are_not_opened(tmp_path, campaign, mocker):
+    campaign('Bob.nwod', "@type human\n@realname Robert\n")
+    campaign('Alice.nwod', "@type human\n")
+    list(get_names([campaign.root], index=make_index(tmp_path)))
+
+    read = mocker.spy(npc.parser.core, 'read_records')
+    index = make_index(tmp_path)
+    names = dict(get_names([campaign.root], index=index))
+
+    assert read.call_count == 0
+    assert index.hits == 2
+    assert sorted(names.values()) == [['Alice'], ['Robert']]
+
+def test_changed_file_is_scanned_again(tmp_path, campaign):
+    sheet_path = campaign('Bob.nwod', "@type human\n")
+    list(get_names([campaign.root], index=make_index(tmp_path)))
+
+    campaign('Bob.nwod', "@type human\n@realname Robert\n")
+    os.utime(sheet_path, (OLD_TIME + 10, OLD_TIME + 10))
+    names = list(get_names([campaign.root], index=make_index(tmp_path)))
+
+    assert names == [(sheet_path, ['Robert'])]
+
+def test_fingerprint_mismatch_discards_entries(tmp_path, campaign):
+    campaign('Bob.nwod', "@type human\n")
+    list(get_names([campaign.root], index=make_index(tmp_path, fingerprint='old')))
+
+    index = make_index(tmp_path, fingerprint='new')
+    list(get_names([campaign.root], index=index))
+
+    assert index.misses == 1
+
+def test_recent_files_are_not_saved(tmp_path):
+    sheet_path = tmp_path / 'Bob.nwod'
+    sheet_path.write_text("@type human\n")
+    list(get_names([str(sheet_path)], index=make_index(tmp_path)))
+
+    index = make_index(tmp_path)
+    list(get_names([str(sheet_path)], index=index))
+
+    assert index.misses == 1
+
+def test_find_by_name_skips_parsing(campaign, mocker):
+    campaign('Bob.nwod', "@type human\n@realname Robert\n")
+    campaign('Alice.nwod', "@type human\n")
+    build = mocker.spy(npc.parser.core, 'build_character')
+
+    result = npc.commands.find("rob", search=[campaign.root], dryrun=True)
+
+    assert build.call_count == 0
+    assert [os.path.basename(p) for p in result.printables] == ['Bob.nwod']
+
+def test_find_by_other_tags_still_parses(campaign, mocker):
+    campaign('Bob.nwod', "@type human\n")
+    build = mocker.spy(npc.parser.core, 'build_character')
+
+    result = npc.commands.find("name: bob", "type: human", search=[campaign.root], dryrun=True)
+
+    assert build.call_count == 1
+    assert len(result.printables) == 1
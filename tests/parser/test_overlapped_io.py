@@ -0,0 +1,65 @@
+import npc
+import os
+import pytest
+from tests.util import fixture_dir, dump_all
+
+from npc.parser.cache import ParseCache
+
+@pytest.mark.parametrize('threads', [2, 8])
+def test_same_results_as_serial(threads):
+    search = [str(fixture_dir('parsing')), str(fixture_dir('dump'))]
+    serial = npc.parser.get_characters(search_paths=list(search))
+    overlapped = npc.parser.get_characters(search_paths=list(search), io_threads=threads)
+
+    assert dump_all(overlapped) == dump_all(serial)
+
+def test_preserves_order_across_batches():
+    search = [str(fixture_dir('parsing'))]
+    serial = [c.path for c in npc.parser.get_characters(search_paths=list(search))]
+    batched = [c.path for c in npc.parser.core._parse_overlapped(
+        npc.parser.core._find_files(search[0]), 2, window=3)]
+
+    assert batched == serial
+
+def test_reads_in_inode_order(tmp_path, mocker):
+    for name in ['c', 'a', 'b']:
+        (tmp_path / '{}.nwod'.format(name)).write_text("@type human\n")
+    paths = sorted(str(p) for p in tmp_path.iterdir())
+    by_inode = sorted(paths, key=lambda p: os.stat(p).st_ino)
+
+    read_file = mocker.spy(npc.parser.core, '_read_file')
+    list(npc.parser.core._parse_overlapped(paths, 1))
+
+    assert [call[0][0] for call in read_file.call_args_list] == by_inode
+
+def test_scan_bytes_matches_text_mode(tmp_path):
+    sheet = tmp_path / 'Test Mann.nwod'
+    sheet.write_bytes(b"Test Mann\r\n@type human\r@changeling Beast\n\n--Notes--\n@ignored thing\n")
+
+    assert npc.parser.scan_bytes(sheet.read_bytes()) == npc.parser.read_records(str(sheet))
+
+def test_overlapped_uses_cache(tmp_path, mocker):
+    sheet = tmp_path / 'Test Mann.nwod'
+    sheet.write_text("@type human\n")
+    os.utime(str(sheet), (1500000000, 1500000000))
+
+    cache = ParseCache(tmp_path / 'parse.json')
+    list(npc.parser.get_characters(search_paths=[str(tmp_path)], cache=cache, io_threads=2))
+
+    read_file = mocker.spy(npc.parser.core, '_read_file')
+    cache = ParseCache(tmp_path / 'parse.json')
+    characters = list(npc.parser.get_characters(search_paths=[str(tmp_path)], cache=cache, io_threads=2))
+
+    assert cache.hits == 1
+    assert not read_file.called
+    assert characters[0].tags('type')[0] == 'human'
+
+def test_dump_command_output_is_identical(tmp_path):
+    serial_out = tmp_path / 'serial.json'
+    overlapped_out = tmp_path / 'overlapped.json'
+    search = fixture_dir('parsing')
+
+    npc.commands.dump(search, outfile=str(serial_out))
+    npc.commands.dump(search, outfile=str(overlapped_out), io_threads=4)
+
+    assert overlapped_out.read_text() == serial_out.read_text()
@@ -0,0 +1,46 @@
+import npc
+import os
+import pytest
+from tests.util import fixture_dir, dump_all
+
+from npc.parser.cache import ParseCache
+
+@pytest.mark.parametrize('jobs', [0, 2, 3])
+def test_same_results_as_serial(jobs):
+    search = [str(fixture_dir('parsing')), str(fixture_dir('dump'))]
+    serial = npc.parser.get_characters(search_paths=list(search))
+    parallel = npc.parser.get_characters(search_paths=list(search), jobs=jobs)
+
+    assert dump_all(parallel) == dump_all(serial)
+
+def test_preserves_order_across_chunks():
+    search = [str(fixture_dir('parsing'))]
+    serial = [c.path for c in npc.parser.get_characters(search_paths=list(search))]
+    chunked = [c.path for c in npc.parser.core._parse_parallel(
+        npc.parser.core._find_files(search[0]), 2, chunk_size=3)]
+
+    assert chunked == serial
+
+def test_parallel_fills_cache(tmp_path):
+    sheet = tmp_path / 'Test Mann.nwod'
+    sheet.write_text("@type human\n")
+    os.utime(str(sheet), (1500000000, 1500000000))
+
+    cache = ParseCache(tmp_path / 'parse.json')
+    list(npc.parser.get_characters(search_paths=[str(tmp_path)], cache=cache, jobs=2))
+
+    cache = ParseCache(tmp_path / 'parse.json')
+    characters = list(npc.parser.get_characters(search_paths=[str(tmp_path)], cache=cache, jobs=2))
+
+    assert cache.hits == 1
+    assert characters[0].tags('type')[0] == 'human'
+
+def test_dump_command_output_is_identical(tmp_path):
+    serial_out = tmp_path / 'serial.json'
+    parallel_out = tmp_path / 'parallel.json'
+    search = fixture_dir('parsing')
+
+    npc.commands.dump(search, outfile=str(serial_out))
+    npc.commands.dump(search, outfile=str(parallel_out), jobs=2)
+
+    assert parallel_out.read_text() == serial_out.read_text()
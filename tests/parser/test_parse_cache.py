@@ -0,0 +1,123 @@
+import npc
+import os
+import pytest
+
+from npc.parser.cache import ParseCache
+
+OLD_TIME = 1500000000
+
+@pytest.fixture
+def sheet(tmp_path):
+    """Create a character sheet whose mtime is safely in the past"""
+    sheet_path = tmp_path / 'Test Mann.nwod'
+    def write(text):
+        sheet_path.write_text(text)
+        os.utime(str(sheet_path), (OLD_TIME, OLD_TIME))
+        return str(sheet_path)
+    return write
+
+def make_cache(tmp_path, **kwargs):
+    return ParseCache(tmp_path / 'cache' / 'parse.json', **kwargs)
+
+def parse_with(cache, sheet_path):
+    characters = list(npc.parser.get_characters(search_paths=[sheet_path], cache=cache))
+    return characters[0]
+
+def test_cached_character_matches_parsed(tmp_path, sheet):
+    sheet_path = sheet("@type human\n@group Frat\n@rank Brother\nSome text\n--Stats--\n")
+    parse_with(make_cache(tmp_path), sheet_path)
+
+    cache = make_cache(tmp_path)
+    cached = parse_with(cache, sheet_path)
+    parsed = npc.parser.parse_character(sheet_path)
+
+    assert cache.hits == 1
+    assert cached.dump() == parsed.dump()
+
+def test_unchanged_file_is_not_read(tmp_path, sheet):
+    sheet_path = sheet("@type human\n")
+    parse_with(make_cache(tmp_path), sheet_path)
+
+    # same size and mtime, different contents
+    sheet("@type robot\n")
+    character = parse_with(make_cache(tmp_path), sheet_path)
+
+    assert character.tags('type')[0] == 'human'
+
+def test_changed_mtime_invalidates(tmp_path, sheet):
+    sheet_path = sheet("@type human\n")
+    parse_with(make_cache(tmp_path), sheet_path)
+
+    sheet("@type robot\n")
+    os.utime(sheet_path, (OLD_TIME + 10, OLD_TIME + 10))
+    character = parse_with(make_cache(tmp_path), sheet_path)
+
+    assert character.tags('type')[0] == 'robot'
+
+def test_hash_mode_detects_changed_contents(tmp_path, sheet):
+    sheet_path = sheet("@type human\n")
+    parse_with(make_cache(tmp_path, validate='hash'), sheet_path)
+
+    sheet("@type robot\n")
+    character = parse_with(make_cache(tmp_path, validate='hash'), sheet_path)
+
+    assert character.tags('type')[0] == 'robot'
+
+def test_fingerprint_change_invalidates(tmp_path, sheet):
+    sheet_path = sheet("@type human\n")
+    parse_with(make_cache(tmp_path, fingerprint='old'), sheet_path)
+
+    sheet("@type robot\n")
+    cache = make_cache(tmp_path, fingerprint='new')
+    character = parse_with(cache, sheet_path)
+
+    assert cache.hits == 0
+    assert character.tags('type')[0] == 'robot'
+
+def test_recent_files_are_not_saved(tmp_path):
+    sheet_path = tmp_path / 'Fresh Mann.nwod'
+    sheet_path.write_text("@type human\n")
+    parse_with(make_cache(tmp_path), str(sheet_path))
+
+    cache = make_cache(tmp_path)
+    parse_with(cache, str(sheet_path))
+
+    assert cache.hits == 0
+
+def test_parser_settings_change_fingerprint(prefs):
+    before = npc.parser.cache.fingerprint(prefs)
+    prefs.update_key('parser.something', True)
+
+    assert npc.parser.cache.fingerprint(prefs) != before
+
+def test_encoding_change_changes_fingerprint(prefs, monkeypatch):
+    before = npc.parser.cache.fingerprint(prefs)
+    other = 'latin-1' if npc.parser.tokenizer.default_encoding() != 'latin-1' else 'utf-8'
+    monkeypatch.setattr(npc.parser.tokenizer, 'default_encoding', lambda: other)
+
+    assert npc.parser.cache.fingerprint(prefs) != before
+
+def test_cache_settings_do_not_change_fingerprint(prefs):
+    before = npc.parser.cache.fingerprint(prefs)
+    prefs.update_key('parser.cache.validate', 'hash')
+
+    assert npc.parser.cache.fingerprint(prefs) == before
+
+class TestForCampaign:
+    def test_no_cache_outside_campaign(self, campaign, prefs):
+        assert npc.parser.cache.for_campaign(prefs) is None
+
+    def test_cache_in_campaign(self, campaign, prefs):
+        campaign.mkdir('.npc')
+        assert npc.parser.cache.for_campaign(prefs) is not None
+
+    def test_disabled_in_settings(self, campaign, prefs):
+        campaign.mkdir('.npc')
+        prefs.update_key('parser.cache.enabled', False)
+        assert npc.parser.cache.for_campaign(prefs) is None
+
+def test_jobs_setting_does_not_change_fingerprint(prefs):
+    before = npc.parser.cache.fingerprint(prefs)
+    prefs.update_key('parser.jobs', 8)
+
+    assert npc.parser.cache.fingerprint(prefs) == before
@@ -0,0 +1,90 @@
+import npc
+import pytest
+from tests.util import fixture_dir, sheet
+
+def parse_both(search, tags, **kwargs):
+    full = list(npc.parser.get_characters(search_paths=[str(search)]))
+    projected = list(npc.parser.get_characters(search_paths=[str(search)], tags=tags, **kwargs))
+    return full, projected
+
+@pytest.mark.parametrize('tags', [
+    ['name'],
+    ['type', 'group'],
+    ['title', 'location', 'court'],
+    ['rank'],
+    ['description', 'dead'],
+])
+@pytest.mark.parametrize('options', [{}, {'jobs': 2}, {'io_threads': 2}])
+def test_projected_tags_match_full_parse(tags, options):
+    full, projected = parse_both(fixture_dir('parsing'), tags, **options)
+
+    assert len(full) == len(projected)
+    for full_char, proj_char in zip(full, projected):
+        assert type(full_char) == type(proj_char)
+        assert full_char.path == proj_char.path
+        for tag in set(tags).union(npc.parser.PROJECTION_TAGS):
+            assert proj_char.tags(tag).data == full_char.tags(tag).data
+            assert proj_char.tags(tag).hidden == full_char.tags(tag).hidden
+
+def test_skips_description(tmp_path):
+    char_path = sheet(tmp_path, "Some guy\n@type human\n")
+
+    char = npc.parser.parse_character(char_path, tags=['type'])
+
+    assert not char.tags('description').filled
+
+def test_skips_other_tags(tmp_path):
+    char_path = sheet(tmp_path, "@type human\n@title Boss\n@location Here\n")
+
+    char = npc.parser.parse_character(char_path, tags=['title'])
+
+    assert char.tags('title') == ['Boss']
+    assert not char.tags('location').filled
+
+def test_realname_replaces_name(tmp_path):
+    char_path = sheet(tmp_path, "@type human\n@realname Bob\n")
+
+    char = npc.parser.parse_character(char_path, tags=['type'])
+
+    assert char.tags('name') == ['Bob']
+
+def test_compound_tags_set_type(tmp_path):
+    char_path = sheet(tmp_path, "@changeling Beast Hunterheart\n")
+
+    char = npc.parser.parse_character(char_path, tags=['seeming'])
+
+    assert isinstance(char, npc.character.Changeling)
+    assert char.tags('seeming') == ['Beast']
+
+def test_hides_projected_tags(tmp_path):
+    char_path = sheet(tmp_path, "@type human\n@title Boss\n@title Chief\n@hide title >> Boss\n@hide location\n")
+
+    char = npc.parser.parse_character(char_path, tags=['title'])
+
+    assert char.tags('title').hidden_values == ['Boss']
+    assert not char.tags('location').hidden
+
+def test_group_brings_its_subtag(tmp_path):
+    char_path = sheet(tmp_path, "@type human\n@group Seamen\n@rank Bosun\n")
+
+    char = npc.parser.parse_character(char_path, tags=['group'])
+
+    assert char.tags('group')['Seamen'] == ['Bosun']
+
+def test_tag_names_are_case_insensitive(tmp_path):
+    sheet(tmp_path, "@type human\n@title Boss\n")
+
+    char = next(npc.parser.get_characters(search_paths=[str(tmp_path)], tags=['Title']))
+
+    assert char.tags('title') == ['Boss']
+
+def test_cached_records_stay_complete(tmp_path):
+    sheet(tmp_path, "Some guy\n@type human\n@title Boss\n")
+    cache = npc.parser.ParseCache(str(tmp_path / 'cache.json'))
+
+    list(npc.parser.get_characters(search_paths=[str(tmp_path)], cache=cache, tags=['type']))
+    char = next(npc.parser.get_characters(search_paths=[str(tmp_path)], cache=cache))
+
+    assert cache.hits == 1
+    assert char.tags('title') == ['Boss']
+    assert char.tags('description').filled
@@ -0,0 +1,26 @@
+import npc
+import pytest
+from tests.util import fixture_dir
+
+@pytest.mark.parametrize('options', [{}, {'io_threads': 2}])
+def test_yields_before_parsing_everything(mocker, options):
+    parse = mocker.spy(npc.parser.core, 'build_character')
+    characters = npc.parser.get_characters(search_paths=[str(fixture_dir('parsing'))], **options)
+
+    next(characters)
+
+    total = len(list(npc.parser.core._find_files(str(fixture_dir('parsing')))))
+    assert 0 < parse.call_count < total
+
+def test_does_not_keep_characters(mocker):
+    import gc
+    import weakref
+    refs = []
+    characters = npc.parser.get_characters(search_paths=[str(fixture_dir('parsing'))])
+
+    for character in characters:
+        refs.append(weakref.ref(character))
+    del character
+    gc.collect()
+
+    assert all(ref() is None for ref in refs)
@@ -0,0 +1,124 @@
+import npc
+import os
+import pytest
+
+from npc.parser.summaries import SummaryIndex, MAX_VALUES, could_contain
+
+OLD_TIME = 1500000000
+
+@pytest.fixture
+def campaign(tmp_path):
+    """Create character sheets whose mtimes are safely in the past"""
+    root = tmp_path / 'Characters'
+    root.mkdir()
+    def write(name, text, mtime=OLD_TIME):
+        sheet_path = root / name
+        sheet_path.parent.mkdir(parents=True, exist_ok=True)
+        sheet_path.write_text(text)
+        os.utime(str(sheet_path), (mtime, mtime))
+        return str(sheet_path)
+    write.root = str(root)
+    return write
+
+def make_index(tmp_path):
+    return SummaryIndex(tmp_path / 'cache' / 'summaries.json')
+
+def wants_court(text):
+    return lambda summary: could_contain(summary, 'court', text)
+
+def find_winter(root, index, **kwargs):
+    chars = npc.parser.get_characters([root], summaries=index, wanted=wants_court('winter'), **kwargs)
+    return sorted(os.path.basename(c.path) for c in chars)
+
+@pytest.fixture
+def courts(campaign):
+    campaign('Winter/Bob.nwod', "@type changeling\n@court Winter\n")
+    campaign('Winter/Alice.nwod', "@type changeling\n@court Winter\n")
+    campaign('Summer/Carol.nwod', "@type changeling\n@court Summer\n")
+    campaign('Summer/Dave.nwod', "@type changeling\n@court Summer\n")
+    return campaign
+
+def test_first_run_parses_everything(tmp_path, courts):
+    index = make_index(tmp_path)
+
+    chars = list(npc.parser.get_characters([courts.root], summaries=index, wanted=wants_court('winter')))
+
+    assert len(chars) == 4
+    assert index.misses == 2
+    assert index.pruned == 0
+
+def test_skips_directories_that_cannot_match(tmp_path, courts, mocker):
+    find_winter(courts.root, make_index(tmp_path))
+
+    build = mocker.spy(npc.parser.core, 'build_character')
+    index = make_index(tmp_path)
+    names = find_winter(courts.root, index)
+
+    assert names == ['Alice.nwod', 'Bob.nwod']
+    assert index.pruned == 2
+    assert build.call_count == 2
+
+def test_edited_file_is_summarized_again(tmp_path, courts):
+    find_winter(courts.root, make_index(tmp_path))
+
+    courts('Summer/Dave.nwod', "@type changeling\n@court Winter\n", mtime=OLD_TIME + 10)
+    index = make_index(tmp_path)
+    names = find_winter(courts.root, index)
+
+    assert 'Dave.nwod' in names
+    assert index.misses == 1
+
+def test_new_file_is_summarized_again(tmp_path, courts):
+    find_winter(courts.root, make_index(tmp_path))
+
+    courts('Summer/Erin.nwod', "@type changeling\n@court Winter\n")
+    names = find_winter(courts.root, make_index(tmp_path))
+
+    assert 'Erin.nwod' in names
+
+def test_projected_parse_summarizes_every_tag(tmp_path, courts):
+    find_winter(courts.root, make_index(tmp_path), tags=['court'])
+
+    index = make_index(tmp_path)
+    chars = list(npc.parser.get_characters([courts.root], summaries=index, wanted=lambda summary: could_contain(summary, 'type', 'human')))
+
+    assert chars == []
+    assert index.pruned == 4
+
+def test_many_values_are_unknown(tmp_path, campaign):
+    for num in range(MAX_VALUES + 1):
+        campaign('Many/Char {}.nwod'.format(num), "@type human\n@title Title {}\n".format(num))
+    list(npc.parser.get_characters([campaign.root], summaries=make_index(tmp_path), wanted=lambda summary: True))
+
+    index = make_index(tmp_path)
+    entry = index.entries[os.path.abspath(os.path.join(campaign.root, 'Many'))]
+
+    assert entry['tags']['title'] is None
+    assert could_contain(entry['tags'], 'title', 'anything')
+
+def test_recent_files_are_not_saved(tmp_path):
+    (tmp_path / 'Bob.nwod').write_text("@type human\n")
+    list(npc.parser.get_characters([str(tmp_path)], summaries=make_index(tmp_path), wanted=lambda summary: True))
+
+    assert make_index(tmp_path).entries == {}
+
+@pytest.mark.parametrize('rule, pruned', [
+    ('court:winter', 2),
+    ('court:er', 0),
+    ('court:*', 0),
+    ('court~:winter', 0),
+    ('motley:foo', 4),
+])
+def test_find_uses_summaries(tmp_path, courts, monkeypatch, rule, pruned):
+    npc.commands.find(rule, search=[courts.root], dryrun=True)
+    index = make_index(tmp_path)
+    monkeypatch.setattr(npc.parser.summaries, 'for_campaign', lambda prefs: index)
+    npc.commands.find(rule, search=[courts.root], dryrun=True)
+
+    index = make_index(tmp_path)
+    monkeypatch.setattr(npc.parser.summaries, 'for_campaign', lambda prefs: index)
+    result = npc.commands.find(rule, search=[courts.root], dryrun=True)
+
+    assert index.pruned == pruned
+    expected = npc.commands.find(rule, search=[courts.root], dryrun=True, prefs=npc.settings.Settings())
+    assert sorted(result.printables) == sorted(expected.printables)
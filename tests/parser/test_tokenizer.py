@@ -0,0 +1,115 @@
+import npc
+import io
+import json
+import pytest
+from tests.util import fixture_dir
+
+from npc.character import CharacterEncoder
+from npc.parser import tokenizer
+
+def fixture_sheets():
+    return sorted(
+        str(p.relative_to(fixture_dir())) for p in fixture_dir().rglob('*')
+        if p.suffix in npc.parser.VALID_EXTENSIONS and p.is_file())
+
+def scan_text(data):
+    return npc.parser.scan_lines(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8'))
+
+@pytest.mark.parametrize('sheet_path', fixture_sheets())
+def test_matches_line_scanner_on_fixtures(sheet_path):
+    with open(str(fixture_dir(sheet_path)), 'rb') as sheet:
+        data = sheet.read()
+
+    assert tokenizer.tokenize(data) == scan_text(data)
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'\n\n',
+    b'Test Mann\n@type human\n',
+    b'@type human',
+    b'@type\n',
+    b'@type',
+    b'@type   \n',
+    b'@type \t value with spaces  \n',
+    b'@TYPE Human\n',
+    b'@#comment this\n@type human\n',
+    b'@#comment',
+    b'@type-x human\n',
+    b'@ type human\n',
+    b'  @type human\n',
+    b'Description\r\n@type human\r\n--Stats--\r\n@skip me\r\n',
+    b'Description\r@type human\r--Stats--\r@skip me\r',
+    b'--Stats--\n@type human\n',
+    b'--Stats--',
+    b'@type human\n-- Not a section\n--x--  \n@skip me\n',
+    b'@type human\n--No--end\n@name Bob\n',
+    b'@type human\n---\n@name Bob\n',
+    b'  --Indented--\n@type human\n',
+    '@name Béatrice\nÜber description\n--État--\n'.encode('utf-8'),
+    b'@type human\n\xef\xbb\xbf--Stats--\n',
+])
+def test_matches_line_scanner_on_edge_cases(data):
+    assert tokenizer.tokenize(data) == scan_text(data)
+
+def test_reads_past_first_block(tmp_path):
+    sheet = tmp_path / 'Test Mann.nwod'
+    data = b'Description\r\n' * (tokenizer.READ_SIZE // 13) + b'@type human\r\n--Stats--\r\n@skip me\r\n'
+    sheet.write_bytes(data)
+
+    with open(str(sheet), 'rb') as char_file:
+        records = tokenizer.tokenize_file(char_file)
+
+    assert records == scan_text(data)
+    assert records[-1] == ('type', 'human')
+
+def test_decodes_only_header():
+    data = b'@type human\n--Stats--\n\xff\xfe not utf-8\n'
+
+    assert tokenizer.tokenize(data) == [('type', 'human')]
+
+class TestSectionStart:
+    def test_needs_more_data_for_partial_line(self):
+        assert tokenizer.section_start(b'@type human\n--Sta', final=False) is None
+
+    def test_needs_more_data_without_section(self):
+        assert tokenizer.section_start(b'@type human\n', final=False) is None
+
+    def test_finds_first_section(self):
+        data = b'@type human\n-- nope\n--Stats--\n--Other--\n'
+
+        assert tokenizer.section_start(data) == data.index(b'--Stats--')
+
+    def test_no_section_is_whole_buffer(self):
+        data = b'@type human\n'
+
+        assert tokenizer.section_start(data) == len(data)
+
+class TestAsciiCompatible:
+    @pytest.mark.parametrize('encoding', ['utf-8', 'latin-1', 'cp1252', 'ascii'])
+    def test_compatible(self, encoding):
+        assert tokenizer.ascii_compatible(encoding)
+
+    @pytest.mark.parametrize('encoding', ['utf-16', 'utf-32', 'not-an-encoding'])
+    def test_incompatible(self, encoding):
+        assert not tokenizer.ascii_compatible(encoding)
+
+def test_falls_back_to_line_scanner(mocker):
+    mocker.patch('npc.parser.tokenizer.default_encoding', return_value='utf-16')
+    tokenize = mocker.spy(tokenizer, 'tokenize')
+
+    records = npc.parser.scan_bytes('@type human\n'.encode('utf-16'))
+
+    assert records == [('type', 'human')]
+    assert not tokenize.called
+
+def test_parsed_characters_unchanged(mocker):
+    search = [str(fixture_dir('parsing')), str(fixture_dir('dump'))]
+    tokenized = [c.dump() for c in npc.parser.get_characters(search_paths=list(search))]
+
+    def read_lines(char_file_path):
+        with open(char_file_path, 'r') as char_file:
+            return npc.parser.scan_lines(char_file)
+    mocker.patch('npc.parser.core.read_records', side_effect=read_lines)
+    scanned = [c.dump() for c in npc.parser.get_characters(search_paths=list(search))]
+
+    assert json.dumps(tokenized, cls=CharacterEncoder) == json.dumps(scanned, cls=CharacterEncoder)
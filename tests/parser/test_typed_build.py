@@ -0,0 +1,75 @@
+"""
+Test building characters of the right class in one pass
+"""
+
+import npc
+import pytest
+from npc.parser import build_character, type_from_records
+
+@pytest.mark.parametrize('records, expected', [
+    ([('type', 'Human')], 'Human'),
+    ([('changeling', 'Beast Hunterheart')], 'Changeling'),
+    ([('werewolf', 'Rahu')], 'Werewolf'),
+    ([('name', 'Bob'), ('type', '  '), ('type', 'Spirit')], 'Spirit'),
+    ([('werewolf', 'Rahu'), ('type', 'Human')], 'Werewolf'),
+    ([(None, 'Some guy')], None),
+])
+def test_type_from_records(records, expected):
+    assert type_from_records(records) == expected
+
+@pytest.mark.parametrize('records, klass', [
+    ([('type', 'Human')], npc.character.Character),
+    ([('type', 'changeling')], npc.character.Changeling),
+    ([('changeling', 'Beast Hunterheart')], npc.character.Changeling),
+    ([('werewolf', 'Rahu')], npc.character.Werewolf),
+    ([('type', 'Spirit')], npc.character.Spirit),
+])
+def test_builds_class_for_type(records, klass):
+    char = build_character('Bob.nwod', records)
+
+    assert type(char) == klass
+
+def test_builds_once(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("character was copied")
+    monkeypatch.setattr(npc.character, 'build', fail)
+
+    char = build_character('Bob.nwod', [('changeling', 'Beast Hunterheart')])
+
+    assert char.tags('seeming') == ['Beast']
+
+def test_class_default_type_is_not_kept():
+    char = build_character('Bob.nwod', [('type', 'Changeling')])
+
+    assert char.tags('type') == ['Changeling']
+
+def test_type_groups_are_filled():
+    char = build_character('Bob.nwod', [('changeling', 'Beast Hunterheart'), ('court', 'Winter')])
+
+    assert isinstance(char.tags('court'), npc.character.tags.GroupTag)
+    assert 'Winter' in char.tags('court')
+
+def test_ranks_do_not_follow_type_groups():
+    char = build_character('Bob.nwod', [('changeling', 'Beast Hunterheart'), ('court', 'Winter'), ('rank', 'Herald')])
+
+    assert not char.tags('court').subtag('Winter').filled
+    assert char.tags('rank') == ['Herald']
+
+def test_ranks_after_type_groups_stay_with_group():
+    records = [('changeling', 'Beast Hunterheart'), ('group', 'Guild'), ('court', 'Winter'), ('rank', 'Herald')]
+    char = build_character('Bob.nwod', records)
+
+    assert char.tags('group').subtag('Guild') == ['Herald']
+
+@pytest.mark.parametrize('records', [
+    [('changeling', 'Beast Hunterheart'), ('court', 'Winter'), ('court', ' '), ('hide', 'court >> Winter')],
+    [('werewolf', 'Rahu'), ('pack', 'Rippers'), ('rank', 'Alpha'), ('hide', 'pack')],
+    [('type', 'Changeling'), ('group', 'Guild'), ('rank', 'Boss'), ('motley', 'Six Slices'), ('rank', 'Fool')],
+])
+def test_matches_copied_build(records, monkeypatch):
+    typed = build_character('Bob.nwod', records)
+    with monkeypatch.context() as patched:
+        patched.setattr(npc.character, 'character_klass_from_type', lambda ctype: npc.character.Character)
+        generic = build_character('Bob.nwod', records)
+
+    assert typed.dump() == npc.character.build(other_char=generic).dump()
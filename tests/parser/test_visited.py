@@ -0,0 +1,85 @@
+import npc
+import os
+import pytest
+
+def sheet(path, type_name='human'):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("@type {}\n".format(type_name))
+    return path
+
+def parsed_paths(*search, **kwargs):
+    return [c.path for c in npc.parser.get_characters(search_paths=[str(p) for p in search], **kwargs)]
+
+def test_overlapping_search_paths(tmp_path):
+    sheet(tmp_path / 'Humans' / 'Test Mann.nwod')
+
+    assert parsed_paths(tmp_path, tmp_path / 'Humans') == [str(tmp_path / 'Humans' / 'Test Mann.nwod')]
+
+def test_file_and_its_directory(tmp_path):
+    target = sheet(tmp_path / 'Test Mann.nwod')
+
+    assert parsed_paths(target, tmp_path) == [str(target)]
+
+def test_symlinked_directory(tmp_path):
+    sheet(tmp_path / 'real' / 'Test Mann.nwod')
+    os.symlink(str(tmp_path / 'real'), str(tmp_path / 'linked'))
+
+    assert len(parsed_paths(tmp_path)) == 1
+
+def test_symlinked_file(tmp_path):
+    sheet(tmp_path / 'Test Mann.nwod')
+    os.symlink(str(tmp_path / 'Test Mann.nwod'), str(tmp_path / 'Test Link.nwod'))
+
+    assert len(parsed_paths(tmp_path)) == 1
+
+def test_hard_linked_file(tmp_path):
+    sheet(tmp_path / 'Test Mann.nwod')
+    os.link(str(tmp_path / 'Test Mann.nwod'), str(tmp_path / 'Test Link.nwod'))
+
+    assert len(parsed_paths(tmp_path)) == 1
+
+def test_symlink_loop_terminates(tmp_path):
+    sheet(tmp_path / 'Humans' / 'Test Mann.nwod')
+    os.symlink(str(tmp_path), str(tmp_path / 'Humans' / 'loop'))
+
+    assert parsed_paths(tmp_path) == [str(tmp_path / 'Humans' / 'Test Mann.nwod')]
+
+def test_different_files_are_kept(tmp_path):
+    sheet(tmp_path / 'Test Mann.nwod')
+    sheet(tmp_path / 'Other Mann.nwod')
+
+    assert len(parsed_paths(tmp_path)) == 2
+
+@pytest.mark.parametrize('options', [{'jobs': 2}, {'io_threads': 2}])
+def test_other_parse_modes(tmp_path, options):
+    sheet(tmp_path / 'Humans' / 'Test Mann.nwod')
+
+    assert len(parsed_paths(tmp_path, tmp_path / 'Humans', **options)) == 1
+
+def test_reports_directory_aliases(tmp_path):
+    sheet(tmp_path / 'real' / 'Test Mann.nwod')
+    os.symlink(str(tmp_path / 'real'), str(tmp_path / 'linked'))
+    aliases = []
+
+    parsed_paths(tmp_path / 'real', tmp_path / 'linked', on_alias=lambda *paths: aliases.append(paths))
+
+    assert aliases == [(str(tmp_path / 'linked'), str(tmp_path / 'real'))]
+
+def test_reports_file_aliases(tmp_path):
+    sheet(tmp_path / 'a' / 'Test Mann.nwod')
+    (tmp_path / 'b').mkdir()
+    os.link(str(tmp_path / 'a' / 'Test Mann.nwod'), str(tmp_path / 'b' / 'Test Link.nwod'))
+    aliases = []
+
+    parsed_paths(tmp_path / 'a', tmp_path / 'b', on_alias=lambda *paths: aliases.append(paths))
+
+    assert aliases == [(str(tmp_path / 'b' / 'Test Link.nwod'), str(tmp_path / 'a' / 'Test Mann.nwod'))]
+
+def test_command_reports_aliases(tmp_path, capsys):
+    sheet(tmp_path / 'real' / 'Test Mann.nwod')
+    os.symlink(str(tmp_path / 'real'), str(tmp_path / 'linked'))
+
+    npc.commands.dump(str(tmp_path / 'real'), str(tmp_path / 'linked'), outfile=str(tmp_path / 'out.json'), report_aliases=True)
+
+    _, err = capsys.readouterr()
+    assert "Skipped '{}': same as '{}'".format(tmp_path / 'linked', tmp_path / 'real') in err
@@ -0,0 +1,77 @@
+import npc
+import os
+import pytest
+from tests.util import fixture_dir
+
+from npc.parser.core import _find_files, _ignore_set, _walk_files
+
+def walk_files(root):
+    found = []
+    for dirpath, _, filenames in os.walk(root, followlinks=True):
+        found.extend(os.path.join(dirpath, name) for name in filenames)
+    return found
+
+def test_same_order_as_os_walk():
+    root = str(fixture_dir('parsing'))
+    found = [entry.path for entry in _walk_files(root)]
+
+    assert found == walk_files(root)
+
+def test_relative_root_keeps_relative_paths(campaign):
+    campaign.mkdir('Characters/Humans')
+    open('Characters/Humans/Test Mann.nwod', 'w').close()
+
+    assert list(_find_files('Characters')) == [os.path.join('Characters', 'Humans', 'Test Mann.nwod')]
+
+def test_filters_extensions(tmp_path):
+    (tmp_path / 'Test Mann.nwod').touch()
+    (tmp_path / 'notes.txt').touch()
+    (tmp_path / 'bare').touch()
+
+    assert [os.path.basename(p) for p in _find_files(str(tmp_path))] == ['Test Mann.nwod']
+    assert sorted(os.path.basename(p) for p in _find_files(str(tmp_path), include_bare=True)) == ['Test Mann.nwod', 'bare']
+
+class TestIgnore:
+    def test_ignored_dir_is_never_listed(self, tmp_path, mocker):
+        (tmp_path / 'skip').mkdir()
+        (tmp_path / 'skip' / 'Test Mann.nwod').touch()
+        scandir = mocker.spy(npc.parser.core, 'scandir')
+
+        found = list(_find_files(str(tmp_path), _ignore_set([str(tmp_path / 'skip')])))
+
+        assert found == []
+        assert [call[0][0] for call in scandir.call_args_list] == [str(tmp_path)]
+
+    def test_ignored_root_is_never_listed(self, tmp_path, mocker):
+        (tmp_path / 'Test Mann.nwod').touch()
+        scandir = mocker.spy(npc.parser.core, 'scandir')
+
+        assert list(_find_files(str(tmp_path), _ignore_set([str(tmp_path)]))) == []
+        assert not scandir.called
+
+    def test_ignores_file(self, tmp_path):
+        (tmp_path / 'Test Mann.nwod').touch()
+        (tmp_path / 'Other Mann.nwod').touch()
+
+        found = list(_find_files(str(tmp_path), _ignore_set([str(tmp_path / 'Test Mann.nwod')])))
+
+        assert found == [str(tmp_path / 'Other Mann.nwod')]
+
+    @pytest.mark.parametrize('ignore_path', ['Characters/Humans', './Characters/Humans/', 'Characters/../Characters/Humans'])
+    def test_matches_any_path_form(self, campaign, ignore_path):
+        campaign.mkdir('Characters/Humans')
+        campaign.mkdir('Characters/Fetches')
+        open('Characters/Humans/Test Mann.nwod', 'w').close()
+        open('Characters/Fetches/Fetch Mann.nwod', 'w').close()
+
+        found = list(_find_files('./Characters', _ignore_set([ignore_path])))
+
+        assert found == [os.path.join('.', 'Characters', 'Fetches', 'Fetch Mann.nwod')]
+
+def test_follows_directory_symlinks(tmp_path):
+    (tmp_path / 'real').mkdir()
+    (tmp_path / 'real' / 'Test Mann.nwod').touch()
+    (tmp_path / 'search').mkdir()
+    os.symlink(str(tmp_path / 'real'), str(tmp_path / 'search' / 'linked'))
+
+    assert list(_find_files(str(tmp_path / 'search'))) == [str(tmp_path / 'search' / 'linked' / 'Test Mann.nwod')]
@@ -143,3 +143,48 @@ class TestDetermineEditor:
 
     def test_windows_editor(self, prefs):
         assert util.determine_editor('asdf', prefs=prefs) == 'start'
+
+class TestReadPathList:
+    def test_newlines(self):
+        import io
+        stream = io.StringIO("a.nwod\nb c.nwod\n\nd.nwod")
+
+        assert list(util.read_path_list(stream)) == ['a.nwod', 'b c.nwod', 'd.nwod']
+
+    def test_nul_separated(self):
+        import io
+        stream = io.StringIO("a.nwod\0odd\nname.nwod\0")
+
+        assert list(util.read_path_list(stream)) == ['a.nwod', 'odd\nname.nwod']
+
+    def test_paths_split_across_blocks(self):
+        import io
+        names = ['{:05}.nwod'.format(i) for i in range(5000)]
+        stream = io.StringIO("\n".join(names))
+
+        assert list(util.read_path_list(stream)) == names
+
+    def test_empty(self):
+        import io
+
+        assert list(util.read_path_list(io.StringIO(''))) == []
+
+    def test_carriage_returns(self):
+        import io
+        stream = io.StringIO("a.nwod\r\nb.nwod\r\n")
+
+        assert list(util.read_path_list(stream)) == ['a.nwod', 'b.nwod']
+
+    def test_paths_are_marked_as_listed(self):
+        import io
+
+        assert all(isinstance(p, util.ListedPath) for p in util.read_path_list(io.StringIO("a.nwod\nb.nwod")))
+
+    def test_base(self, tmp_path, monkeypatch):
+        import io
+        import os
+        monkeypatch.chdir(str(tmp_path))
+
+        paths = list(util.read_path_list(io.StringIO("a.nwod\n"), base=str(tmp_path / 'sub')))
+
+        assert paths == [os.path.join('sub', 'a.nwod')]
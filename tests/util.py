@@ -1,6 +1,8 @@
 from pathlib import Path
 import json
 
+from npc.character import CharacterEncoder
+
 def fixture_dir(*dirnames):
     """
     Get the path to some fixtures.
@@ -18,3 +20,33 @@ def fixture_dir(*dirnames):
 def load_json(pathlib_path):
     with open(pathlib_path, 'r') as f:
         return json.load(f)
+
+def sheet(tmp_path, text, name='Test Mann.nwod'):
+    """
+    Write a character sheet
+
+    The text is written as UTF-8 bytes, so line endings are kept as given.
+
+    Args:
+        tmp_path (Path): Directory to write the sheet in
+        text (str): Contents of the sheet
+        name (str): File name of the sheet
+
+    Returns:
+        Path string of the new sheet
+    """
+    target = tmp_path / name
+    target.write_bytes(text.encode('utf-8'))
+    return str(target)
+
+def dump_all(characters):
+    """
+    Encode characters the way the dump command does, for comparisons
+
+    Args:
+        characters (iter): Character objects to encode
+
+    Returns:
+        JSON string
+    """
+    return json.dumps([c.dump() for c in characters], cls=CharacterEncoder)
@@ -0,0 +1,203 @@
+"""
+Test keeping an index of parsed characters current
+"""
+
+import os
+import pytest
+import npc
+from npc.watch import CampaignIndex
+
+@pytest.fixture
+def characters(tmp_path):
+    root = tmp_path.joinpath('Characters')
+    root.joinpath('Humans').mkdir(parents=True)
+    root.joinpath('Humans', 'Bob.nwod').write_text("@type human\n")
+    root.joinpath('Alice.nwod').write_text("@type human\n")
+    return root
+
+def names(index):
+    return [c.tags('name')[0] for c in index.characters()]
+
+def touch_later(file_path, text):
+    file_path.write_text(text)
+    stat_result = os.stat(str(file_path))
+    os.utime(str(file_path), ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+
+def test_sync_parses_everything(characters):
+    index = CampaignIndex([str(characters)])
+
+    assert index.sync() == 2
+    assert names(index) == ['Alice', 'Bob']
+
+def test_unchanged_files_are_not_parsed_again(characters):
+    index = CampaignIndex([str(characters)])
+    index.sync()
+
+    assert index.sync() == 0
+    assert index.parsed == 2
+
+def test_changed_file_is_parsed_again(characters):
+    index = CampaignIndex([str(characters)])
+    index.sync()
+    touch_later(characters.joinpath('Humans', 'Bob.nwod'), "@type human\n@title Boss\n")
+
+    assert index.sync([str(characters.joinpath('Humans'))]) == 1
+    bob = [c for c in index.characters() if c.tags('name')[0] == 'Bob'][0]
+    assert bob.tags('title') == ['Boss']
+
+def test_new_file_is_added(characters):
+    index = CampaignIndex([str(characters)])
+    index.sync()
+    characters.joinpath('Humans', 'Carol.nwod').write_text("@type human\n")
+
+    index.sync([str(characters.joinpath('Humans'))])
+
+    assert names(index) == ['Alice', 'Bob', 'Carol']
+
+def test_deleted_file_is_removed(characters):
+    index = CampaignIndex([str(characters)])
+    index.sync()
+    characters.joinpath('Humans', 'Bob.nwod').unlink()
+
+    index.sync([str(characters.joinpath('Humans'))])
+
+    assert names(index) == ['Alice']
+
+def test_deleted_directory_is_removed(characters):
+    index = CampaignIndex([str(characters)])
+    index.sync()
+    characters.joinpath('Humans', 'Bob.nwod').unlink()
+    characters.joinpath('Humans').rmdir()
+
+    index.sync([str(characters.joinpath('Humans'))])
+
+    assert names(index) == ['Alice']
+
+def test_sync_only_checks_given_directories(characters):
+    index = CampaignIndex([str(characters)])
+    index.sync()
+    characters.joinpath('Carol.nwod').write_text("@type human\n")
+
+    index.sync([str(characters.joinpath('Humans'))])
+
+    assert names(index) == ['Alice', 'Bob']
+
+def test_directories_outside_the_search_are_skipped(characters, tmp_path):
+    index = CampaignIndex([str(characters.joinpath('Humans'))])
+    index.sync()
+
+    assert index.sync([str(tmp_path)]) == 0
+    assert names(index) == ['Bob']
+
+def test_ignored_paths_are_skipped(characters):
+    index = CampaignIndex([str(characters)], [str(characters.joinpath('Humans'))])
+    index.sync()
+
+    assert names(index) == ['Alice']
+
+def search_order(*roots):
+    return [os.path.abspath(p) for p in npc.parser.character_files([str(root) for root in roots])]
+
+def paths(characters):
+    return [os.path.abspath(c.path) for c in characters]
+
+def test_characters_are_in_search_order(characters):
+    for name in ('Zed', 'Mid', 'Amy'):
+        characters.joinpath('{}.nwod'.format(name)).write_text("@type human\n")
+    index = CampaignIndex([str(characters)])
+    index.sync()
+
+    assert paths(index.characters()) == search_order(characters)
+
+def test_new_files_keep_search_order(characters):
+    index = CampaignIndex([str(characters)])
+    index.sync()
+    characters.joinpath('Humans', 'Zed.nwod').write_text("@type human\n")
+    characters.joinpath('Amy.nwod').write_text("@type human\n")
+
+    index.sync([str(characters), str(characters.joinpath('Humans'))])
+
+    assert paths(index.characters()) == search_order(characters)
+
+def test_select_follows_search_paths(characters):
+    index = CampaignIndex([str(characters)])
+    index.sync()
+
+    selected = index.select([str(characters.joinpath('Humans')), str(characters)], [])
+
+    assert paths(selected) == search_order(characters.joinpath('Humans'), characters)
+
+def test_sync_uses_cache(characters, tmp_path):
+    cache = npc.parser.ParseCache(str(tmp_path / 'parse.json'))
+    CampaignIndex([str(characters)], cache=cache).sync()
+    assert cache.misses == 2
+
+    index = CampaignIndex([str(characters)], cache=cache)
+    index.sync()
+
+    assert cache.hits == 2
+
+def test_sync_clears_value_pool(characters):
+    index = CampaignIndex([str(characters)])
+
+    index.sync()
+
+    assert len(npc.util.interning.values) == 0
+    assert index.characters()[0].tags('type')[0] == 'human'
+
+class TestCovers:
+    def test_same_search(self, characters):
+        index = CampaignIndex([str(characters)])
+
+        assert index.covers([str(characters)], [])
+
+    def test_narrower_search(self, characters):
+        index = CampaignIndex([str(characters)])
+
+        assert index.covers([str(characters.joinpath('Humans'))], [])
+
+    def test_wider_search(self, characters, tmp_path):
+        index = CampaignIndex([str(characters)])
+
+        assert not index.covers([str(tmp_path)], [])
+
+    def test_search_missing_an_ignore(self, characters):
+        index = CampaignIndex([str(characters)], [str(characters.joinpath('Humans'))])
+
+        assert not index.covers([str(characters)], [])
+
+    def test_empty_search(self, characters):
+        index = CampaignIndex([str(characters)])
+
+        assert not index.covers([], [])
+
+def test_select_applies_search_and_ignore(characters):
+    index = CampaignIndex([str(characters)])
+    index.sync()
+
+    found = index.select([str(characters)], [str(characters.joinpath('Humans'))])
+
+    assert [c.tags('name')[0] for c in found] == ['Alice']
+
+def test_table_is_reused_until_a_change(characters):
+    index = CampaignIndex([str(characters)])
+    index.sync()
+    table = index.table()
+
+    index.sync()
+    assert index.table() is table
+
+    touch_later(characters.joinpath('Alice.nwod'), "@type human\n@court Winter\n")
+    index.sync()
+    assert index.table() is not table
+    assert index.table().find([('court', 'winter', False)]) == [str(characters.joinpath('Alice.nwod'))]
+
+def test_table_forgets_removed_files(characters):
+    index = CampaignIndex([str(characters)])
+    index.sync()
+    index.table()
+
+    characters.joinpath('Alice.nwod').unlink()
+    index.sync()
+
+    assert len(index.table()) == 1
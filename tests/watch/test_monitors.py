@@ -0,0 +1,60 @@
+"""
+Test noticing changes to character directories
+"""
+
+import os
+import pytest
+from npc.watch import monitor
+
+def test_polling_reports_full_check():
+    watcher = monitor.PollingMonitor(0.01)
+
+    assert watcher.wait() is None
+
+def test_polling_times_out_before_next_check():
+    watcher = monitor.PollingMonitor(60)
+    watcher.wait()
+
+    assert watcher.wait(0.01) == set()
+
+def test_poll_option_forces_polling(tmp_path):
+    watcher = monitor.make_monitor([str(tmp_path)], poll=True)
+
+    assert isinstance(watcher, monitor.PollingMonitor)
+
+class TestInotify:
+    @pytest.fixture
+    def watcher(self, tmp_path):
+        try:
+            watcher = monitor.InotifyMonitor([str(tmp_path)])
+        except OSError:
+            pytest.skip("inotify is not available")
+        yield watcher
+        watcher.close()
+
+    def test_times_out_without_changes(self, watcher):
+        assert watcher.wait(0.01) == set()
+
+    def test_reports_directory_of_new_file(self, watcher, tmp_path):
+        tmp_path.joinpath('Bob.nwod').write_text("@type human\n")
+
+        assert watcher.wait(1) == {str(tmp_path)}
+
+    def test_watches_new_directories(self, watcher, tmp_path):
+        tmp_path.joinpath('Humans').mkdir()
+        watcher.wait(1)
+        tmp_path.joinpath('Humans', 'Bob.nwod').write_text("@type human\n")
+
+        assert str(tmp_path.joinpath('Humans')) in watcher.wait(1)
+
+    def test_symlink_loops_are_watched_once(self, tmp_path):
+        tmp_path.joinpath('Humans').mkdir()
+        os.symlink(str(tmp_path), str(tmp_path.joinpath('Humans', 'loop')))
+
+        try:
+            watcher = monitor.InotifyMonitor([str(tmp_path)])
+        except OSError:
+            pytest.skip("inotify is not available")
+        watcher.close()
+
+        assert sorted(watcher._watches.values()) == [str(tmp_path), str(tmp_path.joinpath('Humans'))]
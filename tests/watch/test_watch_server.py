@@ -0,0 +1,129 @@
+"""
+Test answering queries from a watch server
+"""
+
+import threading
+import pytest
+import npc
+from npc.watch import CampaignIndex, client, serve
+
+@pytest.fixture
+def campaign(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('.npc').mkdir()
+    root = tmp_path.joinpath('Characters')
+    root.mkdir()
+    root.joinpath('Bob.nwod').write_text("@type human\n@title Boss\n")
+    root.joinpath('Alice.nwod').write_text("@type human\n")
+    return root
+
+@pytest.fixture
+def server(campaign):
+    prefs = npc.settings.Settings()
+    index = CampaignIndex(['Characters'])
+    ready = threading.Event()
+    thread = threading.Thread(target=serve, args=(index, prefs), kwargs={
+        'find': npc.commands.find_in_table,
+        'poll': True,
+        'interval': 0.05,
+        'ready': lambda watcher: ready.set(),
+    })
+    thread.start()
+    assert ready.wait(5)
+    yield prefs
+    client.stop(prefs)
+    thread.join(5)
+
+def test_no_server(campaign):
+    prefs = npc.settings.Settings()
+
+    assert client.characters(prefs, ['Characters'], []) is None
+
+def test_characters(server):
+    found = client.characters(server, ['Characters'], [])
+
+    assert sorted(c.tags('name')[0] for c in found) == ['Alice', 'Bob']
+
+def test_paths_are_relative(server):
+    found = client.characters(server, ['Characters'], [])
+
+    assert sorted(c.path for c in found) == ['Characters/Alice.nwod', 'Characters/Bob.nwod']
+
+@pytest.mark.parametrize('search', [['Characters'], ['./Characters'], ['Characters/'], ['Characters/Bob.nwod']])
+def test_paths_match_direct_search(server, search):
+    found = client.characters(server, search, [])
+    direct = npc.parser.get_characters(search, [])
+
+    assert sorted(c.path for c in found) == sorted(c.path for c in direct)
+
+def test_absolute_search_paths_stay_absolute(server, campaign):
+    found = client.characters(server, [str(campaign)], [])
+
+    assert sorted(c.path for c in found) == [str(campaign / 'Alice.nwod'), str(campaign / 'Bob.nwod')]
+
+def test_find(server):
+    assert client.find(server, ['Characters'], [], ['title:boss']) == ['Characters/Bob.nwod']
+
+def test_uncovered_search(server, tmp_path):
+    assert client.characters(server, [str(tmp_path)], []) is None
+
+def test_status(server):
+    assert client.status(server)['characters'] == 2
+
+def test_stop_removes_address_file(server, campaign):
+    client.stop(server)
+
+    assert client.status(server) is None
+    assert not campaign.parent.joinpath('.npc', 'watch.json').exists()
+
+def test_find_command_uses_server(server, monkeypatch):
+    monkeypatch.setattr(npc.parser, 'get_characters', None)
+    response = npc.commands.find('title:boss', search=['Characters'], dryrun=True, prefs=server)
+
+    assert response.printables == ['Characters/Bob.nwod']
+
+def test_report_command_uses_server(server, monkeypatch):
+    monkeypatch.setattr(npc.parser, 'get_characters', None)
+    response = npc.commands.report('title', search=['Characters'], fmt='json', outfile='report.json', prefs=server)
+
+    assert response.success
+
+def test_reorg_skips_server(server, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("asked the server")
+    monkeypatch.setattr(client, 'characters', fail)
+    server.update_key('paths.required.characters', 'Characters')
+
+    response = npc.commands.reorg('Characters', prefs=server)
+
+    assert response.success
+
+def test_status_command(server):
+    response = npc.commands.watch(status=True, prefs=server)
+
+    assert response.printables == ["Watching 2 characters, 2 files parsed"]
+
+def test_second_server_is_refused(server):
+    response = npc.commands.watch('Characters', prefs=server)
+
+    assert not response.success
+
+def test_sees_new_files(server, campaign):
+    campaign.joinpath('Carol.nwod').write_text("@type human\n@title Boss\n")
+
+    for _ in range(100):
+        found = client.find(server, ['Characters'], [], ['title:boss'])
+        if len(found) == 2:
+            break
+        threading.Event().wait(0.05)
+
+    assert sorted(found) == ['Characters/Bob.nwod', 'Characters/Carol.nwod']
+
+@pytest.mark.parametrize('options', [{'keep_body': True}, {'jobs': 1}, {'io_threads': 1}])
+def test_options_the_server_cannot_honour_skip_it(server, mocker, options):
+    ask = mocker.spy(client, 'characters')
+
+    found = list(npc.commands.util.get_characters(['Characters'], [], prefs=server, **options))
+
+    assert len(found) == 2
+    assert not ask.called